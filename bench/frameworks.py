@@ -0,0 +1,263 @@
+"""Benchmark the shared test apps on every backend.
+
+Each backend serves the apps from `tests/apps.py` on a local port, in this
+process, and a load generator sends requests to one endpoint per category
+at a time, reporting requests per second and the median and 99th
+percentile latencies.
+
+Run from the repository root with `python -m bench.frameworks`. Results can
+be saved using `--save results.json`, and compared to saved results using
+`--compare results.json`; the exit code is 1 if any throughput dropped by
+more than the `--threshold`. The numbers depend heavily on the machine and
+its load, so only compare against results saved on the same machine; no
+results are kept in the repository.
+"""
+
+from argparse import ArgumentParser
+from asyncio import CancelledError, create_task, gather, run, sleep
+from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from json import dumps, loads
+from pathlib import Path
+from platform import platform, python_version
+from socket import socket
+from statistics import quantiles
+from sys import exit
+from time import perf_counter
+from typing import Any
+
+from attrs import Factory, asdict, frozen
+from tests.aiohttp import make_app as make_aiohttp_app
+from tests.aiohttp import run_on_aiohttp
+from tests.asgi import make_app as make_asgi_app
+from tests.asgi import run_on_asgi
+from tests.django import run_on_django
+from tests.flask import make_app as make_flask_app
+from tests.flask import run_on_flask
+from tests.quart import make_app as make_quart_app
+from tests.quart import run_on_quart
+from tests.starlette import make_app as make_starlette_app
+from tests.starlette import run_on_starlette
+
+from aiohttp import ClientError, ClientSession, DummyCookieJar, TCPConnector
+
+
+def make_django_app() -> Any:
+    from tests.django_uapi_app.views import app  # noqa: PLC0415
+
+    return app
+
+
+BACKENDS: dict[str, tuple[Callable[[], Any], Callable[[Any, int], Coroutine]]] = {
+    "aiohttp": (make_aiohttp_app, run_on_aiohttp),
+    "asgi": (make_asgi_app, run_on_asgi),
+    "django": (make_django_app, run_on_django),
+    "flask": (make_flask_app, run_on_flask),
+    "quart": (make_quart_app, run_on_quart),
+    "starlette": (make_starlette_app, run_on_starlette),
+}
+
+
+@frozen
+class Endpoint:
+    method: str
+    path: str
+    headers: dict[str, str] = Factory(dict)
+    body: bytes | None = None
+
+
+NESTED_MODEL = dumps(
+    {
+        "simple_model": {"an_int": 2, "a_string": "2", "a_float": 2.0},
+        "a_dict": {"a": "b"},
+        "a_list": [{"an_int": 3, "a_string": "3", "a_float": 3.0}],
+    }
+).encode()
+
+CATEGORIES = {
+    "str": Endpoint("GET", "/"),
+    "query": Endpoint("POST", "/query-post?page=2"),
+    "header": Endpoint("PUT", "/header", {"test-header": "value"}),
+    "json body": Endpoint(
+        "POST", "/post/model", {"content-type": "application/json"}, NESTED_MODEL
+    ),
+    "attrs response": Endpoint("GET", "/get/model"),
+    "cookie": Endpoint("PUT", "/put/cookie", {"cookie": "a_cookie=value"}),
+}
+
+
+@frozen
+class Result:
+    requests_per_second: float
+    #: Milliseconds.
+    p50: float
+    #: Milliseconds.
+    p99: float
+    errors: int
+
+
+def free_port() -> int:
+    with socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_until_up(session: ClientSession, url: str) -> None:
+    for _ in range(200):
+        with suppress(ClientError, OSError):
+            async with session.get(url):
+                return
+        await sleep(0.05)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def load(
+    session: ClientSession,
+    url: str,
+    endpoint: Endpoint,
+    requests: int,
+    concurrency: int,
+) -> Result:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = perf_counter()
+            async with session.request(
+                endpoint.method,
+                url + endpoint.path,
+                headers=endpoint.headers,
+                data=endpoint.body,
+            ) as resp:
+                await resp.read()
+                if resp.status >= 300:
+                    errors += 1
+            latencies.append(perf_counter() - start)
+
+    start = perf_counter()
+    await gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - start
+    cuts = quantiles(latencies, n=100)
+    return Result(len(latencies) / elapsed, cuts[49] * 1000, cuts[98] * 1000, errors)
+
+
+async def bench_backend(
+    backend: str, categories: list[str], requests: int, concurrency: int
+) -> dict[str, Result]:
+    make_app, run_app = BACKENDS[backend]
+    port = free_port()
+    url = f"http://localhost:{port}"
+    server = create_task(run_app(make_app(), port))
+    res = {}
+    try:
+        async with ClientSession(
+            connector=TCPConnector(limit=concurrency), cookie_jar=DummyCookieJar()
+        ) as session:
+            await wait_until_up(session, url + "/")
+            for category in categories:
+                endpoint = CATEGORIES[category]
+                # Warm up.
+                await load(session, url, endpoint, concurrency * 10, concurrency)
+                res[category] = await load(
+                    session, url, endpoint, requests, concurrency
+                )
+    finally:
+        server.cancel()
+        with suppress(CancelledError):
+            await server
+    return res
+
+
+def print_results(results: dict[str, dict[str, Result]]) -> None:
+    print(  # noqa: T201
+        f"{'backend':<10} {'category':<15} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>6}"
+    )
+    for backend, by_category in results.items():
+        for category, r in by_category.items():
+            print(  # noqa: T201
+                f"{backend:<10} {category:<15} {r.requests_per_second:>9.0f} "
+                f"{r.p50:>8.2f} {r.p99:>8.2f} {r.errors:>6}"
+            )
+
+
+def compare(
+    results: dict[str, dict[str, Result]], baseline: dict[str, Any], threshold: float
+) -> bool:
+    """Print throughput changes against a baseline.
+
+    :return: Whether anything regressed by more than the threshold.
+    """
+    regressed = False
+    for backend, by_category in results.items():
+        for category, r in by_category.items():
+            try:
+                before = baseline["results"][backend][category]["requests_per_second"]
+            except KeyError:
+                continue
+            change = r.requests_per_second / before - 1
+            flag = ""
+            if change < -threshold:
+                regressed = True
+                flag = "  REGRESSION"
+            print(f"{backend:<10} {category:<15} {change:>+7.1%}{flag}")  # noqa: T201
+    return regressed
+
+
+def _round(_: Any, __: Any, value: Any) -> Any:
+    return round(value, 2) if isinstance(value, float) else value
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=[*BACKENDS])
+    parser.add_argument(
+        "--categories", nargs="+", choices=CATEGORIES, default=[*CATEGORIES]
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--save", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    results = {
+        backend: run(
+            bench_backend(backend, args.categories, args.requests, args.concurrency)
+        )
+        for backend in args.backends
+    }
+    print_results(results)
+
+    if args.save is not None:
+        args.save.write_text(
+            dumps(
+                {
+                    "python": python_version(),
+                    "platform": platform(),
+                    "requests": args.requests,
+                    "concurrency": args.concurrency,
+                    "results": {
+                        backend: {
+                            c: asdict(r, value_serializer=_round)
+                            for c, r in by_category.items()
+                        }
+                        for backend, by_category in results.items()
+                    },
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.compare is not None and compare(
+        results, loads(args.compare.read_text()), args.threshold
+    ):
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""Measure the per-request overhead of uapi over bare framework handlers.
+
+For every framework, the same endpoint is written as a uapi handler and as a
+hand-written framework handler: a path and a query parameter are parsed, and
+an attrs instance is returned as JSON. Both are added to the app produced by
+`to_framework_app`, `to_framework_routes` or `to_urlpatterns`, and synthetic
+requests are dispatched to them through the same framework routing in this
+process, so no servers or sockets are involved and the difference is the
+cost of the composed dependencies, the response adapter and
+`_framework_return_adapter`. Raw ASGI has no framework, so there the bare
+handler is dispatched by the uapi ASGI dispatcher.
+
+The response adapters are also timed on their own, against building the
+same response by hand, splitting the overhead into the request side and the
+response side.
+
+Dispatch through Flask and Quart request contexts costs well over 100us, so
+differences of a few microseconds there are within noise. The numbers are for
+comparing runs on one machine; if `--budget` is given in microseconds, the
+exit code is 1 when the overhead on any framework exceeds it.
+
+Run with `python bench/overhead.py`.
+"""
+
+from argparse import ArgumentParser
+from asyncio import run
+from collections.abc import Awaitable, Callable, MutableMapping
+from sys import exit
+from time import perf_counter
+from timeit import timeit
+from typing import Any
+
+from attrs import define, frozen
+from cattrs import Converter
+from orjson import dumps
+
+from uapi._signatures import get_signature
+from uapi.base import _AppBase
+from uapi.responses import make_response_adapter
+from uapi.status import Ok
+
+NUMBER = 10_000
+#: Dispatching through a framework is much slower than calling an adapter.
+DISPATCH_NUMBER = 1_000
+REPEAT = 7
+QUERY = "page=2"
+
+
+@define
+class Item:
+    id: int
+    page: int
+    name: str
+
+
+async def get_item(item_id: int, page: int = 1) -> Ok[Item]:
+    return Ok(Item(item_id, page, "item"))
+
+
+def get_item_sync(item_id: int, page: int = 1) -> Ok[Item]:
+    return Ok(Item(item_id, page, "item"))
+
+
+@frozen
+class Timings:
+    """Microseconds per call."""
+
+    uapi: float
+    bare: float
+    uapi_response: float
+    bare_response: float
+
+    @property
+    def overhead(self) -> float:
+        return self.uapi - self.bare
+
+    @property
+    def response_overhead(self) -> float:
+        return self.uapi_response - self.bare_response
+
+
+def time_pair(
+    uapi: Callable[[], Any], bare: Callable[[], Any], number: int = NUMBER
+) -> tuple[float, float]:
+    """Microseconds per call of both, alternating so both see the same machine
+    state."""
+    u = b = float("inf")
+    for _ in range(REPEAT):
+        u = min(u, timeit(uapi, number=number))
+        b = min(b, timeit(bare, number=number))
+    return u / number * 1_000_000, b / number * 1_000_000
+
+
+async def time_pair_async(
+    uapi: Callable[[], Awaitable[Any]], bare: Callable[[], Awaitable[Any]]
+) -> tuple[float, float]:
+    u = b = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        for _ in range(DISPATCH_NUMBER):
+            await uapi()
+        u = min(u, perf_counter() - start)
+        start = perf_counter()
+        for _ in range(DISPATCH_NUMBER):
+            await bare()
+        b = min(b, perf_counter() - start)
+    return u / DISPATCH_NUMBER * 1_000_000, b / DISPATCH_NUMBER * 1_000_000
+
+
+def json_body(converter: Converter, item: Item) -> bytes:
+    return dumps(converter.unstructure(item))
+
+
+def uapi_response(
+    app: _AppBase, handler: Callable, framework_response_cls: type, fra: Callable
+) -> Callable[[], Any]:
+    """Run a response through the adapters of the handler."""
+    ra = make_response_adapter(
+        get_signature(handler).return_annotation,
+        framework_response_cls,
+        app.converter,
+        app._shorthands,
+    )
+    assert ra is not None
+    resp = Ok(Item(5, 2, "item"))
+    return lambda: fra(ra(resp))
+
+
+def make_scope(path: str) -> dict[str, Any]:
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "http",
+        "query_string": QUERY.encode(),
+        "headers": [],
+        "http_version": "1.1",
+    }
+
+
+async def receive() -> dict[str, Any]:
+    return {"type": "http.request", "body": b""}
+
+
+async def send(_: MutableMapping[str, Any]) -> None:
+    return None
+
+
+def measure_aiohttp() -> Timings:
+    from aiohttp.test_utils import make_mocked_request  # noqa: PLC0415
+    from aiohttp.web import Application, Request, Response  # noqa: PLC0415
+
+    from uapi.aiohttp import App, _framework_return_adapter  # noqa: PLC0415
+
+    app = App()
+    app.get("/items/{item_id}")(get_item)
+
+    def bare_response(item: Item) -> Response:
+        return Response(
+            body=json_body(app.converter, item),
+            headers={"content-type": "application/json"},
+        )
+
+    async def bare(request: Request) -> Response:
+        return bare_response(
+            Item(
+                int(request.match_info["item_id"]),
+                int(request.query.get("page", 1)),
+                "item",
+            )
+        )
+
+    a = Application()
+    a.add_routes(app.to_framework_routes())
+    a.router.add_get("/bare/{item_id}", bare)
+    a.freeze()
+
+    async def measure() -> Timings:
+        # Requests are routed by the application, like in a server. Mocked
+        # requests are slow to build, so fresh ones are cloned from a template.
+        def dispatch(path: str) -> Callable[[], Awaitable[Any]]:
+            template = make_mocked_request("GET", f"{path}?{QUERY}", app=a)
+            return lambda: a._handle(template.clone())
+
+        return Timings(
+            *await time_pair_async(dispatch("/items/5"), dispatch("/bare/5")),
+            *time_pair(
+                uapi_response(app, get_item, Response, _framework_return_adapter),
+                lambda: bare_response(Item(5, 2, "item")),
+            ),
+        )
+
+    return run(measure())
+
+
+def measure_asgi() -> Timings:
+    from uapi.asgi import (  # noqa: PLC0415
+        App,
+        Request,
+        Response,
+        _framework_return_adapter,
+        _make_asgi_app,
+    )
+    from uapi.router import Router  # noqa: PLC0415
+
+    app = App()
+    app.get("/items/{item_id}")(get_item)
+    asgi_app = app.to_framework_app()
+
+    def bare_response(item: Item) -> Response:
+        return Response(
+            json_body(app.converter, item), 200, {"content-type": "application/json"}
+        )
+
+    async def bare(request: Request) -> Response:
+        return bare_response(
+            Item(
+                int(request.path_params["item_id"]),
+                int(request.query.get("page", 1)),
+                "item",
+            )
+        )
+
+    # Raw ASGI has no framework, so the bare handler is dispatched like uapi
+    # dispatches its own handlers.
+    router: Router[Callable[[Request], Awaitable[Response]]] = Router()
+    router.add("GET", "/bare/{item_id}", bare)
+    bare_app = _make_asgi_app(router)
+    uapi_scope = make_scope("/items/5")
+    bare_scope = make_scope("/bare/5")
+
+    async def measure() -> Timings:
+        return Timings(
+            *await time_pair_async(
+                lambda: asgi_app(uapi_scope, receive, send),
+                lambda: bare_app(bare_scope, receive, send),
+            ),
+            *time_pair(
+                uapi_response(app, get_item, Response, _framework_return_adapter),
+                lambda: bare_response(Item(5, 2, "item")),
+            ),
+        )
+
+    return run(measure())
+
+
+def measure_django() -> Timings:
+    from django.conf import settings  # noqa: PLC0415
+    from django.http import HttpRequest, HttpResponse  # noqa: PLC0415
+    from django.test import RequestFactory  # noqa: PLC0415
+    from django.urls import URLResolver, path  # noqa: PLC0415
+    from django.urls.resolvers import RegexPattern  # noqa: PLC0415
+    from django.views.decorators.http import require_GET  # noqa: PLC0415
+
+    from uapi.django import App, _framework_return_adapter  # noqa: PLC0415
+
+    if not settings.configured:
+        settings.configure()
+
+    app = App()
+    app.get("/items/<item_id>")(get_item_sync)
+
+    def bare_response(item: Item) -> HttpResponse:
+        return HttpResponse(
+            json_body(app.converter, item), content_type="application/json"
+        )
+
+    @require_GET
+    def bare(request: HttpRequest, item_id: str) -> HttpResponse:
+        return bare_response(
+            Item(int(item_id), int(request.GET.get("page", 1)), "item")
+        )
+
+    resolver = URLResolver(
+        RegexPattern(r"^/"), [*app.to_urlpatterns(), path("bare/<item_id>", bare)]
+    )
+    factory = RequestFactory()
+
+    def dispatch(path: str) -> Callable[[], Any]:
+        def call() -> Any:
+            request = factory.get(f"{path}?{QUERY}")
+            match = resolver.resolve(request.path_info)
+            return match.func(request, *match.args, **match.kwargs)
+
+        return call
+
+    return Timings(
+        *time_pair(dispatch("/items/5"), dispatch("/bare/5"), DISPATCH_NUMBER),
+        *time_pair(
+            uapi_response(app, get_item_sync, HttpResponse, _framework_return_adapter),
+            lambda: bare_response(Item(5, 2, "item")),
+        ),
+    )
+
+
+def measure_flask() -> Timings:
+    from flask import Response, request  # noqa: PLC0415
+    from uapi.flask import App, _framework_return_adapter  # noqa: PLC0415
+
+    app = App()
+    app.get("/items/<item_id>")(get_item_sync)
+
+    def bare_response(item: Item) -> Response:
+        return Response(json_body(app.converter, item), mimetype="application/json")
+
+    def bare(item_id: str) -> Response:
+        return bare_response(
+            Item(int(item_id), int(request.args.get("page", 1)), "item")
+        )
+
+    f = app.to_framework_app(__name__)
+    f.route("/bare/<item_id>")(bare)
+
+    def dispatch(path: str) -> Callable[[], Any]:
+        def call() -> Any:
+            with f.test_request_context(f"{path}?{QUERY}"):
+                return f.full_dispatch_request()
+
+        return call
+
+    return Timings(
+        *time_pair(dispatch("/items/5"), dispatch("/bare/5"), DISPATCH_NUMBER),
+        *time_pair(
+            uapi_response(app, get_item_sync, Response, _framework_return_adapter),
+            lambda: bare_response(Item(5, 2, "item")),
+        ),
+    )
+
+
+def measure_quart() -> Timings:
+    from quart import Response, request  # noqa: PLC0415
+    from uapi.quart import App, _framework_return_adapter  # noqa: PLC0415
+
+    app = App()
+    app.get("/items/<item_id>")(get_item)
+
+    def bare_response(item: Item) -> Response:
+        return Response(json_body(app.converter, item), mimetype="application/json")
+
+    async def bare(item_id: str) -> Response:
+        return bare_response(
+            Item(int(item_id), int(request.args.get("page", 1)), "item")
+        )
+
+    q = app.to_framework_app(__name__)
+    q.route("/bare/<item_id>")(bare)
+
+    def dispatch(path: str) -> Callable[[], Awaitable[Any]]:
+        async def call() -> Any:
+            async with q.test_request_context(f"{path}?{QUERY}"):
+                return await q.full_dispatch_request()
+
+        return call
+
+    async def measure() -> Timings:
+        return Timings(
+            *await time_pair_async(dispatch("/items/5"), dispatch("/bare/5")),
+            *time_pair(
+                uapi_response(app, get_item, Response, _framework_return_adapter),
+                lambda: bare_response(Item(5, 2, "item")),
+            ),
+        )
+
+    return run(measure())
+
+
+def measure_starlette() -> Timings:
+    from starlette.requests import Request  # noqa: PLC0415
+    from starlette.responses import Response  # noqa: PLC0415
+
+    from uapi.starlette import App, _framework_return_adapter  # noqa: PLC0415
+
+    app = App()
+    app.get("/items/{item_id}")(get_item)
+
+    def bare_response(item: Item) -> Response:
+        return Response(json_body(app.converter, item), media_type="application/json")
+
+    async def bare(request: Request) -> Response:
+        return bare_response(
+            Item(
+                int(request.path_params["item_id"]),
+                int(request.query_params.get("page", 1)),
+                "item",
+            )
+        )
+
+    s = app.to_framework_app()
+    s.add_route("/bare/{item_id}", bare, methods=["GET"])
+    uapi_scope = make_scope("/items/5")
+    bare_scope = make_scope("/bare/5")
+
+    async def measure() -> Timings:
+        # Starlette adds to scopes, so every request gets a fresh one.
+        return Timings(
+            *await time_pair_async(
+                lambda: s(dict(uapi_scope), receive, send),
+                lambda: s(dict(bare_scope), receive, send),
+            ),
+            *time_pair(
+                uapi_response(app, get_item, Response, _framework_return_adapter),
+                lambda: bare_response(Item(5, 2, "item")),
+            ),
+        )
+
+    return run(measure())
+
+
+FRAMEWORKS: dict[str, Callable[[], Timings]] = {
+    "aiohttp": measure_aiohttp,
+    "asgi": measure_asgi,
+    "django": measure_django,
+    "flask": measure_flask,
+    "quart": measure_quart,
+    "starlette": measure_starlette,
+}
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--frameworks", nargs="+", choices=FRAMEWORKS, default=[*FRAMEWORKS]
+    )
+    parser.add_argument(
+        "--budget", type=float, help="microseconds, for every framework"
+    )
+    args = parser.parse_args()
+
+    over_budget = False
+    print(  # noqa: T201
+        f"{'framework':<10} {'bare us':>8} {'uapi us':>8} {'overhead':>9} "
+        f"{'request':>8} {'response':>9}"
+    )
+    for framework in args.frameworks:
+        t = FRAMEWORKS[framework]()
+        flag = ""
+        if args.budget is not None and t.overhead > args.budget:
+            over_budget = True
+            flag = "  OVER BUDGET"
+        print(  # noqa: T201
+            f"{framework:<10} {t.bare:>8.2f} {t.uapi:>8.2f} {t.overhead:>+9.2f} "
+            f"{t.overhead - t.response_overhead:>+8.2f} "
+            f"{t.response_overhead:>+9.2f}{flag}"
+        )
+    if over_budget:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
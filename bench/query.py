@@ -0,0 +1,30 @@
+"""Benchmark reading a single parameter from a long query string.
+
+Compares Starlette's `QueryParams` and the lazy query used by _uapi_.
+
+Run with `python bench/query.py`.
+"""
+
+from timeit import repeat
+from urllib.parse import urlencode
+
+from starlette.datastructures import QueryParams
+
+from uapi.query import LazyQuery
+
+RAW = urlencode(
+    {**{f"utm_param_{i}": f"some tracking value {i}/é" for i in range(30)}, "page": "2"}
+)
+
+
+def main() -> None:
+    starlette = min(repeat(lambda: QueryParams(RAW)["page"], number=10_000))
+    lazy = min(repeat(lambda: LazyQuery(RAW).get("page"), number=10_000))
+    print(  # noqa: T201
+        f"{len(RAW)} byte query: starlette {starlette * 100:.2f} us, "
+        f"lazy {lazy * 100:.2f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark the compiled router against Starlette's route scan.
+
+Run with `python bench/router.py [route count]`.
+"""
+
+from sys import argv
+from timeit import repeat
+
+from starlette.routing import Match, Route
+
+from uapi.router import Router
+
+
+def endpoint(_): ...
+
+
+def make_paths(count: int) -> list[str]:
+    return [f"/service{i}/items/{{item_id}}/details" for i in range(count)]
+
+
+def main(count: int = 600) -> None:
+    paths = make_paths(count)
+    router: Router[str] = Router()
+    for path in paths:
+        router.add("GET", path, path)
+    starlette_routes = [Route(path, endpoint, methods=["GET"]) for path in paths]
+
+    def starlette_match(path: str) -> None:
+        scope = {"type": "http", "path": path, "method": "GET"}
+        for route in starlette_routes:
+            if route.matches(scope)[0] is Match.FULL:
+                return
+
+    for label, target in (
+        ("first", "/service0/items/1/details"),
+        ("last", f"/service{count - 1}/items/1/details"),
+    ):
+        uapi = min(repeat(lambda t=target: router.match(t), number=10_000, repeat=5))
+        starlette = min(
+            repeat(lambda t=target: starlette_match(t), number=100, repeat=5)
+        )
+        print(  # noqa: T201
+            f"{label} route of {count}: "
+            f"uapi {uapi / 10_000 * 1e6:.2f} us, "
+            f"starlette {starlette / 100 * 1e6:.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in argv[1:]))
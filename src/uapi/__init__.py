@@ -1,5 +1,13 @@
 from .cookies import Cookie
-from .requests import FormBody, Header, HeaderSpec, ReqBody, ReqBytes
+from .requests import (
+    FormBody,
+    Header,
+    HeaderSpec,
+    ReqBody,
+    ReqBytes,
+    ReqFile,
+    ReqStream,
+)
 from .responses import ResponseException
 from .status import Found, Headers, SeeOther
 from .types import Method, RouteName
@@ -12,6 +20,8 @@ __all__ = [
     "Method",
     "ReqBody",
     "ReqBytes",
+    "ReqFile",
+    "ReqStream",
     "ResponseException",
     "RouteName",
     "redirect",
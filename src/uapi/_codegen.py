@@ -0,0 +1,111 @@
+"""Code generation of straight-line handler adapters."""
+
+import linecache
+from collections.abc import Callable
+from inspect import Signature
+from re import sub
+from typing import Any
+
+from attrs import Factory, frozen
+from cattrs import Converter
+
+from .responses import identity
+from .status import BaseResponse, ResponseException
+
+
+@frozen
+class AdapterSpec:
+    """How to generate adapters for a particular framework.
+
+    All expressions are Python source, evaluated inside the adapter.
+    """
+
+    #: Whether the generated adapter is a coroutine function.
+    is_async: bool
+    #: The adapter parameters, as source.
+    params: str
+    #: The leading arguments for the prepared handler, before path parameters.
+    handler_args: str
+    #: An expression producing the request content type.
+    content_type: str
+    #: An expression producing the raw path parameters mapping.
+    #: If `None`, keyword arguments are passed through to the handler as-is.
+    raw_path_params: str | None
+    #: An expression producing a framework response with a 415 status code,
+    #: using the `_ct_msg` string.
+    unsupported_media_type: str
+    #: Additional globals available to the expressions.
+    namespace: dict[str, Any] = Factory(dict)
+
+
+def generate_adapter(
+    spec: AdapterSpec,
+    handler: Callable,
+    response_adapter: Callable[[Any], BaseResponse] | None,
+    framework_return_adapter: Callable[[BaseResponse], Any],
+    exception_adapter: Callable[[ResponseException], BaseResponse],
+    req_ct: str | None,
+    route_name: str,
+    method: str,
+    path: str,
+    path_types: dict[str, Any],
+    converter: Converter,
+) -> tuple[Callable, str]:
+    """Generate and compile an adapter for a single route.
+
+    The content-type check, path parameter loading, handler call and
+    response adapters are inlined into a single function.
+
+    :return: The adapter and its source.
+    """
+    fn_name = sub(r"\W", "_", f"adapt_{method.lower()}_{route_name}")
+    globs: dict[str, Any] = {
+        **spec.namespace,
+        "_handler": handler,
+        "_ra": response_adapter,
+        "_fra": framework_return_adapter,
+        "_ea": exception_adapter,
+        "_req_ct": req_ct,
+        "_ct_msg": f"invalid content type (expected {req_ct})",
+        "_rn": route_name,
+        "_rm": method,
+        "_ResponseException": ResponseException,
+    }
+
+    args = [spec.handler_args]
+    if spec.raw_path_params is None:
+        args.append("**kwargs")
+    else:
+        for ix, (name, type) in enumerate(path_types.items()):
+            raw = f"{spec.raw_path_params}[{name!r}]"
+            if type in (str, Signature.empty):
+                args.append(f"{name}={raw}")
+            else:
+                globs[f"_ph_{ix}"] = converter.get_structure_hook(type)
+                globs[f"_pt_{ix}"] = type
+                args.append(f"{name}=_ph_{ix}({raw}, _pt_{ix})")
+    call = f"_handler({', '.join(args)})"
+    if spec.is_async:
+        call = f"await {call}"
+    if response_adapter is None:
+        ret = call
+    elif response_adapter is identity:
+        ret = f"_fra({call})"
+    else:
+        ret = f"_fra(_ra({call}))"
+
+    lines = [f"{'async ' if spec.is_async else ''}def {fn_name}({spec.params}):"]
+    if req_ct is not None:
+        lines.append(f"    if {spec.content_type} != _req_ct:")
+        lines.append(f"        return {spec.unsupported_media_type}")
+    lines.append("    try:")
+    lines.append(f"        return {ret}")
+    lines.append("    except _ResponseException as exc:")
+    lines.append("        return _fra(_ea(exc))")
+    source = "\n".join(lines) + "\n"
+
+    filename = f"<uapi generated adapter {method} {path}>"
+    exec(compile(source, filename, "exec"), globs)  # noqa: S102
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    return globs[fn_name], source
@@ -5,14 +5,14 @@ from __future__ import annotations
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Mapping, Sequence
 from inspect import Parameter as InspectParameter
-from inspect import signature
 from types import NoneType
 from typing import Any, TypeAlias, get_args
 
-from attrs import has
+from attrs import Factory, define, has
 from cattrs._compat import is_union_type
 from incant import is_subclass
 
+from ._signatures import get_signature
 from .openapi import (
     AnySchema,
     ApiKeySecurityScheme,
@@ -31,7 +31,11 @@ from .openapi import (
     SecurityRequirement,
     StatusCodeType,
 )
+from .profiling import StartupProfile, _no_mark
 from .requests import (
+    ReqBytes,
+    ReqFile,
+    ReqStream,
     get_cookie_name,
     maybe_form_type,
     maybe_header_type,
@@ -77,7 +81,7 @@ def build_operation(
     request_body_required = False
     responses: dict[StatusCodeType, Response] = {"200": Response(description="OK")}
     params: list[Parameter] = []
-    sig = signature(handler, eval_str=True)
+    sig = get_signature(handler)
     path_params = path_param_parser(path)[1]
     for path_param in path_params:
         if path_param not in sig.parameters:
@@ -104,6 +108,13 @@ def build_operation(
         ):
             # We ignore params annotated as framework req classes.
             continue
+        if arg_type is ReqBytes or arg_type == ReqStream or arg_type is ReqFile:
+            # Raw bodies.
+            request_bodies["application/octet-stream"] = MediaType(
+                builder.PYTHON_PRIMITIVES_TO_OPENAPI[bytes]
+            )
+            request_body_required = True
+            continue
         if arg_type is not InspectParameter.empty and (
             type_and_header := maybe_header_type(arg_param)
         ):
@@ -252,140 +263,8 @@ def _coalesce_responses(rs: Sequence[Response]) -> Response:
     )
 
 
-def build_pathitem(
-    path: str,
-    path_routes: dict[Method, tuple[Callable, Callable, RouteName, RouteTags]],
-    builder: SchemaBuilder,
-    path_param_parser: PathParamParser,
-    framework_req_cls: type | None,
-    framework_resp_cls: type | None,
-    shorthands: Iterable[type[ResponseShorthand]],
-    security_schemas: Mapping[str, ApiKeySecurityScheme],
-    summary_transformer: SummaryTransformer,
-    description_transformer: DescriptionTransformer,
-) -> OpenAPI.PathItem:
-    get = post = put = patch = delete = None
-    if get_route := path_routes.get("GET"):
-        get = build_operation(
-            get_route[0],
-            get_route[1],
-            get_route[2],
-            path,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-            list(get_route[3]),
-        )
-    if post_route := path_routes.get("POST"):
-        post = build_operation(
-            post_route[0],
-            post_route[1],
-            post_route[2],
-            path,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-            list(post_route[3]),
-        )
-    if put_route := path_routes.get("PUT"):
-        put = build_operation(
-            put_route[0],
-            put_route[1],
-            put_route[2],
-            path,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-            list(put_route[3]),
-        )
-    if patch_route := path_routes.get("PATCH"):
-        patch = build_operation(
-            patch_route[0],
-            patch_route[1],
-            patch_route[2],
-            path,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-            list(patch_route[3]),
-        )
-    if delete_route := path_routes.get("DELETE"):
-        delete = build_operation(
-            delete_route[0],
-            delete_route[1],
-            delete_route[2],
-            path,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-            list(delete_route[3]),
-        )
-    return OpenAPI.PathItem(get, post, put, patch, delete)
-
-
-def routes_to_paths(
-    routes: Routes,
-    builder: SchemaBuilder,
-    path_param_parser: PathParamParser,
-    framework_req_cls: type | None,
-    framework_resp_cls: type | None,
-    shorthands: Iterable[type[ResponseShorthand]],
-    security_schemas: Mapping[str, ApiKeySecurityScheme],
-    summary_transformer: SummaryTransformer,
-    description_transformer: DescriptionTransformer,
-) -> dict[str, OpenAPI.PathItem]:
-    res: dict[str, dict[Method, tuple[Callable, Callable, RouteName, RouteTags]]] = (
-        defaultdict(dict)
-    )
-
-    for (method, path), (handler, orig_handler, name, tags) in routes.items():
-        path = path_param_parser(path)[0]
-        res[path] = res[path] | {method: (handler, orig_handler, name, tags)}
-
-    return {
-        k: build_pathitem(
-            k,
-            v,
-            builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            security_schemas,
-            summary_transformer,
-            description_transformer,
-        )
-        for k, v in res.items()
-    }
-
-
 def gather_endpoint_components(handler: Callable, builder: SchemaBuilder) -> None:
-    sig = signature(handler, eval_str=True)
+    sig = get_signature(handler)
     for arg in sig.parameters.values():
         if (
             arg.annotation is not InspectParameter.empty
@@ -405,63 +284,109 @@ def gather_endpoint_components(handler: Callable, builder: SchemaBuilder) -> Non
             builder.get_schema_for_type(form_type)
 
 
-def components_to_openapi(
-    routes: Routes,
-    builder: SchemaBuilder,
-    security_schemes: dict[str, ApiKeySecurityScheme] = {},
-) -> OpenAPI.Components:
-    """Build the components part.
+@define
+class IncrementalSpecBuilder:
+    """Builds OpenAPI specs repeatedly, reusing the work done for unchanged
+    routes.
 
-    Components are complex structures, like classes, as opposed to primitives like ints.
+    The schema builder state and operations are kept between builds. A route
+    is rebuilt only if its handler, name or tags change; schemas of removed
+    routes are kept.
     """
-    # First pass, we build the component registry.
-    for handler, *_ in routes.values():
-        gather_endpoint_components(handler, builder)
-
-    for component in builder._build_queue:
-        builder.get_schema_for_type(component)
-
-    return OpenAPI.Components(builder.components, security_schemes)
-
 
-def make_openapi_spec(
-    routes: Routes,
-    path_param_parser: PathParamParser,
-    title: str = "Server",
-    version: str = "1.0",
-    framework_req_cls: type | None = None,
-    framework_resp_cls: type | None = None,
-    shorthands: Iterable[type[ResponseShorthand]] = [],
-    security_schemes: list[ApiKeySecurityScheme] = [],
-    summary_transformer: SummaryTransformer = default_summary_transformer,
-    description_transformer: DescriptionTransformer = default_description_transformer,
-) -> OpenAPI:
-    schema_builder = SchemaBuilder()
-    c = components_to_openapi(
-        routes,
-        schema_builder,
-        {f"{scheme.in_}/{scheme.name}": scheme for scheme in security_schemes},
+    path_param_parser: PathParamParser
+    framework_req_cls: type | None
+    framework_resp_cls: type | None
+    summary_transformer: SummaryTransformer = default_summary_transformer
+    description_transformer: DescriptionTransformer = default_description_transformer
+    #: Called with the original handler and its fresh operation, for final
+    #: adjustments.
+    adjust_operation: Callable[[Callable, OpenAPI.PathItem.Operation], None] | None = (
+        None
     )
-    res = OpenAPI(
-        "3.0.3",
-        OpenAPI.Info(title, version),
-        routes_to_paths(
-            routes,
-            schema_builder,
-            path_param_parser,
-            framework_req_cls,
-            framework_resp_cls,
-            shorthands,
-            c.securitySchemes,
-            summary_transformer,
-            description_transformer,
-        ),
-        c,
+    #: If set, the time spent on each route is recorded here.
+    profile: StartupProfile | None = None
+    schema_builder: SchemaBuilder = Factory(SchemaBuilder)
+    _shorthands: Sequence[type[ResponseShorthand]] = ()
+    _security_schemes: dict[str, ApiKeySecurityScheme] = Factory(dict)
+    _operations: dict[tuple[Method, str], tuple[tuple, OpenAPI.PathItem.Operation]] = (
+        Factory(dict)
     )
-    while schema_builder._build_queue:
-        for component in list(schema_builder._build_queue):
-            schema_builder.build_schema_from_rules(component)
-    return res
+
+    def build(
+        self,
+        routes: Mapping[tuple[Method, str], tuple[Callable, RouteName, RouteTags]],
+        compose: Callable[[Callable], Callable],
+        shorthands: Sequence[type[ResponseShorthand]],
+        title: str = "Server",
+        version: str = "1.0",
+        security_schemes: list[ApiKeySecurityScheme] = [],
+    ) -> OpenAPI:
+        """Build the spec for these routes.
+
+        Changing the shorthands or security schemes rebuilds all routes.
+
+        :param routes: The routes, mapping methods and paths to original
+            handlers, names and tags.
+        :param compose: Prepares original handlers, for their signatures.
+        """
+        schemes = {f"{s.in_}/{s.name}": s for s in security_schemes}
+        if shorthands != self._shorthands or schemes != self._security_schemes:
+            self._shorthands = shorthands
+            self._security_schemes = schemes
+            self._operations = {}
+
+        builder = self.schema_builder
+        profile = self.profile
+        fresh: Routes = {}
+        for key, (handler, name, tags) in routes.items():
+            cached = self._operations.get(key)
+            if cached is None or cached[0] != (handler, name, tags):
+                mark = profile.start(*key) if profile is not None else _no_mark
+                fresh[key] = (composed := compose(handler), handler, name, tags)
+                # Components of fresh routes go into the shared registry.
+                gather_endpoint_components(composed, builder)
+                mark("openapi")
+
+        for component in builder._build_queue:
+            builder.get_schema_for_type(component)
+        for (method, path), (handler, orig_handler, name, tags) in fresh.items():
+            mark = profile.start(method, path) if profile is not None else _no_mark
+            op = build_operation(
+                handler,
+                orig_handler,
+                name,
+                self.path_param_parser(path)[0],
+                builder,
+                self.path_param_parser,
+                self.framework_req_cls,
+                self.framework_resp_cls,
+                shorthands,
+                schemes,
+                self.summary_transformer,
+                self.description_transformer,
+                list(tags),
+            )
+            if self.adjust_operation is not None:
+                self.adjust_operation(orig_handler, op)
+            self._operations[(method, path)] = ((orig_handler, name, tags), op)
+            mark("openapi")
+        while builder._build_queue:
+            for component in list(builder._build_queue):
+                builder.build_schema_from_rules(component)
+        self._operations = {k: self._operations[k] for k in routes}
+
+        path_ops: dict[str, dict[str, OpenAPI.PathItem.Operation]] = defaultdict(dict)
+        for (method, path), (_, op) in self._operations.items():
+            ops = path_ops[self.path_param_parser(path)[0]]
+            if method in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+                ops[method.lower()] = op
+        return OpenAPI(
+            "3.0.3",
+            OpenAPI.Info(title, version),
+            {path: OpenAPI.PathItem(**ops) for path, ops in path_ops.items()},
+            OpenAPI.Components(builder.components, schemes),
+        )
 
 
 def return_type_to_statuses(t: type) -> dict[int, Any]:
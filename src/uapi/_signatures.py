@@ -0,0 +1,24 @@
+"""Resolved signatures, shared by everything preparing a route."""
+
+from collections.abc import Callable
+from inspect import Signature, signature
+from weakref import WeakKeyDictionary
+
+_signatures: WeakKeyDictionary[Callable, Signature] = WeakKeyDictionary()
+
+
+def get_signature(fn: Callable) -> Signature:
+    """Get the signature of `fn`, with string annotations evaluated.
+
+    Resolving a signature is expensive, and the same handlers are inspected
+    by codecs, compression, framework adapters and OpenAPI generation, so
+    signatures are cached for as long as their callables live.
+    """
+    try:
+        return _signatures[fn]
+    except KeyError:
+        res = _signatures[fn] = signature(fn, eval_str=True)
+        return res
+    except TypeError:
+        # Not weakly referenceable, or not hashable.
+        return signature(fn, eval_str=True)
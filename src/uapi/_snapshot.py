@@ -0,0 +1,97 @@
+"""Snapshots of OpenAPI specs, reused across processes."""
+
+from collections.abc import Callable, Iterable, Mapping
+from hashlib import blake2b
+from os import PathLike, getpid, replace
+from pathlib import Path
+from sys import modules
+from typing import Any
+
+from .types import Method, RouteName, RouteTags
+
+_UAPI_DIR = Path(__file__).parent
+
+
+def _source_file(handler: Callable) -> Path | None:
+    module = modules.get(getattr(handler, "__module__", None) or "")
+    if (file := getattr(module, "__file__", None)) is None:
+        return None
+    return Path(file)
+
+
+def _fingerprint(func: Callable) -> Any:
+    """Identify a function by its code, since qualnames are not unique; every
+    lambda is `<lambda>`.
+
+    Callables without code fall back to their `repr`, which at worst makes
+    snapshots miss.
+    """
+    if (code := getattr(func, "__code__", None)) is None:
+        return repr(func)
+    closure = tuple(c.cell_contents for c in getattr(func, "__closure__", None) or ())
+    return (
+        func.__module__,
+        func.__qualname__,
+        code.co_firstlineno,
+        code.co_code,
+        code.co_consts,
+        closure,
+        func.__defaults__,
+        func.__kwdefaults__,
+    )
+
+
+def make_snapshot_key(
+    routes: Mapping[tuple[Method, str], tuple[Callable, RouteName, RouteTags]],
+    sources: Iterable[str | PathLike[str]],
+    *extra: Any,
+    funcs: Iterable[Callable] = (),
+) -> str:
+    """Compute the key a snapshot is valid for.
+
+    The key covers the routes, the contents of the source files of their
+    handlers, the additional `sources`, the source of _uapi_ itself, the
+    `repr` of every `extra` value and the code and source files of `funcs`.
+    """
+    h = blake2b(digest_size=20)
+    files = {Path(s) for s in sources} | set(_UAPI_DIR.glob("*.py"))
+    for func in funcs:
+        h.update(repr(_fingerprint(func)).encode())
+        if (file := _source_file(func)) is not None:
+            files.add(file)
+    for (method, path), (handler, name, tags) in routes.items():
+        qualname = getattr(handler, "__qualname__", type(handler).__qualname__)
+        h.update(repr((method, path, name, tuple(tags), qualname)).encode())
+        if (file := _source_file(handler)) is not None:
+            files.add(file)
+    for file in sorted(files):
+        h.update(str(file).encode())
+        try:
+            h.update(file.read_bytes())
+        except OSError:
+            h.update(b"-")
+    for value in extra:
+        h.update(repr(value).encode())
+    return h.hexdigest()
+
+
+def load_snapshot(path: str | PathLike[str], key: str) -> bytes | None:
+    """Load the snapshot at `path`, if present and made for `key`."""
+    try:
+        content = Path(path).read_bytes()
+    except OSError:
+        return None
+    stored_key, _, payload = content.partition(b"\n")
+    return payload if stored_key == key.encode() else None
+
+
+def store_snapshot(path: str | PathLike[str], key: str, payload: bytes) -> None:
+    """Store a snapshot atomically, so concurrent workers never see a partial
+    file. Failing to store is not an error; the work is just redone."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{getpid()}.tmp")
+    try:
+        tmp.write_bytes(key.encode() + b"\n" + payload)
+        replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
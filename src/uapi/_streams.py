@@ -0,0 +1,28 @@
+"""Helpers for streamed response bodies."""
+
+from asyncio import to_thread
+from collections.abc import AsyncIterator, Iterator
+from types import NoneType
+from typing import Any, Final, TypeVar
+
+T = TypeVar("T")
+
+_plain_bodies: Final = frozenset((bytes, str, NoneType))
+_DONE: Final[Any] = object()
+
+
+def is_stream(body: Any) -> bool:
+    """Whether a response body is a stream of chunks.
+
+    Iterators and async iterators are streamed, and sent as they are produced
+    instead of being buffered into a single body.
+    """
+    return body.__class__ not in _plain_bodies and isinstance(
+        body, Iterator | AsyncIterator
+    )
+
+
+async def iterate_in_thread(iterator: Iterator[T]) -> AsyncIterator[T]:
+    """Drive a blocking iterator from worker threads, one chunk at a time."""
+    while (chunk := await to_thread(next, iterator, _DONE)) is not _DONE:
+        yield chunk
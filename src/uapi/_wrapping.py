@@ -0,0 +1,83 @@
+"""Wrapping handlers to post-process their results."""
+
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from inspect import Parameter, iscoroutinefunction
+from typing import Annotated, Any
+
+from ._signatures import get_signature
+from .requests import HeaderSpec
+
+
+def wrap_with_header(
+    handler: Callable,
+    header: str,
+    post: Callable[[Any, str], Any],
+    return_annotation: Any,
+    apost: Callable[[Any, str], Awaitable[Any]] | None = None,
+) -> Callable | None:
+    """Wrap a handler to post-process its result using a request header.
+
+    The header is added to the wrapper signature as an additional
+    dependency, so the framework adapters provide it like any other header.
+
+    :param post: Called with the handler result and the header value
+        (empty if missing), producing the wrapper result.
+    :param return_annotation: The return annotation of the wrapper.
+    :param apost: If provided, the wrapper is a coroutine function awaiting
+        this instead of calling `post`, even for sync handlers.
+
+    :return: The wrapper, or `None` if the handler takes variadic arguments.
+    """
+    sig = get_signature(handler)
+    params = list(sig.parameters.values())
+    if any(p.kind in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD) for p in params):
+        return None
+    # incant passes dependencies positionally, so the header dependency goes
+    # after the positional parameters, where a parameter with a default is
+    # always valid.
+    name = f"_uapi_{header.replace('-', '_')}"
+    ix = sum(p.kind is not Parameter.KEYWORD_ONLY for p in params)
+    params.insert(
+        ix,
+        Parameter(
+            name,
+            Parameter.POSITIONAL_OR_KEYWORD,
+            default="",
+            annotation=Annotated[str, HeaderSpec(header)],
+        ),
+    )
+
+    def split_args(args: tuple, kwargs: dict[str, Any]) -> tuple[tuple, str]:
+        if len(args) > ix:
+            return (*args[:ix], *args[ix + 1 :]), args[ix]
+        return args, kwargs.pop(name, "")
+
+    if iscoroutinefunction(handler):
+
+        @wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            args, value = split_args(args, kwargs)
+            if apost is not None:
+                return await apost(await handler(*args, **kwargs), value)
+            return post(await handler(*args, **kwargs), value)
+
+    elif apost is not None:
+        _apost = apost
+
+        @wraps(handler)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            args, value = split_args(args, kwargs)
+            return await _apost(handler(*args, **kwargs), value)
+
+    else:
+
+        @wraps(handler)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            args, value = split_args(args, kwargs)
+            return post(handler(*args, **kwargs), value)
+
+    wrapper.__signature__ = sig.replace(  # type: ignore[attr-defined]
+        parameters=params, return_annotation=return_annotation
+    )
+    return wrapper
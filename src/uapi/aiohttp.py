@@ -1,7 +1,7 @@
 from asyncio import sleep
-from collections.abc import Callable, Coroutine, Sequence
+from collections.abc import AsyncIterator, Callable, Coroutine, Sequence
 from functools import partial
-from inspect import Parameter, Signature, signature
+from inspect import Parameter, Signature
 from logging import Logger
 from typing import Any, ClassVar, Generic, TypeAlias, TypeVar
 
@@ -15,12 +15,19 @@ from incant import Hook, Incanter
 from multidict import CIMultiDict
 
 from . import ResponseException
+from ._codegen import AdapterSpec, generate_adapter
+from ._signatures import get_signature
+from ._streams import is_stream, iterate_in_thread
 from .base import AsyncApp as BaseApp
-from .path import parse_curly_path_params
+from .codecs import Codec
+from .path import make_path_params_loader, parse_curly_path_params
+from .query import LazyQuery
 from .requests import (
     HeaderSpec,
     ReqBytes,
+    accepts_codecs,
     attrs_body_factory,
+    check_content_length,
     get_cookie_name,
     get_form_type,
     get_header_type,
@@ -28,6 +35,9 @@ from .requests import (
     is_form,
     is_header,
     is_req_body_attrs,
+    is_req_stream,
+    read_limited,
+    resolve_structure_hook,
 )
 from .responses import dict_to_headers, make_exception_adapter, make_response_adapter
 from .shorthands import ResponseShorthand, T_co
@@ -39,11 +49,21 @@ __all__ = ["AiohttpApp", "App"]
 C = TypeVar("C")
 C_contra = TypeVar("C_contra", contravariant=True)
 
+try:
+    from aiohttp.web import RequestKey
+
+    _query_key: "RequestKey[LazyQuery] | str" = RequestKey("uapi.query", LazyQuery)
+except ImportError:  # aiohttp < 3.14
+    _query_key = "uapi.query"
+
 
 @define
 class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
     framework_incant: Incanter = Factory(
-        lambda self: _make_aiohttp_incanter(self.converter), takes_self=True
+        lambda self: _make_aiohttp_incanter(
+            self.converter, self.max_body_size, self.codecs
+        ),
+        takes_self=True,
     )
     _framework_req_cls: ClassVar[type] = FrameworkRequest
     _framework_resp_cls: ClassVar[type] = FrameworkResponse
@@ -73,28 +93,38 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
         exc_adapter = make_exception_adapter(self.converter)
 
         for (method, path), (handler, name, _) in self._route_map.items():
+            mark = self._profile_route(method, path)
+            handler = self._wrap_handler(handler, name)
+            mark("wrap")
             ra = make_response_adapter(
-                signature(handler, eval_str=True).return_annotation,
+                get_signature(handler).return_annotation,
                 FrameworkResponse,
                 self.converter,
                 self._shorthands,
             )
+            mark("response_adapter")
             path_params = parse_curly_path_params(path)
             hooks = [Hook.for_name(p, None) for p in path_params]
 
             base_handler = self.incant.compose(handler, is_async=True)
             # Detect required content-types here, based on the registered
             # request loaders.
-            base_sig = signature(base_handler)
+            base_sig = get_signature(base_handler)
             req_ct: str | None = None
             for arg in base_sig.parameters.values():
                 if is_req_body_attrs(arg):
                     _, loader = get_req_body_attrs(arg)
-                    req_ct = loader.content_type
+                    req_ct = (
+                        None
+                        if accepts_codecs(loader, self.codecs)
+                        else loader.content_type
+                    )
 
+            mark("compose")
             prepared = self.framework_incant.compose(base_handler, hooks, is_async=True)
-            sig = signature(prepared)
+            sig = get_signature(prepared)
             path_types = {p: sig.parameters[p].annotation for p in path_params}
+            path_loader = make_path_params_loader(path_types, self.converter)
 
             adapted = self.framework_incant.adapt(
                 prepared,
@@ -103,16 +133,31 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                 lambda p: p.annotation is Method,
                 **{pp: (lambda p, _pp=pp: p.name == _pp) for pp in path_params},
             )
-
-            if ra is None:
+            mark("framework_compose")
+
+            if self.codegen:
+                adapted, source = generate_adapter(
+                    _adapter_spec,
+                    adapted,
+                    ra,
+                    _framework_return_adapter,
+                    exc_adapter,
+                    req_ct,
+                    name,
+                    method,
+                    path,
+                    path_types,
+                    self.converter,
+                )
+                self.generated_sources[(method, path)] = source
+            elif ra is None:
 
                 async def adapted(
                     request: FrameworkRequest,
                     _fra=_framework_return_adapter,
                     _ea=exc_adapter,
                     _prepared=adapted,
-                    _path_params=path_params,
-                    _path_types=path_types,
+                    _pl=path_loader,
                     _req_ct=req_ct,
                     _rn=name,
                     _rm=method,
@@ -126,17 +171,12 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                             status=415,
                         )
 
-                    path_args = {
-                        p: (
-                            self.converter.structure(request.match_info[p], path_type)
-                            if (path_type := _path_types[p])
-                            not in (str, Signature.empty)
-                            else request.match_info[p]
-                        )
-                        for p in _path_params
-                    }
                     try:
-                        return await _prepared(request, _rn, _rm, **path_args)
+                        if _pl is None:
+                            return await _prepared(request, _rn, _rm)
+                        return await _prepared(
+                            request, _rn, _rm, **_pl(request.match_info)
+                        )
                     except ResponseException as exc:
                         return _fra(_ea(exc))
 
@@ -148,8 +188,7 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                     _fra=_framework_return_adapter,
                     _ea=exc_adapter,
                     _handler=adapted,
-                    _path_params=path_params,
-                    _path_types=path_types,
+                    _pl=path_loader,
                     _req_ct=req_ct,
                     _rn=name,
                     _rm=method,
@@ -162,22 +201,18 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                             body=f"invalid content type (expected {_req_ct})",
                             status=415,
                         )
-                    path_args = {
-                        p: (
-                            self.converter.structure(request.match_info[p], path_type)
-                            if (path_type := _path_types[p])
-                            not in (str, Signature.empty)
-                            else request.match_info[p]
-                        )
-                        for p in _path_params
-                    }
                     try:
+                        if _pl is None:
+                            return _fra(_ra(await _handler(request, _rn, _rm)))
+                        path_args = _pl(request.match_info)
                         return _fra(_ra(await _handler(request, _rn, _rm, **path_args)))
                     except ResponseException as exc:
                         return _fra(_ea(exc))
 
             r.route(method, path, name=name)(adapted)
+            mark("adapter")
 
+        self._run_build_hooks()
         return r
 
     async def run(
@@ -211,20 +246,34 @@ class AiohttpApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
             await sleep(3600)
 
 
+_adapter_spec = AdapterSpec(
+    is_async=True,
+    params="request",
+    handler_args="request, _rn, _rm",
+    content_type='request.headers.get("content-type")',
+    raw_path_params="request.match_info",
+    unsupported_media_type="_Response(body=_ct_msg, status=415)",
+    namespace={"_Response": Response},
+)
+
 App: TypeAlias = AiohttpApp[FrameworkResponse]
 
 
-def _make_aiohttp_incanter(converter: Converter) -> Incanter:
+def _make_aiohttp_incanter(
+    converter: Converter, max_body_size: int | None = None, codecs: Sequence[Codec] = ()
+) -> Incanter:
     """Create the framework incanter for Aiohttp."""
     res = Incanter()
 
-    def query_factory(p: Parameter):
-        def read_query(_request: FrameworkRequest):
-            return converter.structure(
+    def query_factory(p: Parameter) -> Callable[[FrameworkRequest], Any]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
+        def read_query(_request: FrameworkRequest) -> Any:
+            return hook(
                 (
-                    _request.query[p.name]
+                    _get_query(_request).get_first(p.name)
                     if p.default is Signature.empty
-                    else _request.query.get(p.name, p.default)
+                    else _get_query(_request).get_first(p.name, p.default)
                 ),
                 p.annotation,
             )
@@ -236,11 +285,11 @@ def _make_aiohttp_incanter(converter: Converter) -> Incanter:
     )
 
     def string_query_factory(p: Parameter) -> Callable[[FrameworkRequest], Any]:
-        def read_query(_request: FrameworkRequest):
+        def read_query(_request: FrameworkRequest) -> Any:
             return (
-                _request.query[p.name]
+                _get_query(_request).get_first(p.name)
                 if p.default is Signature.empty
-                else _request.query.get(p.name, p.default)
+                else _get_query(_request).get_first(p.name, p.default)
             )
 
         return read_query
@@ -252,15 +301,14 @@ def _make_aiohttp_incanter(converter: Converter) -> Incanter:
     def nonstring_list_query_factory(
         p: Parameter,
     ) -> Callable[[FrameworkRequest], list]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query(_request: FrameworkRequest):
+            query = _get_query(_request)
             return (
-                converter.structure(_request.query.getall(p.name), p.annotation)
-                if p.default is Signature.empty
-                else (
-                    converter.structure(_request.query.getall(p.name), p.annotation)
-                    if p.name in _request.query
-                    else p.default
-                )
+                hook(query.getall(p.name), p.annotation)
+                if p.default is Signature.empty or p.name in query
+                else p.default
             )
 
         return read_query
@@ -274,14 +322,11 @@ def _make_aiohttp_incanter(converter: Converter) -> Incanter:
         p: Parameter,
     ) -> Callable[[FrameworkRequest], list[str]]:
         def read_query(_request: FrameworkRequest):
+            query = _get_query(_request)
             return (
-                _request.query.getall(p.name)
-                if p.default is Signature.empty
-                else (
-                    _request.query.getall(p.name)
-                    if p.name in _request.query
-                    else p.default
-                )
+                query.getall(p.name)
+                if p.default is Signature.empty or p.name in query
+                else p.default
             )
 
         return read_query
@@ -301,13 +346,28 @@ def _make_aiohttp_incanter(converter: Converter) -> Incanter:
         lambda p: _make_cookie_dependency(get_cookie_name(p.annotation, p.name), default=p.default),  # type: ignore
     )
 
-    async def request_bytes(_request: FrameworkRequest) -> bytes:
-        return await _request.read()
+    if max_body_size is None:
+
+        async def request_bytes(_request: FrameworkRequest) -> bytes:
+            return await _request.read()
+
+    else:
+        limit = max_body_size
+
+        async def request_bytes(_request: FrameworkRequest) -> bytes:
+            check_content_length(_request.content_length, limit)
+            return await read_limited(_request.content.iter_any(), limit)
 
     res.register_hook(lambda p: p.annotation is ReqBytes, request_bytes)
 
+    def request_stream(_request: FrameworkRequest) -> AsyncIterator[bytes]:
+        return _request.content.iter_any()
+
+    res.register_hook(is_req_stream, request_stream)
+
     res.register_hook_factory(
-        is_req_body_attrs, partial(attrs_body_factory, converter=converter)
+        is_req_body_attrs,
+        partial(attrs_body_factory, converter=converter, codecs=codecs),
     )
 
     res.register_hook_factory(
@@ -322,6 +382,13 @@ def _make_aiohttp_incanter(converter: Converter) -> Incanter:
     return res
 
 
+def _get_query(request: FrameworkRequest) -> LazyQuery:
+    """Get the lazy query of the request, cached on the request."""
+    if (query := request.get(_query_key)) is None:
+        query = request[_query_key] = LazyQuery(request.rel_url.raw_query_string)
+    return query
+
+
 def _make_header_dependency(
     type: type,
     headerspec: HeaderSpec,
@@ -390,6 +457,19 @@ def _make_form_dependency(
 
 
 def _framework_return_adapter(resp: BaseResponse) -> FrameworkResponse:
+    if is_stream(resp.ret):
+        return Response(
+            # aiohttp streams async iterables itself, chunked.
+            body=(
+                resp.ret
+                if hasattr(resp.ret, "__anext__")
+                else iterate_in_thread(resp.ret)
+            ),
+            status=get_status_code(resp.__class__),  # type: ignore
+            headers=(
+                CIMultiDict(dict_to_headers(resp.headers)) if resp.headers else None
+            ),
+        )
     return Response(
         body=resp.ret or b"",
         status=get_status_code(resp.__class__),  # type: ignore
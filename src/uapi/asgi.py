@@ -0,0 +1,709 @@
+"""A native ASGI backend, with no underlying framework."""
+
+from asyncio import create_task, sleep
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterator,
+    Sequence,
+)
+from contextlib import contextmanager, suppress
+from functools import partial
+from http.cookies import _unquote
+from inspect import Parameter, Signature
+from typing import Any, ClassVar, Generic, TypeAlias, TypeVar
+from urllib.parse import parse_qsl
+
+from attrs import Factory, define
+from cattrs import Converter
+from incant import Hook, Incanter
+from typing_extensions import override
+
+from . import ResponseException
+from ._codegen import AdapterSpec, generate_adapter
+from ._signatures import get_signature
+from ._streams import is_stream, iterate_in_thread
+from .base import AsyncApp as BaseApp
+from .codecs import Codec
+from .path import make_path_params_loader, parse_curly_path_params
+from .query import LazyQuery
+from .requests import (
+    HeaderSpec,
+    ReqBytes,
+    accepts_codecs,
+    attrs_body_factory,
+    check_content_length,
+    get_cookie_name,
+    get_form_type,
+    get_header_type,
+    get_req_body_attrs,
+    is_form,
+    is_header,
+    is_req_body_attrs,
+    is_req_stream,
+    read_limited,
+    resolve_structure_hook,
+)
+from .responses import make_exception_adapter, make_response_adapter
+from .router import Router
+from .shorthands import ResponseShorthand, T_co
+from .status import BadRequest, BaseResponse, get_status_code
+from .types import Method, RouteName
+
+__all__ = ["App", "AsgiApp", "Request", "Response", "StreamingResponse"]
+
+C = TypeVar("C")
+C_contra = TypeVar("C_contra", contravariant=True)
+
+Scope: TypeAlias = dict[str, Any]
+Message: TypeAlias = dict[str, Any]
+Receive: TypeAlias = Callable[[], Awaitable[Message]]
+Send: TypeAlias = Callable[[Message], Awaitable[None]]
+ASGIApp: TypeAlias = Callable[[Scope, Receive, Send], Coroutine[None, None, None]]
+
+
+class Request:
+    """A thin wrapper over the ASGI scope and receive channel.
+
+    Every part of the request is parsed lazily, on first access, so
+    requests only pay for what their handlers actually use.
+    """
+
+    __slots__ = (
+        "_body",
+        "_cookies",
+        "_headers",
+        "_query",
+        "_receive",
+        "path_params",
+        "scope",
+    )
+
+    def __init__(
+        self, scope: Scope, receive: Receive, path_params: dict[str, str]
+    ) -> None:
+        self.scope = scope
+        self.path_params = path_params
+        self._receive = receive
+        self._headers: dict[str, str] | None = None
+        self._query: LazyQuery | None = None
+        self._cookies: dict[str, str] | None = None
+        self._body: bytes | None = None
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def path(self) -> str:
+        return self.scope["path"]
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """The request headers, with lowercase names.
+
+        For repeated headers, the first value wins.
+        """
+        if self._headers is None:
+            headers: dict[str, str] = {}
+            for k, v in self.scope["headers"]:
+                headers.setdefault(k.decode("latin1"), v.decode("latin1"))
+            self._headers = headers
+        return self._headers
+
+    @property
+    def query(self) -> LazyQuery:
+        """The query string, parsed on demand."""
+        if self._query is None:
+            self._query = LazyQuery(self.scope["query_string"].decode("latin1"))
+        return self._query
+
+    @property
+    def cookies(self) -> dict[str, str]:
+        if self._cookies is None:
+            cookies: dict[str, str] = {}
+            for chunk in self.headers.get("cookie", "").split(";"):
+                key, sep, val = chunk.partition("=")
+                if not sep:
+                    key, val = "", key
+                key, val = key.strip(), val.strip()
+                if key or val:
+                    cookies[key] = _unquote(val)
+            self._cookies = cookies
+        return self._cookies
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Iterate over the request body chunks, as they arrive.
+
+        The body is not buffered; it can only be streamed once.
+        """
+        if self._body is not None:
+            if self._body:
+                yield self._body
+            return
+        while True:
+            message = await self._receive()
+            if message["type"] == "http.disconnect":
+                break
+            if chunk := message.get("body", b""):
+                yield chunk
+            if not message.get("more_body", False):
+                break
+
+    async def body(self) -> bytes:
+        """Read the entire request body."""
+        if self._body is None:
+            self._body = b"".join([chunk async for chunk in self.stream()])
+        return self._body
+
+    async def form(self) -> dict[str, str]:
+        """Read an urlencoded form from the request body.
+
+        Bodies with other content types produce empty forms.
+        """
+        if (
+            self.headers.get("content-type", "").partition(";")[0]
+            != "application/x-www-form-urlencoded"
+        ):
+            return {}
+        return dict(parse_qsl((await self.body()).decode(), keep_blank_values=True))
+
+
+class Response:
+    """A raw ASGI response."""
+
+    __slots__ = ("body", "raw_headers", "status_code")
+
+    def __init__(
+        self,
+        body: bytes | str = b"",
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.body = body.encode() if isinstance(body, str) else body
+        self.status_code = status_code
+        self.raw_headers: list[tuple[bytes, bytes]] = (
+            [
+                (k.lower().encode("latin1"), v.encode("latin1"))
+                for k, v in headers.items()
+            ]
+            if headers
+            else []
+        )
+
+    async def __call__(self, send: Send) -> None:
+        headers = self.raw_headers
+        if self.status_code >= 200 and self.status_code not in (204, 304):
+            headers = [*headers, (b"content-length", str(len(self.body)).encode())]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class StreamingResponse(Response):
+    """A raw ASGI response, with the body sent in chunks as they are produced.
+
+    Blocking iterators are driven from worker threads.
+    """
+
+    __slots__ = ("chunks",)
+
+    def __init__(
+        self,
+        chunks: Iterator[bytes] | AsyncIterator[bytes],
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(b"", status_code, headers)
+        self.chunks = chunks
+
+    async def __call__(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        chunks = (
+            self.chunks
+            if isinstance(self.chunks, AsyncIterator)
+            else iterate_in_thread(self.chunks)
+        )
+        async for chunk in chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+
+@define
+class AsgiApp(Generic[C_contra], BaseApp[C_contra | Response]):
+    framework_incant: Incanter = Factory(
+        lambda self: _make_asgi_incanter(
+            self.converter, self.max_body_size, self.codecs
+        ),
+        takes_self=True,
+    )
+    _framework_req_cls: ClassVar[type] = Request
+    _framework_resp_cls: ClassVar[type] = Response
+
+    def add_response_shorthand(
+        self, shorthand: type[ResponseShorthand[T_co]]
+    ) -> "AsgiApp[T_co | C_contra]":
+        """Add a response shorthand to the App.
+
+        Response shorthands enable additional return types for handlers.
+
+        The type will be matched by identity and an `is_subclass` check.
+
+        :param type: The type to add to possible handler return annotations.
+        :param response_adapter: A callable, used to convert a value of the new type
+            into a `BaseResponse`.
+        """
+        self._shorthands = (*self._shorthands, shorthand)
+        return self  # type: ignore
+
+    def to_framework_app(self) -> ASGIApp:
+        """Build an ASGI application serving the registered routes."""
+        exc_adapter = make_exception_adapter(self.converter)
+        router: Router[Callable[[Request], Awaitable[Response]]] = Router()
+
+        for (method, path), (handler, name, _) in self._route_map.items():
+            mark = self._profile_route(method, path)
+            handler = self._wrap_handler(handler, name)
+            mark("wrap")
+            ra = make_response_adapter(
+                get_signature(handler).return_annotation,
+                Response,
+                self.converter,
+                self._shorthands,
+            )
+            mark("response_adapter")
+            path_params = parse_curly_path_params(path)
+            hooks = [Hook.for_name(p, None) for p in path_params]
+
+            base_handler = self.incant.compose(handler, is_async=True)
+            # Detect required content-types here, based on the registered
+            # request loaders.
+            base_sig = get_signature(base_handler)
+            req_ct: str | None = None
+            for arg in base_sig.parameters.values():
+                if is_req_body_attrs(arg):
+                    _, loader = get_req_body_attrs(arg)
+                    req_ct = (
+                        None
+                        if accepts_codecs(loader, self.codecs)
+                        else loader.content_type
+                    )
+
+            mark("compose")
+            prepared = self.framework_incant.compose(base_handler, hooks, is_async=True)
+            sig = get_signature(prepared)
+            path_types = {p: sig.parameters[p].annotation for p in path_params}
+            path_loader = make_path_params_loader(path_types, self.converter)
+
+            adapted = self.framework_incant.adapt(
+                prepared,
+                lambda p: p.annotation is Request,
+                lambda p: p.annotation is RouteName,
+                lambda p: p.annotation is Method,
+                **{pp: (lambda p, _pp=pp: p.name == _pp) for pp in path_params},
+            )
+            mark("framework_compose")
+
+            if self.codegen:
+                adapted, source = generate_adapter(
+                    _adapter_spec,
+                    adapted,
+                    ra,
+                    _framework_return_adapter,
+                    exc_adapter,
+                    req_ct,
+                    name,
+                    method,
+                    path,
+                    path_types,
+                    self.converter,
+                )
+                self.generated_sources[(method, path)] = source
+            elif ra is None:
+
+                async def adapted(
+                    request: Request,
+                    _fra=_framework_return_adapter,
+                    _ea=exc_adapter,
+                    _handler=adapted,
+                    _pl=path_loader,
+                    _req_ct=req_ct,
+                    _rn=name,
+                    _rm=method,
+                ) -> Response:
+                    if (
+                        _req_ct is not None
+                        and request.headers.get("content-type") != _req_ct
+                    ):
+                        return Response(
+                            f"invalid content type (expected {_req_ct})", 415
+                        )
+                    try:
+                        if _pl is None:
+                            return await _handler(request, _rn, _rm)
+                        return await _handler(
+                            request, _rn, _rm, **_pl(request.path_params)
+                        )
+                    except ResponseException as exc:
+                        return _fra(_ea(exc))
+
+            else:
+
+                async def adapted(
+                    request: Request,
+                    _ra=ra,
+                    _fra=_framework_return_adapter,
+                    _ea=exc_adapter,
+                    _prepared=adapted,
+                    _pl=path_loader,
+                    _req_ct=req_ct,
+                    _rn=name,
+                    _rm=method,
+                ) -> Response:
+                    if (
+                        _req_ct is not None
+                        and request.headers.get("content-type") != _req_ct
+                    ):
+                        return Response(
+                            f"invalid content type (expected {_req_ct})", 415
+                        )
+                    try:
+                        if _pl is None:
+                            return _fra(_ra(await _prepared(request, _rn, _rm)))
+                        path_args = _pl(request.path_params)
+                        return _fra(
+                            _ra(await _prepared(request, _rn, _rm, **path_args))
+                        )
+                    except ResponseException as exc:
+                        return _fra(_ea(exc))
+
+            router.add(method, path, adapted)
+            mark("adapter")
+
+        self._run_build_hooks()
+        return _make_asgi_app(router)
+
+    async def run(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        handle_signals: bool = True,
+        log_level: str | int | None = None,
+    ) -> None:
+        """Start serving this app using uvicorn.
+
+        Cancel the task running this to shut down uvicorn.
+        """
+        from uvicorn import Config, Server  # noqa: PLC0415
+
+        config = Config(
+            self.to_framework_app(),
+            host=host,
+            port=port,
+            access_log=False,
+            log_level=log_level,
+        )
+
+        if handle_signals:
+            server = Server(config=config)
+            await server.serve()
+        else:
+
+            class NoSignalsServer(Server):
+                @override
+                @contextmanager
+                def capture_signals(self) -> Generator[None, None, None]:
+                    """Capture no signals if asked not to."""
+                    yield
+
+            server = NoSignalsServer(config=config)
+
+            t = create_task(server.serve())
+
+            with suppress(BaseException):
+                while True:
+                    await sleep(360)
+            server.should_exit = True
+            await t
+
+    @staticmethod
+    def _path_param_parser(p: str) -> tuple[str, list[str]]:
+        return (p, parse_curly_path_params(p))
+
+
+_adapter_spec = AdapterSpec(
+    is_async=True,
+    params="request",
+    handler_args="request, _rn, _rm",
+    content_type='request.headers.get("content-type")',
+    raw_path_params="request.path_params",
+    unsupported_media_type="_Response(_ct_msg, 415)",
+    namespace={"_Response": Response},
+)
+
+App: TypeAlias = AsgiApp[Response]
+
+
+def _route_path(scope: Scope) -> str:
+    """The path without the `root_path` of the app, if mounted like Starlette
+    mounts apps."""
+    path: str = scope["path"]
+    root_path = scope.get("root_path", "")
+    if root_path and path.startswith(root_path):
+        if path == root_path:
+            return "/"
+        if path[len(root_path)] == "/":
+            return path[len(root_path) :]
+    return path
+
+
+def _make_asgi_app(router: Router[Callable[[Request], Awaitable[Response]]]) -> ASGIApp:
+    not_found = Response(b"Not Found", 404)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            match = router.match(_route_path(scope))
+            if match is None:
+                await not_found(send)
+                return
+            methods, path_params = match
+            method = scope["method"]
+            handler = methods.get(method)
+            if handler is None and method == "HEAD":
+                handler = methods.get("GET")
+            if handler is None:
+                await Response(
+                    b"Method Not Allowed", 405, {"allow": ", ".join(methods)}
+                )(send)
+                return
+            resp = await handler(Request(scope, receive, path_params))
+            await resp(send)
+        elif scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+    return app
+
+
+def _make_asgi_incanter(
+    converter: Converter, max_body_size: int | None = None, codecs: Sequence[Codec] = ()
+) -> Incanter:
+    """Create the framework incanter for raw ASGI."""
+    res = Incanter()
+
+    def query_factory(p: Parameter) -> Callable[[Request], Any]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
+        def read_query(_request: Request) -> Any:
+            return hook(
+                (
+                    _request.query.get(p.name)
+                    if p.default is Signature.empty
+                    else _request.query.get(p.name, p.default)
+                ),
+                p.annotation,
+            )
+
+        return read_query
+
+    res.register_hook_factory(lambda p: p.annotation is not Request, query_factory)
+
+    def string_query_factory(p: Parameter) -> Callable[[Request], Any]:
+        def read_query(_request: Request) -> Any:
+            return (
+                _request.query.get(p.name)
+                if p.default is Signature.empty
+                else _request.query.get(p.name, p.default)
+            )
+
+        return read_query
+
+    res.register_hook_factory(
+        lambda p: p.annotation in (Signature.empty, str), string_query_factory
+    )
+
+    def nonstring_list_query_factory(p: Parameter) -> Callable[[Request], list]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
+        def read_query(_request: Request):
+            query = _request.query
+            return (
+                hook(query.getall(p.name), p.annotation)
+                if p.default is Signature.empty or p.name in query
+                else p.default
+            )
+
+        return read_query
+
+    res.register_hook_factory(
+        lambda p: getattr(p.annotation, "__origin__", None) in (list, Sequence),
+        nonstring_list_query_factory,
+    )
+
+    def string_list_query_factory(p: Parameter) -> Callable[[Request], list[str]]:
+        def read_query(_request: Request):
+            query = _request.query
+            return (
+                query.getall(p.name)
+                if p.default is Signature.empty or p.name in query
+                else p.default
+            )
+
+        return read_query
+
+    res.register_hook_factory(
+        lambda p: p.annotation == list[str], string_list_query_factory
+    )
+
+    res.register_hook_factory(
+        is_header,
+        lambda p: _make_header_dependency(
+            *get_header_type(p), p.name, converter, p.default
+        ),
+    )
+    res.register_hook_factory(
+        lambda p: get_cookie_name(p.annotation, p.name) is not None,
+        lambda p: _make_cookie_dependency(get_cookie_name(p.annotation, p.name), default=p.default),  # type: ignore
+    )
+
+    if max_body_size is None:
+
+        async def request_bytes(_request: Request) -> bytes:
+            return await _request.body()
+
+    else:
+        limit = max_body_size
+
+        async def request_bytes(_request: Request) -> bytes:
+            check_content_length(_request.headers.get("content-length"), limit)
+            return await read_limited(_request.stream(), limit)
+
+    res.register_hook(lambda p: p.annotation is ReqBytes, request_bytes)
+
+    def request_stream(_request: Request) -> AsyncIterator[bytes]:
+        return _request.stream()
+
+    res.register_hook(is_req_stream, request_stream)
+
+    res.register_hook_factory(
+        is_req_body_attrs,
+        partial(attrs_body_factory, converter=converter, codecs=codecs),
+    )
+
+    res.register_hook_factory(
+        is_form, lambda p: _make_form_dependency(get_form_type(p), converter)
+    )
+
+    # RouteNames and methods get an empty hook, so the parameter propagates to the base incanter.
+    res.hook_factory_registry.insert(
+        0, Hook(lambda p: p.annotation in (RouteName, Method), None)
+    )
+
+    return res
+
+
+def _make_header_dependency(
+    type: type,
+    headerspec: HeaderSpec,
+    name: str,
+    converter: Converter,
+    default: Any = Signature.empty,
+) -> Callable[[Request], Any]:
+    if isinstance(headerspec.name, str):
+        name = headerspec.name
+    else:
+        name = headerspec.name(name)
+    # ASGI header names are always lowercase.
+    name = name.lower()
+    if type is str:
+        if default is Signature.empty:
+
+            def read_header(_request: Request) -> str:
+                return _request.headers[name]
+
+            return read_header
+
+        def read_opt_header(_request: Request) -> Any:
+            return _request.headers.get(name, default)
+
+        return read_opt_header
+
+    handler = converter.get_structure_hook(type)
+    if default is Signature.empty:
+
+        def read_conv_header(_request: Request) -> str:
+            return handler(_request.headers[name], type)
+
+        return read_conv_header
+
+    def read_opt_conv_header(_request: Request) -> Any:
+        return handler(_request.headers.get(name, default), type)
+
+    return read_opt_conv_header
+
+
+def _make_cookie_dependency(cookie_name: str, default=Signature.empty):
+    if default is Signature.empty:
+
+        def read_cookie(_request: Request) -> str:
+            return _request.cookies[cookie_name]
+
+        return read_cookie
+
+    def read_cookie_opt(_request: Request) -> Any:
+        return _request.cookies.get(cookie_name, default)
+
+    return read_cookie_opt
+
+
+def _make_form_dependency(
+    type: type[C], converter: Converter
+) -> Callable[[Request], Coroutine[None, None, C]]:
+    handler = converter.get_structure_hook(type)
+
+    async def read_form(_request: Request) -> C:
+        try:
+            return handler(await _request.form(), type)
+        except Exception as exc:
+            raise ResponseException(BadRequest("invalid payload")) from exc
+
+    return read_form
+
+
+def _framework_return_adapter(resp: BaseResponse) -> Response:
+    res = (
+        Response(resp.ret or b"", get_status_code(resp.__class__))  # type: ignore
+        if not is_stream(resp.ret)
+        else StreamingResponse(
+            resp.ret, get_status_code(resp.__class__)  # type: ignore
+        )
+    )
+    if resp.headers:
+        res.raw_headers = [
+            (
+                (k.lower().encode("latin1"), v.encode("latin1"))
+                if k[:9] != "__cookie_"
+                else (b"set-cookie", v.encode("latin1"))
+            )
+            for k, v in resp.headers.items()
+        ]
+    return res
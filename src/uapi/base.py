@@ -1,7 +1,11 @@
 from collections.abc import Callable, Coroutine, Iterable, Sequence
 from functools import partial
+from os import PathLike
+from threading import Thread
 from types import NoneType
-from typing import Any, ClassVar, Final, Generic, TypeAlias, TypeVar
+from typing import Any, ClassVar, Final, Generic, Self, TypeAlias, TypeVar
+from warnings import warn
+from weakref import WeakSet
 
 from attrs import AttrsInstance, Factory, define, field
 from cattrs import Converter
@@ -11,22 +15,37 @@ from orjson import dumps
 
 from ._openapi import (
     DescriptionTransformer,
+    IncrementalSpecBuilder,
     SummaryTransformer,
     default_description_transformer,
     default_summary_transformer,
-    make_openapi_spec,
 )
+from ._signatures import get_signature
+from ._snapshot import load_snapshot, make_snapshot_key, store_snapshot
+from .codecs import (
+    JSON_CONTENT_TYPE,
+    Codec,
+    get_negotiable_type,
+    make_json_codec,
+    make_negotiating_handler,
+)
+from .compression import Compression, make_compressing_handler
 from .openapi import ApiKeySecurityScheme, OpenAPI
 from .openapi import converter as openapi_converter
+from .profiling import StartupProfile, _no_mark
+from .responses import make_response_adapter
 from .shorthands import (
     BytesShorthand,
     NoneShorthand,
     ResponseShorthand,
+    StreamShorthand,
     StrShorthand,
     T_co,
     make_attrs_shorthand,
 )
-from .status import BaseResponse, Ok
+from .startup import HookFailure, warm_up_hooks
+from .static import make_lazy_static_handler, make_static_handler
+from .status import BaseResponse
 from .types import Method, RouteName, RouteTags
 
 __all__ = ["App"]
@@ -40,13 +59,60 @@ class OpenAPISecuritySpec:
 C = TypeVar("C")
 H = TypeVar("H", bound=Callable[..., Any])
 
-default_shorthands: Final = (NoneShorthand, StrShorthand, BytesShorthand)
+#: Handlers serving the OpenAPI spec and the documentation UIs. They aren't
+#: part of the API, so specs leave them out.
+_doc_handlers: WeakSet[Callable] = WeakSet()
+
+default_shorthands: Final = (
+    NoneShorthand,
+    StrShorthand,
+    BytesShorthand,
+    StreamShorthand,
+)
 
 
 def make_default_shorthands(converter: Converter) -> Sequence[type[ResponseShorthand]]:
     return (*default_shorthands, make_attrs_shorthand(converter))
 
 
+class _RouteMap(dict[tuple[Method, str], tuple[Callable, RouteName, RouteTags]]):
+    """The route map, counting its changes so derived data can be refreshed."""
+
+    version: int = 0
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: Any) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> Self:  # type: ignore[misc,override]
+        self.update(other)
+        return self
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Any:
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+
 @define
 class _AppBase:
     """The common base for sync and async apps."""
@@ -54,19 +120,97 @@ class _AppBase:
     converter: Converter = Factory(make_converter)
     #: The incanter used to compose handlers and middleware.
     incant: Incanter = Factory(Incanter)
-    _route_map: dict[tuple[Method, str], tuple[Callable, RouteName, RouteTags]] = (
-        Factory(dict)
-    )
+    _route_map: _RouteMap = Factory(_RouteMap)
     _openapi_security: list[OpenAPISecuritySpec] = Factory(list)
+    #: Whether to generate and compile straight-line adapters per route,
+    #: instead of using generic closures.
+    codegen: bool = field(default=False, kw_only=True)
+    #: The source of generated adapters, by method and path. Populated when
+    #: `codegen` is enabled and the framework app is built; useful for debugging.
+    generated_sources: dict[tuple[Method, str], str] = field(factory=dict, init=False)
+    #: The maximum size of request bodies loaded as `ReqBytes` and `ReqBody`,
+    #: in bytes. Larger bodies are rejected with `413 Payload Too Large`,
+    #: without being buffered in full. `None` means no limit.
+    max_body_size: int | None = field(default=None, kw_only=True)
+    #: Additional codecs for request and response bodies, besides JSON.
+    #: _attrs_ request bodies are loaded using the codec matching the request
+    #: content type, and _attrs_ responses are serialized using the codec
+    #: negotiated from the `Accept` header. The default JSON codec goes first
+    #: unless a codec for `application/json` replaces it; the first codec is
+    #: used when negotiation is inconclusive.
+    codecs: Sequence[Codec] = field(default=(), kw_only=True)
+    #: Response compression settings. Responses aren't compressed if `None`.
+    compression: Compression | None = field(default=None, kw_only=True)
+    #: If set, the time spent preparing each route is recorded here, when the
+    #: framework app is built and when OpenAPI specs are created.
+    startup_profile: StartupProfile | None = field(default=None, kw_only=True)
     _shorthands: Sequence[type[ResponseShorthand]] = field(
         default=Factory(
             lambda self: make_default_shorthands(self.converter), takes_self=True
         ),
         init=False,
     )
+    #: Whether to generate converter hooks for the request and response types
+    #: of all routes when the framework app is built, instead of on the first
+    #: request to each route. Types the converters can't handle are reported
+    #: in `hook_failures`, and as warnings.
+    warm_up_converters: bool = field(default=False, kw_only=True)
+    #: The failures from warming up the converter hooks, from the latest
+    #: framework app build.
+    hook_failures: list[HookFailure] = field(factory=list, init=False)
+    #: Functions to call once the framework app is built.
+    _build_hooks: list[Callable[[], None]] = field(factory=list, init=False)
+    #: Functions doing deferred work ahead of time, like creating lazy specs.
+    _warm_ups: list[Callable[[], None]] = field(factory=list, init=False)
     _framework_req_cls: ClassVar[type] = NoneType
     _framework_resp_cls: ClassVar[type] = NoneType
 
+    def _run_build_hooks(self) -> None:
+        """Framework apps call this once they're built."""
+        if self.warm_up_converters:
+            self.hook_failures = warm_up_hooks(self)
+            for failure in self.hook_failures:
+                warn(
+                    f"{failure.method} {failure.path}: cannot {failure.kind} "
+                    f"{failure.type!r}: {failure.exception}",
+                    RuntimeWarning,
+                    stacklevel=3,
+                )
+        for hook in self._build_hooks:
+            hook()
+
+    def _profile_route(self, method: Method, path: str) -> Callable[[str], None]:
+        """Start timing the preparation of a route, if profiling."""
+        if self.startup_profile is None:
+            return _no_mark
+        return self.startup_profile.start(method, path)
+
+    def _wrap_handler(self, handler: Callable, name: RouteName) -> Callable:
+        """Apply response codecs and compression to the handler, if enabled."""
+        if self.codecs:
+            codecs = self.codecs
+            if all(c.content_type != JSON_CONTENT_TYPE for c in codecs):
+                codecs = (make_json_codec(self.converter), *codecs)
+            handler = make_negotiating_handler(handler, codecs) or handler
+        if self.compression is not None and name not in self.compression.exclude:
+            ra = make_response_adapter(
+                get_signature(handler).return_annotation,
+                self._framework_resp_cls,
+                self.converter,
+                self._shorthands,
+            )
+            if ra is not None:
+                handler = (
+                    make_compressing_handler(
+                        handler,
+                        ra,
+                        self.compression,
+                        offload=isinstance(self, AsyncApp),
+                    )
+                    or handler
+                )
+        return handler
+
     @staticmethod
     def _path_param_parser(p: str) -> tuple[str, list[str]]:
         """Override me with your path param parsing."""
@@ -102,25 +246,53 @@ class _AppBase:
         :param description_transformer: A function to map handlers
             and route names to OpenAPI PathItem description strings.
         """
-        # We need to prepare the handlers to get the correct signature.
-        route_map = {
-            k: (self.incant.compose(v[0]), v[0], v[1], v[2])
-            for k, v in self._route_map.items()
-            if v[1] not in exclude
-        }
-        return make_openapi_spec(
-            route_map,
-            self.__class__._path_param_parser,
-            title,
-            version,
+        return IncrementalSpecBuilder(
+            self._path_param_parser,
             self._framework_req_cls,
             self._framework_resp_cls,
-            self._shorthands,
-            [s.security_scheme for s in self._openapi_security],
             summary_transformer,
             description_transformer,
+            self._add_codec_media_types if self.codecs else None,
+            self.startup_profile,
+        ).build(
+            self._spec_routes(exclude),
+            self.incant.compose,
+            self._shorthands,
+            title,
+            version,
+            [s.security_scheme for s in self._openapi_security],
         )
 
+    def _spec_routes(
+        self, exclude: set[str]
+    ) -> dict[tuple[Method, str], tuple[Callable, RouteName, RouteTags]]:
+        """The routes to document, without the excluded and doc routes."""
+        return {
+            k: v
+            for k, v in self._route_map.items()
+            if v[1] not in exclude and v[0] not in _doc_handlers
+        }
+
+    def _add_codec_media_types(
+        self, handler: Callable, op: OpenAPI.PathItem.Operation
+    ) -> None:
+        """Document the additional codecs alongside JSON."""
+        content_types = [
+            c.content_type for c in self.codecs if c.content_type != JSON_CONTENT_TYPE
+        ]
+        if op.requestBody is not None and (
+            json := op.requestBody.content.get(JSON_CONTENT_TYPE)
+        ):
+            op.requestBody.content.update(  # type: ignore[attr-defined]
+                dict.fromkeys(content_types, json)
+            )
+        ret_type = get_signature(handler).return_annotation
+        if get_negotiable_type(ret_type) is None:
+            return
+        for response in op.responses.values():
+            if json := response.content.get(JSON_CONTENT_TYPE):
+                response.content.update(dict.fromkeys(content_types, json))
+
     def serve_openapi(
         self,
         title: str = "Server",
@@ -128,6 +300,9 @@ class _AppBase:
         exclude: set[str] = set(),
         summary_transformer: SummaryTransformer = default_summary_transformer,
         description_transformer: DescriptionTransformer = default_description_transformer,
+        lazy: bool = False,
+        spec_snapshot: str | PathLike[str] | None = None,
+        spec_snapshot_sources: Iterable[str | PathLike[str]] = (),
     ):
         """
         Create the OpenAPI spec and start serving it at the given path.
@@ -137,23 +312,81 @@ class _AppBase:
             route names to OpenAPI PathItem summary strings.
         :param description_transformer: A function to map handlers
             and route names to OpenAPI PathItem description strings.
+        :param lazy: Whether to defer creating the spec. If true, the spec
+            is created in a background thread once the framework app is
+            built, or on the first request for it if that comes sooner.
+        :param spec_snapshot: A file to store the created spec in, and load it
+            from instead of creating it when nothing it depends on has changed.
+            Useful for sharing the work between worker processes and across
+            restarts. Only creating the spec is skipped; routes are still
+            composed in every process.
+        :param spec_snapshot_sources: Additional source files the spec depends on,
+            like modules defining the classes handlers use. The modules
+            defining the handlers are always included.
+
+        The served spec is kept up to date with routes added or changed
+        later; only those routes are processed again.
         """
-        openapi = self.make_openapi_spec(
-            title,
-            exclude=exclude,
-            summary_transformer=summary_transformer,
-            description_transformer=description_transformer,
+        key = ("GET", path)
+        builder = IncrementalSpecBuilder(
+            self._path_param_parser,
+            self._framework_req_cls,
+            self._framework_resp_cls,
+            summary_transformer,
+            description_transformer,
+            self._add_codec_media_types if self.codecs else None,
+            self.startup_profile,
         )
-        payload = dumps(openapi_converter.unstructure(openapi))
 
-        def openapi_handler() -> Ok[bytes]:
-            return Ok(payload, {"content-type": "application/json"})
-
-        self._route_map[("GET", path)] = (
-            openapi_handler,
-            RouteName("openapi_handler"),
-            (),
+        def make_payload() -> bytes:
+            routes = self._spec_routes(exclude)
+            security_schemes = [s.security_scheme for s in self._openapi_security]
+            if spec_snapshot is not None:
+                snapshot_key = make_snapshot_key(
+                    routes,
+                    spec_snapshot_sources,
+                    self.__class__,
+                    title,
+                    self._shorthands,
+                    security_schemes,
+                    [c.content_type for c in self.codecs],
+                    funcs=(summary_transformer, description_transformer),
+                )
+                if (payload := load_snapshot(spec_snapshot, snapshot_key)) is not None:
+                    return payload
+            openapi = builder.build(
+                routes,
+                self.incant.compose,
+                self._shorthands,
+                title,
+                "1.0",
+                security_schemes,
+            )
+            payload = dumps(openapi_converter.unstructure(openapi))
+            if spec_snapshot is not None:
+                store_snapshot(spec_snapshot, snapshot_key, payload)
+            return payload
+
+        handler, warm_up = make_lazy_static_handler(
+            make_payload,
+            "application/json",
+            get_version=lambda: (
+                self._route_map.version,
+                self._shorthands,
+                len(self._openapi_security),
+            ),
+            offload=isinstance(self, AsyncApp),
         )
+        # Registering the route changes the version, so it goes first.
+        _doc_handlers.add(handler)
+        self._route_map[key] = (handler, RouteName("openapi_handler"), ())
+        self._warm_ups.append(warm_up)
+        if lazy:
+            self._build_hooks.append(
+                lambda: Thread(target=warm_up, name="uapi-openapi", daemon=True).start()
+            )
+        else:
+            warm_up()
 
     def serve_swaggerui(
         self, path: str = "/swaggerui", openapi_path: str = "/openapi.json"
@@ -163,14 +396,9 @@ class _AppBase:
 
         fixed_path = swaggerui.replace("$OPENAPIURL", openapi_path)
 
-        def swaggerui_handler() -> Ok[str]:
-            return Ok(fixed_path, {"content-type": "text/html"})
-
-        self._route_map[("GET", path)] = (
-            swaggerui_handler,
-            RouteName("swaggerui_handler"),
-            (),
-        )
+        handler = make_static_handler(fixed_path, "text/html")
+        _doc_handlers.add(handler)
+        self._route_map[("GET", path)] = (handler, RouteName("swaggerui_handler"), ())
 
     def serve_redoc(self, path: str = "/redoc", openapi_path: str = "/openapi.json"):
         """Start serving the ReDoc UI at the given path."""
@@ -178,10 +406,9 @@ class _AppBase:
 
         fixed_path = redoc.replace("$OPENAPIURL", openapi_path)
 
-        def redoc_handler() -> Ok[str]:
-            return Ok(fixed_path, {"content-type": "text/html"})
-
-        self._route_map[("GET", path)] = (redoc_handler, RouteName("redoc_handler"), ())
+        handler = make_static_handler(fixed_path, "text/html")
+        _doc_handlers.add(handler)
+        self._route_map[("GET", path)] = (handler, RouteName("redoc_handler"), ())
 
     def serve_elements(
         self, path: str = "/elements", openapi_path: str = "/openapi.json"
@@ -191,10 +418,9 @@ class _AppBase:
 
         fixed_path = elements_html.replace("$OPENAPIURL", openapi_path)
 
-        def elements() -> Ok[str]:
-            return Ok(fixed_path, {"content-type": "text/html"})
-
-        self._route_map[("GET", path)] = (elements, RouteName("elements"), ())
+        handler = make_static_handler(fixed_path, "text/html")
+        _doc_handlers.add(handler)
+        self._route_map[("GET", path)] = (handler, RouteName("elements"), ())
 
 
 DefaultReturns: TypeAlias = BaseResponse | None | str | bytes | AttrsInstance
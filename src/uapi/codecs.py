@@ -0,0 +1,178 @@
+"""Body codecs, for formats other than JSON."""
+
+from collections.abc import Callable, Sequence
+from contextlib import suppress
+from typing import Any, Final, get_origin
+
+from attrs import frozen, has
+from cattrs import Converter
+from incant import is_subclass
+from orjson import dumps, loads
+
+from ._signatures import get_signature
+from ._wrapping import wrap_with_header
+from .status import BaseResponse, Ok
+
+__all__ = ["Codec", "make_cbor_codec", "make_json_codec", "make_msgpack_codec"]
+
+JSON_CONTENT_TYPE = "application/json"
+#: The number of distinct `Accept` values whose negotiation is cached, per route.
+NEGOTIATION_CACHE_SIZE: Final = 64
+
+
+@frozen
+class Codec:
+    """A serialization format for request and response bodies."""
+
+    #: The media type, without parameters.
+    content_type: str
+    loads: Callable[[bytes], Any]
+    dumps: Callable[[Any], bytes]
+    #: The converter used to structure and unstructure values for this format.
+    converter: Converter
+
+
+def make_json_codec(converter: Converter) -> Codec:
+    """The JSON codec every app uses, backed by _orjson_."""
+    return Codec(JSON_CONTENT_TYPE, loads, dumps, converter)
+
+
+def make_msgpack_codec(
+    converter: Converter | None = None, content_type: str = "application/msgpack"
+) -> Codec:
+    """A _msgpack_ codec. Requires the `msgpack` library.
+
+    :param converter: The converter to use. Defaults to a new _cattrs_
+        msgpack preconf converter.
+    """
+    from msgpack import packb, unpackb  # noqa: PLC0415
+
+    if converter is None:
+        from cattrs.preconf.msgpack import make_converter  # noqa: PLC0415
+
+        converter = make_converter()
+    return Codec(content_type, unpackb, packb, converter)
+
+
+def make_cbor_codec(
+    converter: Converter | None = None, content_type: str = "application/cbor"
+) -> Codec:
+    """A CBOR codec. Requires the `cbor2` library.
+
+    :param converter: The converter to use. Defaults to a new _cattrs_
+        cbor2 preconf converter.
+    """
+    from cbor2 import dumps, loads  # noqa: PLC0415
+
+    if converter is None:
+        from cattrs.preconf.cbor2 import make_converter  # noqa: PLC0415
+
+        converter = make_converter()
+    return Codec(content_type, loads, dumps, converter)
+
+
+def negotiate(accept: str, codecs: Sequence[Codec]) -> Codec:
+    """Pick the codec best matching an `Accept` header.
+
+    Media ranges are weighed by their `q` parameters, with ties going to the
+    range listed first in the header. A range matching several codecs, like
+    `*/*`, picks the earliest of them. If nothing matches, the first codec
+    is used.
+    """
+    best, best_q = codecs[0], 0.0
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q <= best_q:
+            continue
+        for codec in codecs:
+            if media_type in (codec.content_type, "*/*") or (
+                media_type.endswith("/*")
+                and codec.content_type.startswith(media_type[:-1])
+            ):
+                best, best_q = codec, q
+                break
+    return best
+
+
+def get_negotiable_type(ret_type: Any) -> tuple[type | None, type] | None:
+    """Get the response class and _attrs_ class for return types that can be
+    negotiated: _attrs_ classes and base responses of _attrs_ classes.
+
+    The response class is `None` for base responses, since the handler
+    provides it.
+    """
+    if has(ret_type) and not is_subclass(
+        get_origin(ret_type) or ret_type, BaseResponse
+    ):
+        return Ok, ret_type
+    if is_subclass(getattr(ret_type, "__origin__", None), BaseResponse) and has(
+        inner := ret_type.__args__[0]
+    ):
+        return None, inner
+    return None
+
+
+def make_negotiating_handler(
+    handler: Callable, codecs: Sequence[Codec]
+) -> Callable | None:
+    """Wrap a handler returning _attrs_ classes to serialize its result with
+    the codec negotiated from the `Accept` header.
+
+    The wrapper takes the `Accept` header as an additional dependency, and
+    returns a serialized `BaseResponse` with a `Vary: Accept` header.
+    Negotiation results are cached per `Accept` value.
+
+    :return: The wrapper, or `None` if the handler doesn't return _attrs_
+        classes.
+    """
+    sig = get_signature(handler)
+    negotiable = get_negotiable_type(sig.return_annotation)
+    if negotiable is None:
+        return None
+    response_cls, inner = negotiable
+
+    encoders = {
+        codec: (
+            codec.dumps,
+            codec.converter.get_unstructure_hook(inner),
+            {"content-type": codec.content_type, "vary": "Accept"},
+        )
+        for codec in codecs
+    }
+    default = encoders[codecs[0]]
+    # Negotiation results are cached by `Accept` value; clients tend to send
+    # the same few values, so this stays small.
+    negotiated: dict[str, tuple[Callable, Callable, dict[str, str]]] = {}
+
+    def encode(value: Any, accept: str) -> BaseResponse:
+        if not accept:
+            dumps, hook, headers = default
+        elif (encoder := negotiated.get(accept)) is not None:
+            dumps, hook, headers = encoder
+        else:
+            if len(negotiated) >= NEGOTIATION_CACHE_SIZE:
+                # Threaded backends may be evicting concurrently.
+                with suppress(RuntimeError, StopIteration):
+                    negotiated.pop(next(iter(negotiated)), None)
+            dumps, hook, headers = negotiated[accept] = encoders[
+                negotiate(accept, codecs)
+            ]
+        if response_cls is not None:
+            return response_cls(dumps(hook(value)), headers.copy())
+        return value.__class__(
+            dumps(hook(value.ret)),
+            {"vary": "Accept"}
+            | value.headers
+            | {"content-type": headers["content-type"]},
+        )
+
+    return wrap_with_header(handler, "accept", encode, BaseResponse)
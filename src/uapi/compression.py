@@ -0,0 +1,213 @@
+"""Response body compression."""
+
+from asyncio import to_thread
+from collections.abc import Callable, Sequence
+from contextlib import suppress
+from gzip import compress as gzip_compress
+from typing import Any, Final
+from zlib import compress as zlib_compress
+
+from attrs import Factory, frozen
+
+from ._wrapping import wrap_with_header
+from .status import BaseResponse
+
+__all__ = ["Compression", "Encoding", "make_default_encodings"]
+
+#: The number of distinct `Accept-Encoding` values whose negotiation is
+#: cached, per route.
+ENCODING_CACHE_SIZE: Final = 64
+
+
+@frozen
+class Encoding:
+    """A content coding, like `gzip`."""
+
+    #: The content coding name, as used in `Accept-Encoding`.
+    name: str
+    compress: Callable[[bytes], bytes]
+
+
+def make_gzip_encoding(level: int = 6) -> Encoding:
+    # A fixed mtime keeps the output deterministic.
+    return Encoding("gzip", lambda data: gzip_compress(data, level, mtime=0))
+
+
+def make_deflate_encoding(level: int = 6) -> Encoding:
+    # The HTTP `deflate` coding is the zlib format.
+    return Encoding("deflate", lambda data: zlib_compress(data, level))
+
+
+def make_brotli_encoding(quality: int = 4) -> Encoding | None:
+    """A Brotli encoding, if the `brotli` library is installed."""
+    try:
+        from brotli import compress  # noqa: PLC0415
+    except ImportError:
+        return None
+    return Encoding("br", lambda data: compress(data, quality=quality))
+
+
+def make_zstd_encoding(level: int = 3) -> Encoding | None:
+    """A Zstandard encoding, if `compression.zstd` (Python 3.14+) or the
+    `zstandard` library is available."""
+    try:
+        from compression.zstd import compress  # noqa: PLC0415
+    except ImportError:
+        try:
+            from zstandard import ZstdCompressor  # noqa: PLC0415
+        except ImportError:
+            return None
+        return Encoding("zstd", ZstdCompressor(level).compress)
+    return Encoding("zstd", lambda data: compress(data, level))
+
+
+def make_default_encodings() -> tuple[Encoding, ...]:
+    """The available encodings, in order of preference.
+
+    _zstd_ and _br_ are included only if their libraries are importable.
+    """
+    return tuple(
+        e
+        for e in (
+            make_zstd_encoding(),
+            make_brotli_encoding(),
+            make_gzip_encoding(),
+            make_deflate_encoding(),
+        )
+        if e is not None
+    )
+
+
+@frozen
+class Compression:
+    """Response compression settings for an app.
+
+    Response bodies are compressed after the response adapter runs, using
+    the first of the `encodings` accepted by the `Accept-Encoding` header.
+    """
+
+    encodings: Sequence[Encoding] = Factory(make_default_encodings)
+    #: Bodies smaller than this, in bytes, are sent as-is.
+    min_size: int = 1024
+    #: Async apps compress bodies at least this large, in bytes, in a
+    #: worker thread, so the event loop isn't blocked.
+    offload_size: int = 65536
+    #: Names of routes that are never compressed.
+    exclude: frozenset[str] = frozenset()
+
+
+def choose_encoding(
+    accept_encoding: str, encodings: Sequence[Encoding]
+) -> Encoding | None:
+    """Pick the encoding for an `Accept-Encoding` header.
+
+    Codings are weighed by their `q` parameters, with ties going to the
+    earlier encoding. `None` means the body should be sent as-is.
+    """
+    qs: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qs[name.strip().lower()] = q
+    wildcard = qs.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        if (q := qs.get(encoding.name, wildcard)) > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _add_vary(headers: dict[str, str]) -> dict[str, str]:
+    vary = headers.get("vary")
+    if vary is None:
+        return headers | {"vary": "Accept-Encoding"}
+    if "accept-encoding" in vary.lower():
+        return headers
+    return headers | {"vary": f"{vary}, Accept-Encoding"}
+
+
+def make_compressing_handler(
+    handler: Callable,
+    response_adapter: Callable[[Any], BaseResponse],
+    compression: Compression,
+    offload: bool,
+) -> Callable | None:
+    """Wrap a handler to compress its responses.
+
+    The wrapper takes the `Accept-Encoding` header as an additional
+    dependency, applies the response adapter itself and returns a
+    `BaseResponse`.
+
+    :param offload: Whether to compress large bodies in a worker thread.
+        The wrapper is a coroutine function if so.
+
+    :return: The wrapper, or `None` if the handler can't be wrapped.
+    """
+    encodings = compression.encodings
+    min_size = compression.min_size
+    offload_size = compression.offload_size
+    # Clients tend to send the same few values, so this stays small.
+    chosen: dict[str, Encoding | None] = {}
+
+    def prepare(value: Any, accept_encoding: str) -> tuple[BaseResponse, Any, Any]:
+        """Adapt the value, and figure out if and how to compress it."""
+        resp = response_adapter(value)
+        body = resp.ret
+        if isinstance(body, str):
+            body = body.encode()
+        elif not isinstance(body, bytes | bytearray):
+            # Streams, and bodies framework adapters deal with.
+            return resp, None, None
+        if len(body) < min_size or "content-encoding" in resp.headers:
+            return resp, None, None
+        if not accept_encoding:
+            encoding = None
+        else:
+            try:
+                encoding = chosen[accept_encoding]
+            except KeyError:
+                if len(chosen) >= ENCODING_CACHE_SIZE:
+                    # Threaded backends may be evicting concurrently.
+                    with suppress(RuntimeError, StopIteration):
+                        chosen.pop(next(iter(chosen)), None)
+                encoding = chosen[accept_encoding] = choose_encoding(
+                    accept_encoding, encodings
+                )
+        if encoding is None:
+            # The response could have been compressed for other clients.
+            return resp.__class__(resp.ret, _add_vary(resp.headers)), None, None
+        return resp, encoding, body
+
+    def build(resp: BaseResponse, encoding: Encoding, compressed: bytes) -> Any:
+        return resp.__class__(
+            compressed, _add_vary(resp.headers) | {"content-encoding": encoding.name}
+        )
+
+    def compress(value: Any, accept_encoding: str) -> Any:
+        resp, encoding, body = prepare(value, accept_encoding)
+        if encoding is None:
+            return resp
+        return build(resp, encoding, encoding.compress(body))
+
+    async def acompress(value: Any, accept_encoding: str) -> Any:
+        resp, encoding, body = prepare(value, accept_encoding)
+        if encoding is None:
+            return resp
+        if len(body) >= offload_size:
+            return build(resp, encoding, await to_thread(encoding.compress, body))
+        return build(resp, encoding, encoding.compress(body))
+
+    return wrap_with_header(
+        handler,
+        "accept-encoding",
+        compress,
+        BaseResponse,
+        acompress if offload else None,
+    )
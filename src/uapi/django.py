@@ -1,13 +1,14 @@
 from collections.abc import Callable, Sequence
 from functools import partial
-from inspect import Parameter, Signature, signature
-from typing import Any, ClassVar, Generic, TypeAlias, TypeVar
+from inspect import Parameter, Signature
+from typing import Any, BinaryIO, ClassVar, Generic, TypeAlias, TypeVar
 
 from attrs import Factory, define
 from cattrs import Converter
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpRequest as FrameworkRequest
 from django.http import HttpResponse as FrameworkResponse
+from django.http import StreamingHttpResponse
 from django.urls import URLPattern
 from django.urls import path as django_path
 from django.views.decorators.csrf import csrf_exempt
@@ -15,9 +16,14 @@ from django.views.decorators.http import require_http_methods
 from incant import Hook, Incanter
 
 from . import ResponseException
+from ._codegen import AdapterSpec, generate_adapter
+from ._signatures import get_signature
+from ._streams import is_stream
 from .base import App as BaseApp
+from .codecs import Codec
 from .path import (
     angle_to_curly,
+    make_path_params_loader,
     parse_angle_path_params,
     parse_curly_path_params,
     strip_path_param_prefix,
@@ -25,7 +31,9 @@ from .path import (
 from .requests import (
     HeaderSpec,
     ReqBytes,
+    accepts_codecs,
     attrs_body_factory,
+    check_content_length,
     get_cookie_name,
     get_form_type,
     get_header_type,
@@ -33,6 +41,9 @@ from .requests import (
     is_form,
     is_header,
     is_req_body_attrs,
+    is_req_file,
+    read_limited_sync,
+    resolve_structure_hook,
 )
 from .responses import dict_to_headers, make_exception_adapter, make_response_adapter
 from .shorthands import ResponseShorthand, T_co
@@ -48,7 +59,10 @@ C_contra = TypeVar("C_contra", contravariant=True)
 @define
 class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
     framework_incant: Incanter = Factory(
-        lambda self: _make_django_incanter(self.converter), takes_self=True
+        lambda self: _make_django_incanter(
+            self.converter, self.max_body_size, self.codecs
+        ),
+        takes_self=True,
     )
     _framework_req_cls: ClassVar[type] = FrameworkRequest
     _framework_resp_cls: ClassVar[type] = FrameworkResponse
@@ -89,28 +103,38 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
             path = path.removeprefix("/")
             per_method_adapted = {}
             for method, (handler, name, _) in methods_and_handlers.items():
+                mark = self._profile_route(method, f"/{path}")
+                handler = self._wrap_handler(handler, name)
+                mark("wrap")
                 ra = make_response_adapter(
-                    signature(handler, eval_str=True).return_annotation,
+                    get_signature(handler).return_annotation,
                     FrameworkResponse,
                     self.converter,
                     self._shorthands,
                 )
+                mark("response_adapter")
                 path_params = parse_angle_path_params(path)
                 hooks = [Hook.for_name(p, None) for p in path_params]
                 base_handler = self.incant.compose(handler, is_async=False)
                 # Detect required content-types here, based on the registered
                 # request loaders.
-                base_sig = signature(base_handler)
+                base_sig = get_signature(base_handler)
                 req_ct: str | None = None
                 for arg in base_sig.parameters.values():
                     if is_req_body_attrs(arg):
                         _, loader = get_req_body_attrs(arg)
-                        req_ct = loader.content_type
+                        req_ct = (
+                            None
+                            if accepts_codecs(loader, self.codecs)
+                            else loader.content_type
+                        )
+                mark("compose")
                 prepared = self.framework_incant.compose(
                     base_handler, hooks, is_async=False
                 )
-                sig = signature(prepared)
+                sig = get_signature(prepared)
                 path_types = {p: sig.parameters[p].annotation for p in path_params}
+                path_loader = make_path_params_loader(path_types, self.converter)
                 adapted = self.framework_incant.adapt(
                     prepared,
                     lambda p: p.annotation is FrameworkRequest,
@@ -118,16 +142,31 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                     lambda p: p.annotation is Method,
                     **{pp: (lambda p, _pp=pp: p.name == _pp) for pp in path_params},
                 )
-
-                if ra is None:
+                mark("framework_compose")
+
+                if self.codegen:
+                    adapted, source = generate_adapter(
+                        _adapter_spec,
+                        adapted,
+                        ra,
+                        _framework_return_adapter,
+                        exc_adapter,
+                        req_ct,
+                        name,
+                        method,
+                        path,
+                        path_types,
+                        self.converter,
+                    )
+                    self.generated_sources[(method, f"/{path}")] = source
+                elif ra is None:
 
                     def adapted(
                         request: WSGIRequest,
                         _fra=_framework_return_adapter,
                         _ea=exc_adapter,
                         _handler=adapted,
-                        _path_params=path_params,
-                        _path_types=path_types,
+                        _pl=path_loader,
                         _req_ct=req_ct,
                         _rn=name,
                         _rm=method,
@@ -140,17 +179,10 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                             return FrameworkResponse(
                                 f"invalid content type (expected {_req_ct})", status=415
                             )
-                        path_args = {
-                            p: (
-                                self.converter.structure(kwargs[p], path_type)
-                                if (path_type := _path_types[p])
-                                not in (str, Signature.empty)
-                                else kwargs[p]
-                            )
-                            for p in _path_params
-                        }
                         try:
-                            return _handler(request, _rn, _rm, **path_args)
+                            if _pl is None:
+                                return _handler(request, _rn, _rm)
+                            return _handler(request, _rn, _rm, **_pl(kwargs))
                         except ResponseException as exc:
                             return _fra(_ea(exc))
 
@@ -162,8 +194,7 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                         _fra=_framework_return_adapter,
                         _ea=exc_adapter,
                         _handler=adapted,
-                        _path_params=path_params,
-                        _path_types=path_types,
+                        _pl=path_loader,
                         _req_ct=req_ct,
                         _rn=name,
                         _rm=method,
@@ -176,21 +207,15 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                             return FrameworkResponse(
                                 f"invalid content type (expected {_req_ct})", status=415
                             )
-                        path_args = {
-                            p: (
-                                self.converter.structure(kwargs[p], path_type)
-                                if (path_type := _path_types[p])
-                                not in (str, Signature.empty)
-                                else kwargs[p]
-                            )
-                            for p in _path_params
-                        }
                         try:
-                            return _fra(_ra(_handler(request, _rn, _rm, **path_args)))
+                            if _pl is None:
+                                return _fra(_ra(_handler(request, _rn, _rm)))
+                            return _fra(_ra(_handler(request, _rn, _rm, **_pl(kwargs))))
                         except ResponseException as exc:
                             return _fra(_ea(exc))
 
                 per_method_adapted[method] = adapted
+                mark("adapter")
 
             if len(methods_and_handlers) > 1:
                 # Django cannot easily do different handlers on the same path,
@@ -214,19 +239,34 @@ class DjangoApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                     )
                 )
 
+        self._run_build_hooks()
         return res
 
 
+_adapter_spec = AdapterSpec(
+    is_async=False,
+    params="request, **kwargs",
+    handler_args="request, _rn, _rm",
+    content_type='request.headers.get("content-type")',
+    raw_path_params="kwargs",
+    unsupported_media_type="_FrameworkResponse(_ct_msg, status=415)",
+    namespace={"_FrameworkResponse": FrameworkResponse},
+)
+
 App: TypeAlias = DjangoApp[FrameworkResponse]
 
 
-def _make_django_incanter(converter: Converter) -> Incanter:
+def _make_django_incanter(
+    converter: Converter, max_body_size: int | None = None, codecs: Sequence[Codec] = ()
+) -> Incanter:
     """Create the framework incanter for Starlette."""
     res = Incanter()
 
     def query_factory(p: Parameter):
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query(_request: FrameworkRequest) -> Any:
-            return converter.structure(
+            return hook(
                 (
                     _request.GET[p.name]
                     if p.default is Signature.empty
@@ -258,12 +298,14 @@ def _make_django_incanter(converter: Converter) -> Incanter:
     def nonstring_list_query_factory(
         p: Parameter,
     ) -> Callable[[FrameworkRequest], Sequence]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query(_request: FrameworkRequest):
             return (
-                converter.structure(_request.GET.getlist(p.name), p.annotation)
+                hook(_request.GET.getlist(p.name), p.annotation)
                 if p.default is Signature.empty
                 else (
-                    converter.structure(_request.GET.getlist(p.name), p.annotation)
+                    hook(_request.GET.getlist(p.name), p.annotation)
                     if p.name in _request.GET
                     else p.default
                 )
@@ -304,12 +346,27 @@ def _make_django_incanter(converter: Converter) -> Incanter:
         lambda p: _make_cookie_dependency(get_cookie_name(p.annotation, p.name), default=p.default),  # type: ignore
     )
 
-    def request_bytes(_request: FrameworkRequest) -> bytes:
-        return _request.body
+    if max_body_size is None:
+
+        def request_bytes(_request: FrameworkRequest) -> bytes:
+            return _request.body
+
+    else:
+        limit = max_body_size
+
+        def request_bytes(_request: FrameworkRequest) -> bytes:
+            check_content_length(_request.META.get("CONTENT_LENGTH"), limit)
+            return read_limited_sync(_request, limit)
 
     res.register_hook(lambda p: p.annotation is ReqBytes, request_bytes)
+
+    def request_file(_request: FrameworkRequest) -> BinaryIO:
+        return _request
+
+    res.register_hook(is_req_file, request_file)
     res.register_hook_factory(
-        is_req_body_attrs, partial(attrs_body_factory, converter=converter)
+        is_req_body_attrs,
+        partial(attrs_body_factory, converter=converter, codecs=codecs),
     )
 
     res.register_hook_factory(
@@ -402,7 +459,15 @@ def _make_form_dependency(
     return read_form
 
 
-def _framework_return_adapter(resp: BaseResponse) -> FrameworkResponse:
+def _framework_return_adapter(
+    resp: BaseResponse,
+) -> FrameworkResponse | StreamingHttpResponse:
+    if is_stream(resp.ret):
+        return StreamingHttpResponse(
+            resp.ret,
+            status=get_status_code(resp.__class__),  # type: ignore
+            headers=dict_to_headers(resp.headers) if resp.headers else None,
+        )
     if resp.headers:
         return FrameworkResponse(
             resp.ret or b"",
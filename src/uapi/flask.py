@@ -1,7 +1,7 @@
 from collections.abc import Callable, Sequence
 from functools import partial
-from inspect import Parameter, Signature, signature
-from typing import Any, ClassVar, Generic, TypeAlias, TypeVar
+from inspect import Parameter, Signature
+from typing import Any, BinaryIO, ClassVar, Generic, TypeAlias, TypeVar
 
 from attrs import Factory, define
 from cattrs import Converter
@@ -11,7 +11,10 @@ from flask import Flask, request
 from flask import Response as FrameworkResponse
 
 from . import ResponseException
+from ._codegen import AdapterSpec, generate_adapter
+from ._signatures import get_signature
 from .base import App as BaseApp
+from .codecs import Codec
 from .path import (
     angle_to_curly,
     parse_angle_path_params,
@@ -21,7 +24,9 @@ from .path import (
 from .requests import (
     HeaderSpec,
     ReqBytes,
+    accepts_codecs,
     attrs_body_factory,
+    check_content_length,
     get_cookie_name,
     get_form_type,
     get_header_type,
@@ -29,6 +34,9 @@ from .requests import (
     is_form,
     is_header,
     is_req_body_attrs,
+    is_req_file,
+    read_limited_sync,
+    resolve_structure_hook,
 )
 from .responses import dict_to_headers, make_exception_adapter, make_response_adapter
 from .status import BadRequest, BaseResponse, get_status_code
@@ -43,7 +51,10 @@ C_contra = TypeVar("C_contra", contravariant=True)
 @define
 class FlaskApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
     framework_incant: Incanter = Factory(
-        lambda self: _make_flask_incanter(self.converter), takes_self=True
+        lambda self: _make_flask_incanter(
+            self.converter, self.max_body_size, self.codecs
+        ),
+        takes_self=True,
     )
     _framework_resp_cls: ClassVar[type] = FrameworkResponse
 
@@ -52,25 +63,34 @@ class FlaskApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
         exc_adapter = make_exception_adapter(self.converter)
 
         for (method, path), (handler, name, _) in self._route_map.items():
+            mark = self._profile_route(method, path)
+            handler = self._wrap_handler(handler, name)
+            mark("wrap")
             ra = make_response_adapter(
-                signature(handler, eval_str=True).return_annotation,
+                get_signature(handler).return_annotation,
                 FrameworkResponse,
                 self.converter,
                 self._shorthands,
             )
+            mark("response_adapter")
             path_params = parse_angle_path_params(path)
             hooks = [Hook.for_name(p, None) for p in path_params]
 
             base_handler = self.incant.compose(handler, is_async=False)
             # Detect required content-types here, based on the registered
             # request loaders.
-            base_sig = signature(base_handler)
+            base_sig = get_signature(base_handler)
             req_ct: str | None = None
             for arg in base_sig.parameters.values():
                 if is_req_body_attrs(arg):
                     _, loader = get_req_body_attrs(arg)
-                    req_ct = loader.content_type
+                    req_ct = (
+                        None
+                        if accepts_codecs(loader, self.codecs)
+                        else loader.content_type
+                    )
 
+            mark("compose")
             prepared = self.framework_incant.compose(
                 base_handler, hooks, is_async=False
             )
@@ -80,7 +100,23 @@ class FlaskApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                 lambda p: p.annotation is Method,
                 **{pp: (lambda p, _pp=pp: p.name == _pp) for pp in path_params},
             )
-            if ra is None:
+            mark("framework_compose")
+            if self.codegen:
+                adapted, source = generate_adapter(
+                    _adapter_spec,
+                    adapted,
+                    ra,
+                    _framework_return_adapter,
+                    exc_adapter,
+                    req_ct,
+                    name,
+                    method,
+                    path,
+                    {},
+                    self.converter,
+                )
+                self.generated_sources[(method, path)] = source
+            elif ra is None:
 
                 def o0(
                     _handler=adapted,
@@ -140,7 +176,9 @@ class FlaskApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                 methods=[method],
                 endpoint=name if name is not None else handler.__name__,
             )(adapted)
+            mark("adapter")
 
+        self._run_build_hooks()
         return f
 
     def run(self, import_name: str, host: str | None = None, port: int = 8000):
@@ -152,24 +190,41 @@ class FlaskApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
         return (strip_path_param_prefix(angle_to_curly(p)), parse_curly_path_params(p))
 
 
+_adapter_spec = AdapterSpec(
+    is_async=False,
+    params="**kwargs",
+    handler_args="_rn, _rm",
+    content_type='_request.headers.get("content-type")',
+    raw_path_params=None,
+    unsupported_media_type="_FrameworkResponse(_ct_msg, 415)",
+    namespace={"_request": request, "_FrameworkResponse": FrameworkResponse},
+)
+
 App: TypeAlias = FlaskApp[FrameworkResponse]
 
 
-def _make_flask_incanter(converter: Converter) -> Incanter:
+def _make_flask_incanter(
+    converter: Converter, max_body_size: int | None = None, codecs: Sequence[Codec] = ()
+) -> Incanter:
     """Create the framework incanter for Flask."""
     res = Incanter()
 
-    res.register_hook_factory(
-        lambda _: True,
-        lambda p: lambda: converter.structure(
-            (
-                request.args[p.name]
-                if p.default is Signature.empty
-                else request.args.get(p.name, p.default)
-            ),
-            p.annotation,
-        ),
-    )
+    def query_factory(p: Parameter) -> Callable[[], Any]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
+        def read_query() -> Any:
+            return hook(
+                (
+                    request.args[p.name]
+                    if p.default is Signature.empty
+                    else request.args.get(p.name, p.default)
+                ),
+                p.annotation,
+            )
+
+        return read_query
+
+    res.register_hook_factory(lambda _: True, query_factory)
     res.register_hook_factory(
         lambda p: p.annotation in (Signature.empty, str),
         lambda p: lambda: (
@@ -180,12 +235,14 @@ def _make_flask_incanter(converter: Converter) -> Incanter:
     )
 
     def nonstring_list_query_factory(p: Parameter) -> Callable[[], Sequence]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query():
             return (
-                converter.structure(request.args.getlist(p.name), p.annotation)
+                hook(request.args.getlist(p.name), p.annotation)
                 if p.default is Signature.empty
                 else (
-                    converter.structure(request.args.getlist(p.name), p.annotation)
+                    hook(request.args.getlist(p.name), p.annotation)
                     if p.name in request.args
                     else p.default
                 )
@@ -227,13 +284,28 @@ def _make_flask_incanter(converter: Converter) -> Incanter:
         lambda p: _make_cookie_dependency(get_cookie_name(p.annotation, p.name), default=p.default),  # type: ignore
     )
 
-    def request_bytes() -> bytes:
-        return request.data
+    if max_body_size is None:
+
+        def request_bytes() -> bytes:
+            return request.data
+
+    else:
+        limit = max_body_size
+
+        def request_bytes() -> bytes:
+            check_content_length(request.content_length, limit)
+            return read_limited_sync(request.stream, limit)
 
     res.register_hook(lambda p: p.annotation is ReqBytes, request_bytes)
 
+    def request_file() -> BinaryIO:
+        return request.stream  # type: ignore[return-value]
+
+    res.register_hook(is_req_file, request_file)
+
     res.register_hook_factory(
-        is_req_body_attrs, partial(attrs_body_factory, converter=converter)
+        is_req_body_attrs,
+        partial(attrs_body_factory, converter=converter, codecs=codecs),
     )
 
     res.register_hook_factory(
@@ -1,6 +1,11 @@
 """For path parameters."""
 
+from collections.abc import Callable, Mapping
+from inspect import Signature
 from re import compile, sub
+from typing import Any
+
+from cattrs import Converter
 
 _angle_path_pattern = compile(r"<([a-zA-Z_:]+)>")
 _curly_path_pattern = compile(r"{([a-zA-Z_]+)}")
@@ -23,3 +28,45 @@ def strip_path_param_prefix(path: str) -> str:
 
 def angle_to_curly(path: str) -> str:
     return path.replace("<", "{").replace(">", "}")
+
+
+def make_path_params_loader(
+    path_types: dict[str, Any], converter: Converter
+) -> Callable[[Mapping[str, Any]], dict[str, Any]] | None:
+    """Prepare a function for loading path parameters, once per route.
+
+    Structure hooks are resolved here, so loading does no type checks or
+    converter dispatch per request.
+
+    :param path_types: A mapping of path parameter names to their types.
+    :return: A loader, or `None` for routes without path parameters.
+    """
+    if not path_types:
+        return None
+    plan = [
+        (
+            name,
+            (
+                converter.get_structure_hook(type)
+                if type not in (str, Signature.empty)
+                else None
+            ),
+            type,
+        )
+        for name, type in path_types.items()
+    ]
+    if all(hook is None for _, hook, _ in plan):
+        names = list(path_types)
+
+        def load_str_path_params(raw: Mapping[str, Any]) -> dict[str, Any]:
+            return {name: raw[name] for name in names}
+
+        return load_str_path_params
+
+    def load_path_params(raw: Mapping[str, Any]) -> dict[str, Any]:
+        return {
+            name: raw[name] if hook is None else hook(raw[name], type)
+            for name, hook, type in plan
+        }
+
+    return load_path_params
@@ -0,0 +1,88 @@
+"""Profiling the startup work of apps."""
+
+from collections.abc import Callable
+from time import perf_counter
+
+from attrs import Factory, define
+
+__all__ = ["StartupProfile"]
+
+
+@define
+class StartupProfile:
+    """Timings of the work done preparing routes, by route and phase.
+
+    Pass an instance to an app as `startup_profile` to have it filled in when
+    the framework app is built and when OpenAPI specs are created.
+
+    The phases are:
+
+    * `wrap`: wrapping handlers for codecs and compression.
+    * `response_adapter`: inspecting the return type and creating the
+      response adapter.
+    * `compose`: composing the handler with its dependencies.
+    * `framework_compose`: composing and adapting the handler for the
+      framework.
+    * `adapter`: creating the framework adapter, and registering it.
+    * `openapi`: building the OpenAPI operation and schemas.
+    """
+
+    #: Seconds spent, by method and path, then by phase.
+    timings: dict[tuple[str, str], dict[str, float]] = Factory(dict)
+
+    def start(self, method: str, path: str) -> Callable[[str], None]:
+        """Start timing a route.
+
+        :return: A function to call at the end of every phase, with the phase
+            name. Time since the previous call (or this one) is added to the
+            phase.
+        """
+        route = self.timings.setdefault((method, path), {})
+        last = perf_counter()
+
+        def mark(phase: str) -> None:
+            nonlocal last
+            now = perf_counter()
+            route[phase] = route.get(phase, 0.0) + now - last
+            last = now
+
+        return mark
+
+    def totals(self) -> list[tuple[tuple[str, str], float]]:
+        """Total seconds by route, most expensive first."""
+        return sorted(
+            ((route, sum(phases.values())) for route, phases in self.timings.items()),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def report(self, limit: int | None = None) -> str:
+        """Render a table of routes, most expensive first, in milliseconds.
+
+        :param limit: Include only this many routes.
+        """
+        phases = list(dict.fromkeys(p for t in self.timings.values() for p in t))
+        rows = [
+            [
+                f"{method} {path}",
+                f"{total * 1000:.2f}",
+                *(
+                    f"{self.timings[(method, path)].get(p, 0.0) * 1000:.2f}"
+                    for p in phases
+                ),
+            ]
+            for (method, path), total in self.totals()[:limit]
+        ]
+        header = ["route", "total", *phases]
+        widths = [max(len(r[i]) for r in [header, *rows]) for i in range(len(header))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if ix == 0 else cell.rjust(width)
+                for ix, (cell, width) in enumerate(zip(row, widths, strict=True))
+            )
+            for row in [header, *rows]
+        )
+
+
+def _no_mark(phase: str) -> None:
+    """Used instead of timing when profiling is off."""
@@ -0,0 +1,76 @@
+"""Lazy query string parsing."""
+
+from typing import Any, Final
+from urllib.parse import unquote_plus
+
+__all__ = ["LazyQuery"]
+
+_MISSING: Final = object()
+
+
+class LazyQuery:
+    """A query string, parsed on demand.
+
+    The raw query string is only split on first access, and values are
+    percent-decoded parameter by parameter, only when read. Long query
+    strings full of parameters the handler doesn't declare are therefore
+    cheap to carry around.
+
+    Instances are meant to be cached per request, so several parameters
+    share the work.
+    """
+
+    __slots__ = ("_decoded", "_raw", "_split")
+
+    def __init__(self, raw: str) -> None:
+        self._raw = raw
+        self._split: dict[str, list[str]] | None = None
+        self._decoded: dict[str, list[str]] = {}
+
+    def _split_raw(self) -> dict[str, list[str]]:
+        res: dict[str, list[str]] = {}
+        for chunk in self._raw.split("&"):
+            if not chunk:
+                continue
+            name, _, value = chunk.partition("=")
+            res.setdefault(_decode(name), []).append(value)
+        self._split = res
+        return res
+
+    def getall(self, name: str) -> list[str]:
+        """Get all values for the name, in order. Empty if missing."""
+        res = self._decoded.get(name)
+        if res is None:
+            split = self._split if self._split is not None else self._split_raw()
+            res = self._decoded[name] = [_decode(v) for v in split.get(name, ())]
+        return res
+
+    def get(self, name: str, default: Any = _MISSING) -> Any:
+        """Get the last value for the name.
+
+        :raises KeyError: If the name is missing and there is no default.
+        """
+        if values := self.getall(name):
+            return values[-1]
+        if default is _MISSING:
+            raise KeyError(name)
+        return default
+
+    def get_first(self, name: str, default: Any = _MISSING) -> Any:
+        """Get the first value for the name.
+
+        :raises KeyError: If the name is missing and there is no default.
+        """
+        if values := self.getall(name):
+            return values[0]
+        if default is _MISSING:
+            raise KeyError(name)
+        return default
+
+    def __contains__(self, name: str) -> bool:
+        split = self._split if self._split is not None else self._split_raw()
+        return name in split
+
+
+def _decode(val: str) -> str:
+    return unquote_plus(val) if "%" in val or "+" in val else val
@@ -1,6 +1,6 @@
-from collections.abc import Callable
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Sequence
 from inspect import Parameter
-from typing import Annotated, Any, NewType, TypeAlias, TypeVar
+from typing import TYPE_CHECKING, Annotated, Any, BinaryIO, NewType, TypeAlias, TypeVar
 
 from attrs import frozen, has
 from cattrs import Converter
@@ -8,7 +8,16 @@ from cattrs._compat import get_args, is_annotated
 from orjson import loads
 
 from . import Cookie
-from .status import BadRequest, BaseResponse, ResponseException
+from .status import (
+    BadRequest,
+    BaseResponse,
+    PayloadTooLarge,
+    ResponseException,
+    UnsupportedMediaType,
+)
+
+if TYPE_CHECKING:
+    from .codecs import Codec
 
 T = TypeVar("T")
 RequestLoaderPredicate: TypeAlias = Callable[[Parameter], bool]
@@ -39,6 +48,23 @@ class FormSpec:
 ReqBody = Annotated[T, JsonBodyLoader()]
 ReqBytes = NewType("ReqBytes", bytes)
 
+#: The request body, as an async iterator of chunks, for async apps.
+#: The body is not buffered, and no size limit is applied.
+ReqStream: TypeAlias = AsyncIterator[bytes]
+
+#: The request body, as a binary file-like object, for sync apps.
+#: The body is not buffered, and no size limit is applied.
+ReqFile: TypeAlias = BinaryIO
+
+
+def is_req_stream(p: Parameter) -> bool:
+    return p.annotation == ReqStream
+
+
+def is_req_file(p: Parameter) -> bool:
+    return p.annotation is ReqFile
+
+
 #: A form in the request body.
 FormBody: TypeAlias = Annotated[T, FormSpec()]
 
@@ -46,27 +72,65 @@ FormBody: TypeAlias = Annotated[T, FormSpec()]
 Header: TypeAlias = Annotated[T, HeaderSpec()]
 
 
-def get_cookie_name(t, arg_name: str) -> str | None:
+@frozen
+class _AnnotationInfo:
+    """What an annotation asks to be loaded from."""
+
+    header: tuple[type, HeaderSpec] | None = None
+    form: type | None = None
+    body: tuple[type, JsonBodyLoader] | None = None
+    #: The cookie name, `""` meaning the parameter name, or `None`.
+    cookie: str | None = None
+
+
+_annotation_infos: dict[Any, _AnnotationInfo] = {}
+
+
+def _get_annotation_info(t: Any) -> _AnnotationInfo:
+    """Walk the metadata of `t` once, caching the result by annotation.
+
+    The same annotations are checked repeatedly while composing handlers and
+    generating OpenAPI specs.
+    """
+    try:
+        return _annotation_infos[t]
+    except KeyError:
+        res = _annotation_infos[t] = _make_annotation_info(t)
+        return res
+    except TypeError:
+        # Unhashable metadata.
+        return _make_annotation_info(t)
+
+
+def _make_annotation_info(t: Any) -> _AnnotationInfo:
     if t is Cookie or t is Cookie | None:
-        return arg_name
+        return _AnnotationInfo(cookie="")
+    if not is_annotated(t) or not (args := get_args(t)):
+        return _AnnotationInfo()
+    header = form = body = cookie = None
+    is_body_type = has(args[0]) or getattr(args[0], "__origin__", None) is dict
+    for arg in args[1:]:
+        if header is None and isinstance(arg, HeaderSpec):
+            header = (args[0], arg)
+        elif form is None and isinstance(arg, FormSpec):
+            form = args[0]
+        elif body is None and is_body_type and isinstance(arg, JsonBodyLoader):
+            body = (args[0], arg)
+        elif cookie is None and arg.__class__ is Cookie:
+            cookie = arg
+    return _AnnotationInfo(header, form, body, cookie)
 
-    if is_annotated(t):
-        for arg in get_args(t)[1:]:
-            if arg.__class__ is Cookie:
-                return arg or arg_name
-    return None
+
+def get_cookie_name(t, arg_name: str) -> str | None:
+    cookie = _get_annotation_info(t).cookie
+    if cookie is None:
+        return None
+    return cookie or arg_name
 
 
 def maybe_header_type(p: Parameter) -> tuple[type, HeaderSpec] | None:
     """Get the Annotated HeaderSpec, if present."""
-    t = p.annotation
-    if is_annotated(t):
-        args = get_args(t)
-        if args:
-            for arg in args[1:]:
-                if isinstance(arg, HeaderSpec):
-                    return args[0], arg
-    return None
+    return _get_annotation_info(p.annotation).header
 
 
 def get_header_type(p: Parameter) -> tuple[type, HeaderSpec]:
@@ -84,14 +148,7 @@ def is_header(p: Parameter) -> bool:
 
 def maybe_form_type(p: Parameter) -> type | None:
     """Get the underlying form type, is present."""
-    t = p.annotation
-    if is_annotated(t):
-        args = get_args(t)
-        if args:
-            for arg in args[1:]:
-                if isinstance(arg, FormSpec):
-                    return args[0]
-    return None
+    return _get_annotation_info(p.annotation).form
 
 
 def get_form_type(p: Parameter) -> type:
@@ -105,30 +162,107 @@ def is_form(p: Parameter) -> bool:
     return maybe_form_type(p) is not None
 
 
+def _too_large() -> ResponseException:
+    return ResponseException(PayloadTooLarge("payload too large"))
+
+
+def check_content_length(content_length: str | int | None, max_size: int) -> None:
+    """Reject requests declaring bodies larger than `max_size`, before reading."""
+    if content_length is None:
+        return
+    try:
+        declared = int(content_length)
+    except ValueError:
+        return
+    if declared > max_size:
+        raise _too_large()
+
+
+async def read_limited(chunks: AsyncIterable[bytes], max_size: int) -> bytes:
+    """Read chunks into a single body, aborting once it exceeds `max_size`."""
+    buf = bytearray()
+    async for chunk in chunks:
+        buf += chunk
+        if len(buf) > max_size:
+            raise _too_large()
+    return bytes(buf)
+
+
+def read_limited_sync(file: Any, max_size: int) -> bytes:
+    """Read a file-like into a single body, rejecting it if larger than `max_size`."""
+    res = file.read(max_size + 1)
+    if len(res) > max_size:
+        raise _too_large()
+    return res
+
+
+def accepts_codecs(loader: JsonBodyLoader, codecs: Sequence["Codec"]) -> bool:
+    """Whether bodies with this loader can be in any of the app codecs.
+
+    Only loaders with the default content type do; custom content types are
+    JSON only.
+    """
+    return bool(codecs) and loader.content_type == "application/json"
+
+
+def resolve_structure_hook(converter: Converter, t: Any) -> Callable[[Any, Any], Any]:
+    """Get the structure hook for `t` once, instead of dispatching per request.
+
+    If the converter can't handle `t` (yet), dispatching is left to request
+    time, so errors surface the same way and hooks registered later apply.
+    """
+    try:
+        return converter.get_structure_hook(t)
+    except Exception:
+        return converter.structure
+
+
 def attrs_body_factory(
-    parameter: Parameter, converter: Converter
-) -> Callable[[ReqBytes], Any]:
+    parameter: Parameter, converter: Converter, codecs: Sequence["Codec"] = ()
+) -> Callable[..., Any]:
     attrs_cls, loader = get_req_body_attrs(parameter)
 
-    def structure_body(body: ReqBytes) -> Any:
+    if not accepts_codecs(loader, codecs):
+        hook = resolve_structure_hook(converter, attrs_cls)
+
+        def structure_body(body: ReqBytes) -> Any:
+            try:
+                return hook(loads(body), attrs_cls)
+            except Exception as exc:
+                raise ResponseException(loader.error_handler(exc, body)) from exc
+
+        return structure_body
+
+    # The content type is checked here instead of by the framework adapter.
+    decoders = {
+        "application/json": (loads, converter.get_structure_hook(attrs_cls)),
+        **{
+            c.content_type: (c.loads, c.converter.get_structure_hook(attrs_cls))
+            for c in codecs
+        },
+    }
+    unsupported = UnsupportedMediaType(
+        f"invalid content type (expected one of {', '.join(decoders)})"
+    )
+
+    def structure_codec_body(
+        body: ReqBytes,
+        _uapi_content_type: Annotated[str, HeaderSpec("content-type")] = "",
+    ) -> Any:
+        decoder = decoders.get(_uapi_content_type.partition(";")[0].strip())
+        if decoder is None:
+            raise ResponseException(unsupported)
         try:
-            return converter.structure(loads(body), attrs_cls)
+            return decoder[1](decoder[0](body), attrs_cls)
         except Exception as exc:
             raise ResponseException(loader.error_handler(exc, body)) from exc
 
-    return structure_body
+    return structure_codec_body
 
 
 def maybe_req_body_type(p: Parameter) -> tuple[type, JsonBodyLoader] | None:
     """Is this parameter a valid request body?"""
-    t = p.annotation
-    if is_annotated(t):
-        args = get_args(t)
-        if args and (has(args[0]) or getattr(args[0], "__origin__", None) is dict):
-            for arg in args[1:]:
-                if isinstance(arg, JsonBodyLoader):
-                    return args[0], arg
-    return None
+    return _get_annotation_info(p.annotation).body
 
 
 def get_req_body_attrs(p: Parameter) -> tuple[type, JsonBodyLoader]:
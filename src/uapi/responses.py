@@ -9,6 +9,7 @@ from cattrs._compat import is_union_type
 from incant import is_subclass
 from orjson import dumps
 
+from ._streams import is_stream
 from .shorthands import ResponseShorthand, can_shorthand_handle
 from .status import BaseResponse, Headers, ResponseException
 
@@ -73,15 +74,27 @@ def _make_union_response_adapter(
 
     if not shorthand_checks:
         # No shorthands, it's all BaseResponses.
-        return lambda val: val.__class__(
-            ret=dumps(converter.unstructure(val.ret)) if val.ret is not None else None,
-            headers=val.headers | {"content-type": "application/json"},
-        )
+
+        def base_response_adapter(val: BaseResponse) -> BaseResponse:
+            if is_stream(val.ret):
+                return val
+            return val.__class__(
+                ret=(
+                    dumps(converter.unstructure(val.ret))
+                    if val.ret is not None
+                    else None
+                ),
+                headers=val.headers | {"content-type": "application/json"},
+            )
+
+        return base_response_adapter
 
     def response_adapter(val: Any, _shs=shorthand_checks) -> BaseResponse:
         for is_union_member, ra in _shs:
             if is_union_member(val):
                 return ra(val)
+        if is_stream(val.ret):
+            return val
         return val.__class__(
             dumps(converter.unstructure(val.ret)) if val.ret is not None else None,
             val.headers | {"content-type": "application/json"},
@@ -100,7 +113,9 @@ def make_exception_adapter(
     """
 
     def adapt_exception(exc: ResponseException) -> BaseResponse:
-        if isinstance(exc.response.ret, str | bytes | None):
+        if isinstance(exc.response.ret, str | bytes | None) or is_stream(
+            exc.response.ret
+        ):
             return exc.response
         return exc.response.__class__(
             dumps(converter.unstructure(exc.response.ret)),
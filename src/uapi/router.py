@@ -0,0 +1,170 @@
+"""A compiled prefix-tree router, usable by the framework adapters."""
+
+from collections.abc import Callable
+from re import Pattern, escape
+from re import compile as re_compile
+from typing import Generic, TypeVar
+
+__all__ = ["Router"]
+
+T = TypeVar("T")
+
+_curly_segment = re_compile(r"^{([a-zA-Z_]+)(?::([a-zA-Z_]+))?}$")
+_angle_segment = re_compile(r"^<(?:([a-zA-Z_]+):)?([a-zA-Z_]+)>$")
+_param_in_segment = re_compile(r"{([a-zA-Z_]+)}|<(?:[a-zA-Z_]+:)?([a-zA-Z_]+)>")
+
+
+def _is_int(segment: str) -> bool:
+    # `str.isdigit` alone accepts digits `int` doesn't, like superscripts.
+    return segment.isascii() and segment.isdigit()
+
+
+# The same patterns as Starlette's convertors, so both routers agree.
+_float_segment = re_compile(r"[0-9]+(\.[0-9]+)?")
+_uuid_segment = re_compile(
+    r"[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}"
+)
+
+
+def _is_float(segment: str) -> bool:
+    # `float` would also accept `nan`, `inf`, exponents and underscores.
+    return _float_segment.fullmatch(segment) is not None
+
+
+def _is_uuid(segment: str) -> bool:
+    return _uuid_segment.fullmatch(segment) is not None
+
+
+#: Segment checks for typed path parameters, by converter name.
+#: `None` means any non-empty segment matches.
+segment_checks: dict[str, Callable[[str], bool] | None] = {
+    "str": None,
+    "string": None,
+    "int": _is_int,
+    "float": _is_float,
+    "uuid": _is_uuid,
+}
+
+
+class _Node(Generic[T]):
+    __slots__ = ("catch_all", "handlers", "params", "patterns", "static")
+
+    def __init__(self) -> None:
+        self.static: dict[str, _Node[T]] = {}
+        self.params: list[tuple[str, Callable[[str], bool] | None, _Node[T]]] = []
+        self.patterns: list[tuple[Pattern[str], _Node[T]]] = []
+        self.catch_all: tuple[str, dict[str, T]] | None = None
+        self.handlers: dict[str, T] = {}
+
+
+class Router(Generic[T]):
+    """A router matching paths segment by segment against a prefix tree.
+
+    Static segments are looked up in a dictionary at every level, so
+    dispatch cost depends on the depth of the path instead of the number
+    of routes.
+
+    Paths may use curly (`/{id}`, `/{id:int}`) or angle (`/<id>`,
+    `/<int:id>`) path parameters. Typed parameters only match segments
+    passing their converter's check (see `segment_checks`), and the
+    `path` converter matches the rest of the path. Static segments take
+    precedence over parameters, which take precedence over segments
+    mixing text and parameters.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self) -> None:
+        self._root: _Node[T] = _Node()
+
+    def add(self, method: str, path: str, handler: T) -> None:
+        """Register a handler for the method and path."""
+        node = self._root
+        for segment in path.split("/"):
+            if (m := _curly_segment.match(segment)) is not None:
+                name, conv = m.groups()
+            elif (m := _angle_segment.match(segment)) is not None:
+                conv, name = m.groups()
+            elif _param_in_segment.search(segment) is not None:
+                pattern = _compile_segment(segment)
+                for existing, child in node.patterns:
+                    if existing.pattern == pattern.pattern:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.patterns.append((pattern, child))
+                    node = child
+                continue
+            else:
+                node = node.static.setdefault(segment, _Node())
+                continue
+
+            if conv == "path":
+                if node.catch_all is None:
+                    node.catch_all = (name, {})
+                node.catch_all[1][method] = handler
+                return
+            if conv is not None and conv not in segment_checks:
+                raise ValueError(f"Unknown path converter: {conv}")
+            check = segment_checks[conv] if conv is not None else None
+            for existing_name, existing_check, child in node.params:
+                if existing_name == name and existing_check is check:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.params.append((name, check, child))
+                node = child
+        node.handlers[method] = handler
+
+    def match(self, path: str) -> tuple[dict[str, T], dict[str, str]] | None:
+        """Match a path.
+
+        :return: The handlers for the path, by method, and the path
+            parameters. `None` if nothing matches.
+        """
+        params: dict[str, str] = {}
+        res = _match(self._root, path.split("/"), 0, params)
+        if res is None:
+            return None
+        return res, params
+
+
+def _match(
+    node: _Node[T], segments: list[str], ix: int, params: dict[str, str]
+) -> dict[str, T] | None:
+    if ix == len(segments):
+        return node.handlers or None
+    segment = segments[ix]
+    child = node.static.get(segment)
+    if child is not None and (res := _match(child, segments, ix + 1, params)):
+        return res
+    if segment:
+        for name, check, child in node.params:
+            if check is None or check(segment):
+                params[name] = segment
+                if (res := _match(child, segments, ix + 1, params)) is not None:
+                    return res
+                del params[name]
+        for pattern, child in node.patterns:
+            if (m := pattern.fullmatch(segment)) is not None and (
+                res := _match(child, segments, ix + 1, params)
+            ) is not None:
+                params.update(m.groupdict())
+                return res
+    if node.catch_all is not None:
+        name, handlers = node.catch_all
+        params[name] = "/".join(segments[ix:])
+        return handlers
+    return None
+
+
+def _compile_segment(segment: str) -> Pattern[str]:
+    """Compile a segment mixing text and path parameters into a regex."""
+    res = ""
+    pos = 0
+    for m in _param_in_segment.finditer(segment):
+        res += f"{escape(segment[pos:m.start()])}(?P<{m.group(1) or m.group(2)}>.+?)"
+        pos = m.end()
+    return re_compile(res + escape(segment[pos:]))
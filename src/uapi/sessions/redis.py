@@ -1,12 +1,16 @@
 """Redis backends for sessions."""
 
+from asyncio import CancelledError, Task, create_task, sleep
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
 from json import dumps, loads
 from secrets import token_hex
-from time import time
+from time import monotonic, time
 from typing import TYPE_CHECKING, Annotated, TypeVar
+from warnings import warn
 
-from attrs import frozen
+from attrs import Factory, define, field, frozen
 
 from .. import Cookie, Headers
 from ..base import AsyncApp, OpenAPISecuritySpec
@@ -14,42 +18,158 @@ from ..cookies import CookieSettings, set_cookie
 from ..openapi import ApiKeySecurityScheme
 
 if TYPE_CHECKING:
-    from aioredis import Redis
+    from redis.asyncio import Redis
+    from redis.asyncio.client import Pipeline
+    from redis.commands.core import AsyncScript
 
 T1 = TypeVar("T1")
 T2 = TypeVar("T2")
 
+# The scripts touch the namespace key and session keys together. These hash
+# to different slots, so only single Redis nodes are supported, not Cluster.
+
+# Keeps the existing expiry of the session, and extends the expiry of the
+# namespace to cover it, in a single round trip.
+# KEYS: session key, namespace key.
+# ARGV: payload, TTL for new sessions, now, ID, invalidation channel or ''.
+_UPDATE_SESSION = """
+local ttl = redis.call('TTL', KEYS[1])
+if ttl < 0 then
+    ttl = tonumber(ARGV[2])
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+redis.call('ZADD', KEYS[2], tonumber(ARGV[3]) + ttl, ARGV[4])
+if ttl > redis.call('TTL', KEYS[2]) then
+    redis.call('EXPIRE', KEYS[2], ttl)
+end
+if ARGV[5] ~= '' then
+    redis.call('PUBLISH', ARGV[5], KEYS[1])
+end
+"""
+
+# Removes a batch of sessions from a namespace.
+# KEYS: namespace key, then session keys.
+# ARGV: invalidation channel or '', then session IDs.
+_REMOVE_SESSIONS = """
+for i = 2, #KEYS do
+    redis.call('DEL', KEYS[i])
+    if ARGV[1] ~= '' then
+        redis.call('PUBLISH', ARGV[1], KEYS[i])
+    end
+end
+if #ARGV > 1 then
+    redis.call('ZREM', KEYS[1], unpack(ARGV, 2))
+end
+"""
+
+# Namespaces are removed in batches, so Redis isn't blocked for long.
+_REMOVE_BATCH_SIZE = 500
+
+
+@define
+class LocalSessionCache:
+    """A bounded in-process cache of session payloads, in front of Redis.
+
+    Sessions read from Redis are kept for up to `max_staleness` seconds, with
+    the least recently used ones evicted beyond `max_size`. Session updates
+    and removals are published on the Redis `channel`, and every process
+    using a cache on that channel drops the affected sessions. The staleness
+    window bounds how long a session can be served from the cache after an
+    invalidation was missed, for example while reconnecting to Redis.
+
+    Pass an instance to `configure_async_sessions` as `local_cache`.
+    """
+
+    max_size: int = 10_000
+    max_staleness: float = 5.0
+    channel: str = "uapi:sessions:invalidate"
+    _entries: "OrderedDict[str, tuple[float, dict[str, str]]]" = field(
+        init=False, default=Factory(OrderedDict)
+    )
+    _listener: "Task[None] | None" = field(init=False, default=None)
+
+    def get(self, key: str) -> dict[str, str] | None:
+        """Get a cached session payload, if present and fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, payload: dict[str, str]) -> None:
+        self._entries[key] = (monotonic() + self.max_staleness, payload)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> None:
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def listen(self, redis: "Redis") -> None:
+        """Start listening for invalidations in the background, unless already
+        listening."""
+        if self._listener is None or self._listener.done():
+            self._listener = create_task(self._listen(redis))
+
+    async def _listen(self, redis: "Redis") -> None:
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Invalidations published before subscribing were missed.
+                    self.clear()
+                    async for message in pubsub.listen():
+                        key = message["data"]
+                        self.invalidate(key.decode() if isinstance(key, bytes) else key)
+            except CancelledError:
+                raise
+            except Exception:
+                # Invalidations will be missed until subscribed again.
+                self.clear()
+                await sleep(1)
+
 
 class AsyncSession(dict[str, str]):
     _cookie_name: str
     _cookie_settings: CookieSettings
-    _aioredis: "Redis"
+    _redis: "Redis"
+    _update_script: "AsyncScript"
     _namespace: str
     _id: str
     _ttl: int
     _key_prefix: str
+    _local_cache: LocalSessionCache | None
 
     async def update_session(self, *, namespace: str | None = None) -> Headers:
         namespace = namespace or self._namespace
         if namespace is None:
             raise Exception("The namespace must be set for new sessions.")
-        now = time()
         ns_key = f"{self._key_prefix}{namespace}:s"
         key = f"{ns_key}:{self._id}"
-        existing_id_ttl = await self._aioredis.ttl(key)
-        existing_namespace_ttl = await self._aioredis.ttl(ns_key)
-
-        if existing_id_ttl < 0:  # Means key not found.
-            existing_id_ttl = self._ttl
-
-        pipeline = self._aioredis.pipeline()
-
-        pipeline.set(key, dumps(self, separators=(",", ":")), expire=existing_id_ttl)
-        pipeline.zadd(ns_key, now + existing_id_ttl, self._id)
-        if existing_id_ttl > existing_namespace_ttl:
-            pipeline.expire(ns_key, existing_id_ttl)
-
-        await pipeline.execute()
+        channel = ""
+        if self._local_cache is not None:
+            channel = self._local_cache.channel
+            self._local_cache.invalidate(key)
+        await self._update_script(
+            keys=[key, ns_key],
+            args=[
+                dumps(self, separators=(",", ":")),
+                self._ttl,
+                time(),
+                self._id,
+                channel,
+            ],
+        )
 
         return set_cookie(
             self._cookie_name, f"{namespace}:{self._id}", settings=self._cookie_settings
@@ -58,39 +178,100 @@ class AsyncSession(dict[str, str]):
     async def clear_session(self) -> Headers:
         self.clear()
         if self._namespace is not None:
-            pipeline = self._aioredis.pipeline()
-            pipeline.delete(f"{self._namespace}:s:{self._id}")
-            pipeline.zrem(f"{self._namespace}:s", self._id)
+            ns_key = f"{self._key_prefix}{self._namespace}:s"
+            key = f"{ns_key}:{self._id}"
+            pipeline = self._redis.pipeline(transaction=False)
+            pipeline.delete(key)
+            pipeline.zrem(ns_key, self._id)
+            if self._local_cache is not None:
+                self._local_cache.invalidate(key)
+                pipeline.publish(self._local_cache.channel, key)
             await pipeline.execute()
         return set_cookie(self._cookie_name, None)
 
 
+@define
+class LazyAsyncSession:
+    """An `AsyncSession`, loaded from Redis on first use.
+
+    Handlers needing the session only on some code paths can depend on this
+    instead of `AsyncSession`, and skip the round trip to Redis otherwise.
+    """
+
+    _cookie: str | None
+    _load: Callable[[str | None], Awaitable[AsyncSession]]
+    _session: AsyncSession | None = None
+
+    async def load(self) -> AsyncSession:
+        """Load the session, or return it if already loaded."""
+        if self._session is None:
+            self._session = await self._load(self._cookie)
+        return self._session
+
+
+@define
+class _ExpirySweep:
+    """Expired session IDs are removed from namespaces in batches, along with
+    session reads."""
+
+    interval: float
+    _pending: set[str] = Factory(set)
+    _last: float = 0.0
+
+    def add(self, pipeline: "Pipeline", ns_key: str) -> None:
+        self._pending.add(ns_key)
+        now = monotonic()
+        if now - self._last < self.interval and len(self._pending) < 100:
+            return
+        t = time()
+        for key in self._pending:
+            pipeline.zremrangebyscore(key, 0, t)
+        self._pending.clear()
+        self._last = now
+
+
 @frozen
 class AsyncRedisSessionStore:
     _redis: "Redis"
     _key_prefix: str
     _cookie_name: str
     _cookie_settings: CookieSettings
+    _remove_script: "AsyncScript"
+    _local_cache: LocalSessionCache | None = None
 
     async def remove_namespace(self, namespace: str) -> None:
         """Remove all sessions in a particular namespace."""
         ns_key = f"{self._key_prefix}{namespace}:s"
-        session_ids = await self._redis.zrangebyscore(ns_key, time(), float("inf"))
-        pipeline = self._redis.pipeline()
-        for session_id in session_ids:
-            pipeline.delete(f"{ns_key}:{session_id}")
-        pipeline.delete(ns_key)
-        await pipeline.execute()
+        channel = ""
+        if self._local_cache is not None:
+            channel = self._local_cache.channel
+            self._local_cache.invalidate_prefix(f"{ns_key}:")
+        ids = [
+            id.decode() if isinstance(id, bytes) else str(id)
+            for id in await self._redis.zrangebyscore(ns_key, time(), "+inf")
+        ]
+        for i in range(0, len(ids), _REMOVE_BATCH_SIZE):
+            batch = ids[i : i + _REMOVE_BATCH_SIZE]
+            await self._remove_script(
+                keys=[ns_key, *(f"{ns_key}:{id}" for id in batch)],
+                args=[channel, *batch],
+            )
+        # Drops the IDs of expired sessions too.
+        await self._redis.delete(ns_key)
 
 
 def configure_async_sessions(
     app: AsyncApp,
-    aioredis: "Redis",
+    redis: "Redis | None" = None,
     max_age: timedelta = timedelta(days=14),
     cookie_name: str = "session_id",
     cookie_settings: CookieSettings = CookieSettings(),
     redis_key_prefix: str = "",
     session_arg_param_name: str = "session",
+    local_cache: LocalSessionCache | None = None,
+    expiry_sweep_interval: timedelta = timedelta(seconds=10),
+    *,
+    aioredis: "Redis | None" = None,
 ) -> AsyncRedisSessionStore:
     """
     Configure an instance of async sessions for an app.
@@ -102,6 +283,8 @@ def configure_async_sessions(
     (defaults to `session`) and type `AsyncSession`. AsyncSessions are mappings of
     strings to strings, and can be used to store data using the
     `AsyncSession.update_session()` and `AsyncSession.clear_session()` coroutines.
+    Handlers may instead declare the parameter as a `LazyAsyncSession`, loading the
+    session from Redis only when awaiting `LazyAsyncSession.load()`.
 
     If the cookie is missing or the session data has expired, a new empty session will
     be transparently created.
@@ -115,6 +298,8 @@ def configure_async_sessions(
     An `AsyncRedisSessionStore` is produced at configuration time and can be used to
     clean up namespaces even outside the context of a request.
 
+    :param redis: A _redis-py_ asyncio client, for a single Redis node. Redis
+        Cluster is not supported.
     :param max_age: The maximum age of a session. When this expires, the session is
         cleaned up from Redis.
     :param cookie_name: The name of the cookie to use for the session id.
@@ -122,25 +307,52 @@ def configure_async_sessions(
     :param redis_key_prefix: The prefix to use for redis keys.
     :param session_arg_param_name: The name of the handler parameter that will be
         available for dependency injection.
+    :param local_cache: A cache of session payloads in this process, saving a
+        round trip to Redis when reading recently used sessions.
+    :param expiry_sweep_interval: How often expired sessions are removed from
+        their namespaces. The removals are batched into session reads.
+    :param aioredis: A deprecated alias of `redis`.
     """
+    if aioredis is not None:
+        warn(
+            "The `aioredis` parameter is deprecated, use `redis` instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        if redis is not None:
+            raise TypeError("Pass either `redis` or `aioredis`, not both.")
+        redis = aioredis
+    if redis is None:
+        raise TypeError("A `redis` client is required.")
     ttl = int(max_age.total_seconds())
+    update_script = redis.register_script(_UPDATE_SESSION)
+    expiry_sweep = _ExpirySweep(expiry_sweep_interval.total_seconds())
 
     async def session_factory(
         cookie: Annotated[str | None, Cookie(cookie_name)] = None,
     ) -> AsyncSession:
+        res = None
         if cookie is not None:
             namespace, id = cookie.split(":")
-            pipeline = aioredis.pipeline()
-            pipeline.get(f"{redis_key_prefix}{namespace}:s:{id}")
-            pipeline.zremrangebyscore(f"{redis_key_prefix}{namespace}:s", 0, time())
-            payload, _ = await pipeline.execute()
-            if payload is not None:
-                res = AsyncSession(loads(payload))
+            key = f"{redis_key_prefix}{namespace}:s:{id}"
+            if local_cache is not None:
+                local_cache.listen(redis)
+                cached = local_cache.get(key)
+            else:
+                cached = None
+            if cached is not None:
+                res = AsyncSession(cached)
                 res._namespace = namespace
             else:
-                res = None
-        else:
-            res = None
+                pipeline = redis.pipeline(transaction=False)
+                pipeline.get(key)
+                expiry_sweep.add(pipeline, f"{redis_key_prefix}{namespace}:s")
+                payload = (await pipeline.execute())[0]
+                if payload is not None:
+                    res = AsyncSession(loads(payload))
+                    res._namespace = namespace
+                    if local_cache is not None:
+                        local_cache.put(key, dict(res))
 
         if res is None:
             id = token_hex()
@@ -149,21 +361,37 @@ def configure_async_sessions(
 
         res._cookie_name = cookie_name
         res._cookie_settings = cookie_settings
-        res._aioredis = aioredis
+        res._redis = redis
+        res._update_script = update_script
         res._ttl = ttl
         res._id = id
         res._key_prefix = redis_key_prefix
+        res._local_cache = local_cache
         return res
 
+    def lazy_session_factory(
+        cookie: Annotated[str | None, Cookie(cookie_name)] = None,
+    ) -> LazyAsyncSession:
+        return LazyAsyncSession(cookie, session_factory)
+
     app.incant.register_hook(
         lambda p: p.name == session_arg_param_name and p.annotation is AsyncSession,
         session_factory,
     )
+    app.incant.register_hook(
+        lambda p: p.name == session_arg_param_name and p.annotation is LazyAsyncSession,
+        lazy_session_factory,
+    )
 
     app._openapi_security.append(
         OpenAPISecuritySpec(ApiKeySecurityScheme(cookie_name, "cookie"))
     )
 
     return AsyncRedisSessionStore(
-        aioredis, redis_key_prefix, cookie_name, cookie_settings
+        redis,
+        redis_key_prefix,
+        cookie_name,
+        cookie_settings,
+        redis.register_script(_REMOVE_SESSIONS),
+        local_cache,
     )
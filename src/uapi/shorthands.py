@@ -1,13 +1,23 @@
-from collections.abc import Callable
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
 from types import NoneType
-from typing import Any, Literal, Protocol, TypeAlias, TypeVar, get_origin
+from typing import (
+    Any,
+    Final,
+    Literal,
+    Protocol,
+    TypeAlias,
+    TypeVar,
+    get_args,
+    get_origin,
+)
 
 from attrs import AttrsInstance, has
 from cattrs import Converter
 from incant import is_subclass
-from orjson import dumps
+from orjson import OPT_APPEND_NEWLINE, dumps
 
-from .openapi import MediaType, Response, SchemaBuilder
+from ._streams import is_stream
+from .openapi import ArraySchema, MediaType, Response, SchemaBuilder
 from .status import BaseResponse, NoContent, Ok
 
 __all__ = [
@@ -16,11 +26,15 @@ __all__ = [
     "ResponseAdapter",
     "ResponseShorthand",
     "StrShorthand",
+    "StreamShorthand",
+    "make_attrs_stream_shorthand",
 ]
 
 T_co = TypeVar("T_co", covariant=True)
 ResponseAdapter: TypeAlias = Callable[[Any], BaseResponse]
 
+_iterator_origins: Final = (Iterator, AsyncIterator, Generator, AsyncGenerator)
+
 
 class ResponseShorthand(Protocol[T_co]):
     """The base protocol for response shorthands."""
@@ -135,6 +149,45 @@ class BytesShorthand(ResponseShorthand[bytes]):
         )
 
 
+class StreamShorthand(ResponseShorthand[AsyncIterator[bytes]]):
+    """Support for handlers returning iterators of `bytes`.
+
+    `Iterator[bytes]`, `AsyncIterator[bytes]` and the generator equivalents are
+    supported. The chunks are streamed to the client as they are produced.
+    The response code is set to 200 and the content type is set to
+    `application/octet-stream`.
+
+    To use a different status code or content type, return a
+    {class}`BaseResponse` containing the iterator instead
+    (for example, `Ok[AsyncIterator[bytes]]`).
+    """
+
+    @staticmethod
+    def response_adapter_factory(type: Any) -> ResponseAdapter:
+        return lambda value: Ok(
+            value, headers={"content-type": "application/octet-stream"}
+        )
+
+    @staticmethod
+    def is_union_member(value: Any) -> bool:
+        return is_stream(value)
+
+    @staticmethod
+    def make_openapi_response(_: Any, builder: SchemaBuilder) -> Response:
+        return Response(
+            "OK",
+            {
+                "application/octet-stream": MediaType(
+                    builder.PYTHON_PRIMITIVES_TO_OPENAPI[bytes]
+                )
+            },
+        )
+
+    @staticmethod
+    def can_handle(type: Any) -> bool | Literal["check_type"]:
+        return get_origin(type) in _iterator_origins and get_args(type)[:1] == (bytes,)
+
+
 def make_attrs_shorthand(
     converter: Converter,
 ) -> type[ResponseShorthand[AttrsInstance]]:
@@ -170,6 +223,95 @@ def make_attrs_shorthand(
     return AttrsShorthand
 
 
+def make_attrs_stream_shorthand(
+    converter: Converter, json_array: bool = False, chunk_size: int = 65536
+) -> type[ResponseShorthand[AsyncIterator[AttrsInstance]]]:
+    """Create a shorthand for handlers returning iterators of _attrs_ instances.
+
+    `Iterator[A]`, `AsyncIterator[A]` and the generator equivalents are
+    supported, where `A` is an _attrs_ class. Instances are unstructured and
+    serialized one by one, and streamed to the client, so the whole result
+    never has to be held in memory.
+
+    Serialized instances are batched into chunks of roughly `chunk_size` bytes
+    before being sent, to keep the per-chunk overhead down.
+
+    :param json_array: By default, instances are streamed as newline-delimited
+        JSON (`application/x-ndjson`). If true, they are streamed as a single
+        JSON array (`application/json`) instead.
+    """
+    content_type = "application/json" if json_array else "application/x-ndjson"
+    headers = {"content-type": content_type}
+    # For NDJSON, every item is followed by a newline.
+    # For JSON arrays, every item but the first is preceded by a comma.
+    option = 0 if json_array else OPT_APPEND_NEWLINE
+    start, sep, end = (b"[", b",", b"]") if json_array else (b"", b"", b"")
+
+    def serialize(value: Any, hook: Callable[[Any], Any]) -> Iterator[bytes]:
+        buf = bytearray(start)
+        first = True
+        for item in value:
+            if first:
+                first = False
+            else:
+                buf += sep
+            buf += dumps(hook(item), option=option)
+            if len(buf) >= chunk_size:
+                yield bytes(buf)
+                buf.clear()
+        buf += end
+        if buf:
+            yield bytes(buf)
+
+    async def serialize_async(
+        value: Any, hook: Callable[[Any], Any]
+    ) -> AsyncIterator[bytes]:
+        buf = bytearray(start)
+        first = True
+        async for item in value:
+            if first:
+                first = False
+            else:
+                buf += sep
+            buf += dumps(hook(item), option=option)
+            if len(buf) >= chunk_size:
+                yield bytes(buf)
+                buf.clear()
+        buf += end
+        if buf:
+            yield bytes(buf)
+
+    class AttrsStreamShorthand(ResponseShorthand[AsyncIterator[AttrsInstance]]):
+        """Support for handlers returning iterators of _attrs_ classes."""
+
+        @staticmethod
+        def response_adapter_factory(type: Any) -> ResponseAdapter:
+            hook = converter.get_unstructure_hook(get_args(type)[0])
+            if get_origin(type) in (AsyncIterator, AsyncGenerator):
+                return lambda value: Ok(serialize_async(value, hook), headers)
+            return lambda value: Ok(serialize(value, hook), headers)
+
+        @staticmethod
+        def is_union_member(value: Any) -> bool:
+            return is_stream(value)
+
+        @staticmethod
+        def make_openapi_response(type: Any, builder: SchemaBuilder) -> Response:
+            schema = builder.get_schema_for_type(get_args(type)[0])
+            if json_array:
+                if isinstance(schema, ArraySchema):  # pragma: no cover
+                    raise Exception("Nested arrays are unsupported")
+                schema = ArraySchema(schema)
+            return Response("OK", {content_type: MediaType(schema)})
+
+        @staticmethod
+        def can_handle(type: Any) -> bool | Literal["check_type"]:
+            args = get_args(type)
+            return get_origin(type) in _iterator_origins and bool(args) and has(args[0])
+
+    return AttrsStreamShorthand
+
+
 def get_shorthand_type(shorthand: type[ResponseShorthand]) -> Any:
     """Get the underlying shorthand type (ResponseShorthand[T] -> T)."""
     return shorthand.__orig_bases__[0].__args__[0]  # type: ignore
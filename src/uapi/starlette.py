@@ -1,8 +1,15 @@
 from asyncio import create_task, sleep
-from collections.abc import Callable, Coroutine, Generator, Sequence
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+    Sequence,
+)
 from contextlib import contextmanager, suppress
 from functools import partial
-from inspect import Parameter, Signature, signature
+from inspect import Parameter, Signature
 from typing import Any, ClassVar, Generic, TypeAlias, TypeVar
 
 from attrs import Factory, define
@@ -11,15 +18,23 @@ from incant import Hook, Incanter
 from starlette.applications import Starlette
 from starlette.requests import Request as FrameworkRequest
 from starlette.responses import Response as FrameworkResponse
+from starlette.responses import StreamingResponse
 from typing_extensions import override
 
 from . import ResponseException
+from ._codegen import AdapterSpec, generate_adapter
+from ._signatures import get_signature
+from ._streams import is_stream
 from .base import AsyncApp as BaseApp
-from .path import parse_curly_path_params
+from .codecs import Codec
+from .path import make_path_params_loader, parse_curly_path_params
+from .query import LazyQuery
 from .requests import (
     HeaderSpec,
     ReqBytes,
+    accepts_codecs,
     attrs_body_factory,
+    check_content_length,
     get_cookie_name,
     get_form_type,
     get_header_type,
@@ -27,8 +42,12 @@ from .requests import (
     is_form,
     is_header,
     is_req_body_attrs,
+    is_req_stream,
+    read_limited,
+    resolve_structure_hook,
 )
 from .responses import make_exception_adapter, make_response_adapter
+from .router import Router
 from .shorthands import ResponseShorthand, T_co
 from .status import BadRequest, BaseResponse, Headers, get_status_code
 from .types import Method, RouteName
@@ -42,7 +61,10 @@ C_contra = TypeVar("C_contra", contravariant=True)
 @define
 class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
     framework_incant: Incanter = Factory(
-        lambda self: _make_starlette_incanter(self.converter), takes_self=True
+        lambda self: _make_starlette_incanter(
+            self.converter, self.max_body_size, self.codecs
+        ),
+        takes_self=True,
     )
     _framework_req_cls: ClassVar[type] = FrameworkRequest
     _framework_resp_cls: ClassVar[type] = FrameworkResponse
@@ -63,33 +85,53 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
         self._shorthands = (*self._shorthands, shorthand)
         return self  # type: ignore
 
-    def to_framework_app(self) -> Starlette:
+    def to_framework_app(self, compiled_router: bool = False) -> Starlette:
+        """Build a Starlette app serving the registered routes.
+
+        :param compiled_router: Dispatch requests using a single catch-all
+            Starlette route and the _uapi_ prefix-tree router, instead of
+            Starlette's linear route scan. Starlette route names will not
+            be available in this mode.
+        """
         s = Starlette()
+        router: Router[Callable[[FrameworkRequest], Awaitable[FrameworkResponse]]] = (
+            Router()
+        )
         exc_adapter = make_exception_adapter(self.converter)
 
         for (method, path), (handler, name, _) in self._route_map.items():
+            mark = self._profile_route(method, path)
+            handler = self._wrap_handler(handler, name)
+            mark("wrap")
             ra = make_response_adapter(
-                signature(handler, eval_str=True).return_annotation,
+                get_signature(handler).return_annotation,
                 FrameworkResponse,
                 self.converter,
                 self._shorthands,
             )
+            mark("response_adapter")
             path_params = parse_curly_path_params(path)
             hooks = [Hook.for_name(p, None) for p in path_params]
 
             base_handler = self.incant.compose(handler, is_async=True)
             # Detect required content-types here, based on the registered
             # request loaders.
-            base_sig = signature(base_handler)
+            base_sig = get_signature(base_handler)
             req_ct: str | None = None
             for arg in base_sig.parameters.values():
                 if is_req_body_attrs(arg):
                     _, loader = get_req_body_attrs(arg)
-                    req_ct = loader.content_type
+                    req_ct = (
+                        None
+                        if accepts_codecs(loader, self.codecs)
+                        else loader.content_type
+                    )
 
+            mark("compose")
             prepared = self.framework_incant.compose(base_handler, hooks, is_async=True)
-            sig = signature(prepared)
+            sig = get_signature(prepared)
             path_types = {p: sig.parameters[p].annotation for p in path_params}
+            path_loader = make_path_params_loader(path_types, self.converter)
 
             adapted = self.framework_incant.adapt(
                 prepared,
@@ -98,16 +140,31 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                 lambda p: p.annotation is Method,
                 **{pp: (lambda p, _pp=pp: p.name == _pp) for pp in path_params},
             )
-
-            if ra is None:
+            mark("framework_compose")
+
+            if self.codegen:
+                adapted, source = generate_adapter(
+                    _adapter_spec,
+                    adapted,
+                    ra,
+                    _framework_return_adapter,
+                    exc_adapter,
+                    req_ct,
+                    name,
+                    method,
+                    path,
+                    path_types,
+                    self.converter,
+                )
+                self.generated_sources[(method, path)] = source
+            elif ra is None:
 
                 async def adapted(
                     request: FrameworkRequest,
                     _fra=_framework_return_adapter,
                     _ea=exc_adapter,
                     _handler=adapted,
-                    _path_params=path_params,
-                    _path_types=path_types,
+                    _pl=path_loader,
                     _req_ct=req_ct,
                     _rn=name,
                     _rm=method,
@@ -120,18 +177,11 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                             f"invalid content type (expected {_req_ct})", 415
                         )
                     try:
-                        path_args = {
-                            p: (
-                                self.converter.structure(
-                                    request.path_params[p], path_type
-                                )
-                                if (path_type := _path_types[p])
-                                not in (str, Signature.empty)
-                                else request.path_params[p]
-                            )
-                            for p in _path_params
-                        }
-                        return await _handler(request, _rn, _rm, **path_args)
+                        if _pl is None:
+                            return await _handler(request, _rn, _rm)
+                        return await _handler(
+                            request, _rn, _rm, **_pl(request.path_params)
+                        )
                     except ResponseException as exc:
                         return _fra(_ea(exc))
 
@@ -143,8 +193,7 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                     _fra=_framework_return_adapter,
                     _ea=exc_adapter,
                     _prepared=adapted,
-                    _path_params=path_params,
-                    _path_types=path_types,
+                    _pl=path_loader,
                     _req_ct=req_ct,
                     _rn=name,
                     _rm=method,
@@ -156,24 +205,30 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
                         return FrameworkResponse(
                             f"invalid content type (expected {_req_ct})", 415
                         )
-                    path_args = {
-                        p: (
-                            self.converter.structure(request.path_params[p], path_type)
-                            if (path_type := _path_types[p])
-                            not in (str, Signature.empty)
-                            else request.path_params[p]
-                        )
-                        for p in _path_params
-                    }
                     try:
+                        if _pl is None:
+                            return _fra(_ra(await _prepared(request, _rn, _rm)))
+                        path_args = _pl(request.path_params)
                         return _fra(
                             _ra(await _prepared(request, _rn, _rm, **path_args))
                         )
                     except ResponseException as exc:
                         return _fra(_ea(exc))
 
-            s.add_route(path, adapted, name=name, methods=[method])
+            if compiled_router:
+                router.add(method, path, adapted)
+            else:
+                s.add_route(path, adapted, name=name, methods=[method])
+            mark("adapter")
+
+        if compiled_router:
+            s.add_route(
+                "/{__uapi_path:path}",
+                _make_router_dispatcher(router),
+                methods=["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"],
+            )
 
+        self._run_build_hooks()
         return s
 
     async def run(
@@ -224,20 +279,34 @@ class StarletteApp(Generic[C_contra], BaseApp[C_contra | FrameworkResponse]):
         return (p, parse_curly_path_params(p))
 
 
+_adapter_spec = AdapterSpec(
+    is_async=True,
+    params="request",
+    handler_args="request, _rn, _rm",
+    content_type='request.headers.get("content-type")',
+    raw_path_params="request.path_params",
+    unsupported_media_type="_FrameworkResponse(_ct_msg, 415)",
+    namespace={"_FrameworkResponse": FrameworkResponse},
+)
+
 App: TypeAlias = StarletteApp[FrameworkResponse]
 
 
-def _make_starlette_incanter(converter: Converter) -> Incanter:
+def _make_starlette_incanter(
+    converter: Converter, max_body_size: int | None = None, codecs: Sequence[Codec] = ()
+) -> Incanter:
     """Create the framework incanter for Starlette."""
     res = Incanter()
 
     def query_factory(p: Parameter) -> Callable[[FrameworkRequest], Any]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query(_request: FrameworkRequest) -> Any:
-            return converter.structure(
+            return hook(
                 (
-                    _request.query_params[p.name]
+                    _get_query(_request).get(p.name)
                     if p.default is Signature.empty
-                    else _request.query_params.get(p.name, p.default)
+                    else _get_query(_request).get(p.name, p.default)
                 ),
                 p.annotation,
             )
@@ -251,9 +320,9 @@ def _make_starlette_incanter(converter: Converter) -> Incanter:
     def string_query_factory(p: Parameter) -> Callable[[FrameworkRequest], Any]:
         def read_query(_request: FrameworkRequest) -> Any:
             return (
-                _request.query_params[p.name]
+                _get_query(_request).get(p.name)
                 if p.default is Signature.empty
-                else _request.query_params.get(p.name, p.default)
+                else _get_query(_request).get(p.name, p.default)
             )
 
         return read_query
@@ -265,17 +334,14 @@ def _make_starlette_incanter(converter: Converter) -> Incanter:
     def nonstring_list_query_factory(
         p: Parameter,
     ) -> Callable[[FrameworkRequest], list]:
+        hook = resolve_structure_hook(converter, p.annotation)
+
         def read_query(_request: FrameworkRequest):
+            query = _get_query(_request)
             return (
-                converter.structure(_request.query_params.getlist(p.name), p.annotation)
-                if p.default is Signature.empty
-                else (
-                    converter.structure(
-                        _request.query_params.getlist(p.name), p.annotation
-                    )
-                    if p.name in _request.query_params
-                    else p.default
-                )
+                hook(query.getall(p.name), p.annotation)
+                if p.default is Signature.empty or p.name in query
+                else p.default
             )
 
         return read_query
@@ -289,14 +355,11 @@ def _make_starlette_incanter(converter: Converter) -> Incanter:
         p: Parameter,
     ) -> Callable[[FrameworkRequest], list[str]]:
         def read_query(_request: FrameworkRequest):
+            query = _get_query(_request)
             return (
-                _request.query_params.getlist(p.name)
-                if p.default is Signature.empty
-                else (
-                    _request.query_params.getlist(p.name)
-                    if p.name in _request.query_params
-                    else p.default
-                )
+                query.getall(p.name)
+                if p.default is Signature.empty or p.name in query
+                else p.default
             )
 
         return read_query
@@ -316,13 +379,28 @@ def _make_starlette_incanter(converter: Converter) -> Incanter:
         lambda p: _make_cookie_dependency(get_cookie_name(p.annotation, p.name), default=p.default),  # type: ignore
     )
 
-    async def request_bytes(_request: FrameworkRequest) -> bytes:
-        return await _request.body()
+    if max_body_size is None:
+
+        async def request_bytes(_request: FrameworkRequest) -> bytes:
+            return await _request.body()
+
+    else:
+        limit = max_body_size
+
+        async def request_bytes(_request: FrameworkRequest) -> bytes:
+            check_content_length(_request.headers.get("content-length"), limit)
+            return await read_limited(_request.stream(), limit)
 
     res.register_hook(lambda p: p.annotation is ReqBytes, request_bytes)
 
+    def request_stream(_request: FrameworkRequest) -> AsyncIterator[bytes]:
+        return _request.stream()
+
+    res.register_hook(is_req_stream, request_stream)
+
     res.register_hook_factory(
-        is_req_body_attrs, partial(attrs_body_factory, converter=converter)
+        is_req_body_attrs,
+        partial(attrs_body_factory, converter=converter, codecs=codecs),
     )
 
     res.register_hook_factory(
@@ -337,6 +415,38 @@ def _make_starlette_incanter(converter: Converter) -> Incanter:
     return res
 
 
+def _get_query(request: FrameworkRequest) -> LazyQuery:
+    """Get the lazy query of the request, cached in the ASGI scope."""
+    scope = request.scope
+    if (query := scope.get("uapi.query")) is None:
+        query = scope["uapi.query"] = LazyQuery(scope["query_string"].decode("latin1"))
+    return query
+
+
+def _make_router_dispatcher(
+    router: Router[Callable[[FrameworkRequest], Awaitable[FrameworkResponse]]],
+) -> Callable[[FrameworkRequest], Awaitable[FrameworkResponse]]:
+    async def dispatch(request: FrameworkRequest) -> FrameworkResponse:
+        # The catch-all route's parameter is the path without the `root_path`
+        # of any mounts.
+        match = router.match("/" + request.path_params["__uapi_path"])
+        if match is None:
+            return FrameworkResponse("Not Found", 404)
+        methods, path_params = match
+        method = request.scope["method"]
+        handler = methods.get(method)
+        if handler is None and method == "HEAD":
+            handler = methods.get("GET")
+        if handler is None:
+            return FrameworkResponse(
+                "Method Not Allowed", 405, {"allow": ", ".join(methods)}
+            )
+        request.scope["path_params"] = path_params
+        return await handler(request)
+
+    return dispatch
+
+
 def _make_header_dependency(
     type: type,
     headerspec: HeaderSpec,
@@ -415,6 +525,8 @@ def _make_form_dependency(
 
 
 def _framework_return_adapter(resp: BaseResponse) -> FrameworkResponse:
+    if is_stream(resp.ret):
+        return _streaming_return_adapter(resp)
     if resp.headers:
         headers, cookies = _extract_cookies(resp.headers)
         res = FrameworkResponse(
@@ -424,3 +536,13 @@ def _framework_return_adapter(resp: BaseResponse) -> FrameworkResponse:
             res.raw_headers.append((b"set-cookie", cookie.encode("latin1")))
         return res
     return FrameworkResponse(resp.ret or b"", get_status_code(resp.__class__))  # type: ignore
+
+
+def _streaming_return_adapter(resp: BaseResponse) -> StreamingResponse:
+    headers, cookies = _extract_cookies(resp.headers)
+    res = StreamingResponse(
+        resp.ret, get_status_code(resp.__class__), headers  # type: ignore
+    )
+    for cookie in cookies:
+        res.raw_headers.append((b"set-cookie", cookie.encode("latin1")))
+    return res
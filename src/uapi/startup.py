@@ -0,0 +1,128 @@
+"""Doing startup work ahead of time."""
+
+from gc import collect, freeze
+from inspect import Parameter
+from typing import TYPE_CHECKING, Any, Literal, get_args
+
+from attrs import frozen
+from cattrs._compat import is_union_type
+from incant import is_subclass
+
+from ._signatures import get_signature
+from .requests import (
+    ReqBytes,
+    ReqFile,
+    ReqStream,
+    get_cookie_name,
+    maybe_form_type,
+    maybe_header_type,
+    maybe_req_body_type,
+)
+from .status import BaseResponse
+from .types import Method, RouteName
+
+if TYPE_CHECKING:
+    from .base import _AppBase
+
+__all__ = ["HookFailure", "prepare_for_fork", "warm_up_hooks"]
+
+
+@frozen
+class HookFailure:
+    """A route type a converter can't handle."""
+
+    method: Method
+    path: str
+    type: Any
+    #: Whether the type is structured from requests or unstructured into
+    #: responses.
+    kind: Literal["structure", "unstructure"]
+    exception: Exception
+
+
+def warm_up_hooks(app: "_AppBase") -> list[HookFailure]:
+    """Generate the converter hooks for the types used by the app routes.
+
+    _cattrs_ generates structuring and unstructuring functions lazily, so
+    otherwise the first request to every route pays for code generation.
+
+    Request body, form, header, path and query parameter types are prepared
+    for structuring, and response body types for unstructuring, using the
+    app converter and the converters of its codecs.
+
+    :return: The types the converters can't handle. Requests using them
+        would fail.
+    """
+    converters = [app.converter, *(c.converter for c in app.codecs)]
+    failures = []
+    for (method, path), (handler, _, _) in list(app._route_map.items()):
+        sig = get_signature(app.incant.compose(handler))
+        for name, param in sig.parameters.items():
+            if (t := _structured_type(app, name, param)) is None:
+                continue
+            for converter in converters:
+                try:
+                    converter.get_structure_hook(t)
+                except Exception as exc:
+                    failures.append(HookFailure(method, path, t, "structure", exc))
+                    break
+        for t in _response_types(get_signature(handler).return_annotation):
+            for converter in converters:
+                try:
+                    converter.get_unstructure_hook(t)
+                except Exception as exc:
+                    failures.append(HookFailure(method, path, t, "unstructure", exc))
+                    break
+    return failures
+
+
+def prepare_for_fork(app: "_AppBase") -> list[HookFailure]:
+    """Finish the startup work of an app, before forking worker processes.
+
+    Call this in the parent process once the framework app is built, when
+    running on a pre-forking server like _gunicorn_ with `preload_app`.
+    Converter hooks are generated, lazily served OpenAPI specs are created,
+    and the objects created so far are moved out of garbage collection so
+    the workers keep sharing their memory pages instead of copying them.
+
+    :return: The failures from warming up the converter hooks.
+    """
+    failures = warm_up_hooks(app)
+    for warm_up in app._warm_ups:
+        warm_up()
+    collect()
+    freeze()
+    return failures
+
+
+def _structured_type(app: "_AppBase", name: str, param: Parameter) -> Any:
+    """The type a parameter is structured into, if any."""
+    t = param.annotation
+    if (
+        t is Parameter.empty
+        or t in (RouteName, Method, ReqBytes, ReqFile)
+        or t == ReqStream
+        or is_subclass(t, app._framework_req_cls)
+        or get_cookie_name(t, name) is not None
+    ):
+        return None
+    if (body := maybe_req_body_type(param)) is not None:
+        return body[0]
+    if (form := maybe_form_type(param)) is not None:
+        return form
+    if (header := maybe_header_type(param)) is not None:
+        return header[0]
+    return t
+
+
+def _response_types(t: Any) -> list[Any]:
+    """The types of response bodies a return annotation can produce."""
+    res = []
+    for member in get_args(t) if is_union_type(t) else [t]:
+        if is_subclass(getattr(member, "__origin__", None), BaseResponse):
+            member = get_args(member)[0]
+        if member not in (None, type(None), str, bytes) and not is_subclass(
+            member, BaseResponse
+        ):
+            res.append(member)
+    return res
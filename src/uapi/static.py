@@ -0,0 +1,198 @@
+"""Constant responses, served precompressed and with validators."""
+
+from asyncio import to_thread
+from collections.abc import Callable, Hashable, Sequence
+from hashlib import blake2b
+from threading import Lock
+from typing import Annotated, Any
+
+from .compression import (
+    ENCODING_CACHE_SIZE,
+    Encoding,
+    choose_encoding,
+    make_brotli_encoding,
+    make_deflate_encoding,
+    make_gzip_encoding,
+    make_zstd_encoding,
+)
+from .requests import HeaderSpec
+from .status import NotModified, Ok, ResponseException
+
+__all__ = ["make_lazy_static_handler", "make_static_encodings", "make_static_handler"]
+
+
+def make_static_encodings(max_levels: bool = False) -> tuple[Encoding, ...]:
+    """The available encodings, at levels suitable for constant bodies.
+
+    Constant bodies are compressed only once, so the levels are higher than
+    the defaults for dynamic responses, while still keeping startup fast for
+    large bodies like OpenAPI specs.
+
+    :param max_levels: Use the highest levels instead. These save a few more
+        bytes at a much larger compression time, up to seconds for bodies of
+        a few megabytes.
+    """
+    encodings = (
+        (
+            make_zstd_encoding(19),
+            make_brotli_encoding(11),
+            make_gzip_encoding(9),
+            make_deflate_encoding(9),
+        )
+        if max_levels
+        else (
+            make_zstd_encoding(11),
+            make_brotli_encoding(6),
+            make_gzip_encoding(6),
+            make_deflate_encoding(6),
+        )
+    )
+    return tuple(e for e in encodings if e is not None)
+
+
+def make_static_handler(
+    body: bytes | str, content_type: str, encodings: Sequence[Encoding] | None = None
+) -> Callable[..., Ok[bytes]]:
+    """Create a handler serving a constant body.
+
+    The body is compressed ahead of time using each of the `encodings`, and
+    the variant best matching the `Accept-Encoding` header is served.
+    Responses carry a strong `ETag`, and requests with a matching
+    `If-None-Match` header get a `304 Not Modified` response instead.
+
+    :param encodings: The encodings to precompress the body with. Defaults to
+        all available encodings, from `make_static_encodings`. Variants that
+        aren't smaller than the body are dropped.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    if encodings is None:
+        encodings = make_static_encodings()
+    digest = blake2b(body, digest_size=16).hexdigest()
+
+    identity = (body, {"content-type": content_type, "etag": f'"{digest}"'})
+    variants = {}
+    for encoding in encodings:
+        compressed = encoding.compress(body)
+        if len(compressed) < len(body):
+            variants[encoding.name] = (
+                compressed,
+                {
+                    "content-type": content_type,
+                    "content-encoding": encoding.name,
+                    # Each representation needs its own strong validator.
+                    "etag": f'"{digest}-{encoding.name}"',
+                },
+            )
+    available = [e for e in encodings if e.name in variants]
+    if available:
+        identity[1]["vary"] = "Accept-Encoding"
+        for _, headers in variants.values():
+            headers["vary"] = "Accept-Encoding"
+    chosen: dict[str, tuple[bytes, dict[str, str]]] = {}
+
+    def static_handler(
+        if_none_match: Annotated[str, HeaderSpec("if-none-match")] = "",
+        accept_encoding: Annotated[str, HeaderSpec("accept-encoding")] = "",
+    ) -> Ok[bytes]:
+        if not accept_encoding or not available:
+            variant = identity
+        elif (cached := chosen.get(accept_encoding)) is not None:
+            variant = cached
+        else:
+            encoding = choose_encoding(accept_encoding, available)
+            variant = identity if encoding is None else variants[encoding.name]
+            if len(chosen) < ENCODING_CACHE_SIZE:
+                chosen[accept_encoding] = variant
+        content, headers = variant
+        if if_none_match and _matches(if_none_match, headers["etag"]):
+            raise ResponseException(
+                NotModified(
+                    headers={k: v for k, v in headers.items() if k in ("etag", "vary")}
+                )
+            )
+        return Ok(content, headers.copy())
+
+    return static_handler
+
+
+def make_lazy_static_handler(
+    make_body: Callable[[], bytes | str],
+    content_type: str,
+    encodings: Sequence[Encoding] | None = None,
+    get_version: Callable[[], Hashable] | None = None,
+    offload: bool = False,
+) -> tuple[Callable[..., Any], Callable[[], None]]:
+    """Create a handler serving a constant body, produced on first use.
+
+    Otherwise like `make_static_handler`. Producing the body is thread-safe,
+    and happens at most once per version.
+
+    :param get_version: If provided, called on every request; the body is
+        produced again whenever the result changes.
+    :param offload: Whether to produce the body in a worker thread, keeping
+        the event loop of async apps responsive. The handler is a coroutine
+        function if so.
+
+    :return: The handler, and a function producing the body ahead of time,
+        suitable for running in a background thread.
+    """
+    lock = Lock()
+    handler: Callable[..., Ok[bytes]] | None = None
+    # The version the current handler was prepared for.
+    version: Hashable = None
+
+    def prepare() -> Callable[..., Ok[bytes]]:
+        nonlocal handler, version
+        with lock:
+            current = get_version() if get_version is not None else None
+            if handler is None or current != version:
+                handler = make_static_handler(make_body(), content_type, encodings)
+                version = current
+        return handler
+
+    def warm_up() -> None:
+        prepare()
+
+    if offload:
+
+        async def offloaded_static_handler(
+            if_none_match: Annotated[str, HeaderSpec("if-none-match")] = "",
+            accept_encoding: Annotated[str, HeaderSpec("accept-encoding")] = "",
+        ) -> Ok[bytes]:
+            if handler is None or (
+                get_version is not None and get_version() != version
+            ):
+                return (await to_thread(prepare))(if_none_match, accept_encoding)
+            return handler(if_none_match, accept_encoding)
+
+        return offloaded_static_handler, warm_up
+
+    if get_version is None:
+
+        def lazy_static_handler(
+            if_none_match: Annotated[str, HeaderSpec("if-none-match")] = "",
+            accept_encoding: Annotated[str, HeaderSpec("accept-encoding")] = "",
+        ) -> Ok[bytes]:
+            return (handler or prepare())(if_none_match, accept_encoding)
+
+    else:
+        _get_version = get_version
+
+        def lazy_static_handler(
+            if_none_match: Annotated[str, HeaderSpec("if-none-match")] = "",
+            accept_encoding: Annotated[str, HeaderSpec("accept-encoding")] = "",
+        ) -> Ok[bytes]:
+            if handler is None or _get_version() != version:
+                return prepare()(if_none_match, accept_encoding)
+            return handler(if_none_match, accept_encoding)
+
+    return lazy_static_handler, warm_up
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """`If-None-Match` uses the weak comparison."""
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag
+        for tag in (t.strip() for t in if_none_match.split(","))
+    )
@@ -14,9 +14,12 @@ __all__ = [
     "InternalServerError",
     "NoContent",
     "NotFound",
+    "NotModified",
     "Ok",
+    "PayloadTooLarge",
     "R",
     "SeeOther",
+    "UnsupportedMediaType",
 ]
 
 R = TypeVar("R")
@@ -77,6 +80,15 @@ class SeeOther(BaseResponse[Literal[303], R]):
     pass
 
 
+@frozen
+class NotModified(BaseResponse[Literal[304], None]):
+    ret: None = None
+
+    @classmethod
+    def status_code(cls) -> int:
+        return 304
+
+
 @define
 class BadRequest(BaseResponse[Literal[400], R]):
     pass
@@ -92,6 +104,16 @@ class NotFound(BaseResponse[Literal[404], R]):
     pass
 
 
+@define
+class PayloadTooLarge(BaseResponse[Literal[413], R]):
+    pass
+
+
+@define
+class UnsupportedMediaType(BaseResponse[Literal[415], R]):
+    pass
+
+
 @define
 class InternalServerError(BaseResponse[Literal[500], R]):
     pass
@@ -7,6 +7,8 @@ import pytest
 
 from .aiohttp import make_app as make_aiohttp_app
 from .aiohttp import run_on_aiohttp
+from .asgi import make_app as make_asgi_app
+from .asgi import run_on_asgi
 from .django import run_on_django
 from .django_uapi_app.views import app
 from .flask import make_app as make_flask_app
@@ -27,7 +29,7 @@ def event_loop():
 
 
 @pytest.fixture(
-    params=["aiohttp", "flask", "quart", "starlette", "django"], scope="session"
+    params=["aiohttp", "flask", "quart", "starlette", "django", "asgi"], scope="session"
 )
 async def server(request, unused_tcp_port_factory: Callable[..., int]):
     unused_tcp_port = unused_tcp_port_factory()
@@ -61,12 +63,18 @@ async def server(request, unused_tcp_port_factory: Callable[..., int]):
         t.cancel()
         with suppress(CancelledError):
             await t
+    elif request.param == "asgi":
+        t = create_task(run_on_asgi(make_asgi_app(), unused_tcp_port))
+        yield unused_tcp_port
+        t.cancel()
+        with suppress(CancelledError):
+            await t
     else:
         raise Exception("Unknown server framework")
 
 
 @pytest.fixture(
-    params=["aiohttp", "flask", "quart", "starlette", "django"], scope="session"
+    params=["aiohttp", "flask", "quart", "starlette", "django", "asgi"], scope="session"
 )
 async def server_with_openapi(
     request, unused_tcp_port_factory: Callable[[], int]
@@ -110,5 +118,13 @@ async def server_with_openapi(
         t.cancel()
         with suppress(CancelledError):
             await t
+    elif request.param == "asgi":
+        asgi_app = make_asgi_app()
+        asgi_app.serve_openapi()
+        t = create_task(run_on_asgi(asgi_app, unused_tcp_port))
+        yield unused_tcp_port
+        t.cancel()
+        with suppress(CancelledError):
+            await t
     else:
         raise Exception("Unknown server framework")
@@ -3,8 +3,8 @@ from collections.abc import Callable
 from datetime import timedelta
 
 import pytest
-from aioredis import create_redis_pool
 from httpx import AsyncClient
+from redis.asyncio import Redis
 
 from tests.starlette import run_on_starlette as run_on_framework
 from uapi.cookies import CookieSettings
@@ -17,7 +17,7 @@ from uapi.status import Created, NoContent
 async def configure_login_app(app: FrameworkApp) -> None:
     rss = configure_async_sessions(
         app,
-        await create_redis_pool("redis://", encoding="utf8"),
+        Redis(),
         cookie_settings=CookieSettings(secure=False),
         max_age=timedelta(seconds=1),
     )
@@ -3,6 +3,7 @@ import pytest
 from uapi.base import App
 
 from ..aiohttp import make_app as aiohttp_make_app
+from ..asgi import make_app as asgi_make_app
 from ..django_uapi_app.views import app as django_app
 from ..flask import make_app as flask_make_app
 from ..quart import make_app as quart_make_app
@@ -20,8 +21,9 @@ def django_make_app() -> App:
         quart_make_app,
         starlette_make_app,
         django_make_app,
+        asgi_make_app,
     ],
-    ids=["aiohttp", "flask", "quart", "starlette", "django"],
+    ids=["aiohttp", "flask", "quart", "starlette", "django", "asgi"],
 )
 def app(request) -> App:
     return request.param()
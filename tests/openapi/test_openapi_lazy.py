@@ -0,0 +1,271 @@
+"""Tests for lazily created and refreshed OpenAPI specs."""
+
+from asyncio import create_task, run, sleep
+from collections.abc import Callable
+from inspect import iscoroutine
+from pathlib import Path
+from threading import enumerate as threads
+from time import sleep as block
+
+import pytest
+
+from uapi import _openapi
+from uapi._openapi import IncrementalSpecBuilder
+from uapi.base import App as BaseApp
+from uapi.base import _AppBase
+from uapi.flask import FlaskApp
+from uapi.openapi import OpenAPI, Parameter, SchemaBuilder, converter
+from uapi.starlette import App
+
+
+@pytest.fixture
+def builds(monkeypatch: pytest.MonkeyPatch) -> list[None]:
+    """Count spec builds."""
+    res: list[None] = []
+    build = IncrementalSpecBuilder.build
+
+    def counting_build(*args, **kwargs) -> OpenAPI:
+        res.append(None)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(IncrementalSpecBuilder, "build", counting_build)
+    return res
+
+
+def get_spec(app: _AppBase, path: str = "/openapi.json") -> OpenAPI:
+    handler = app._route_map[("GET", path)][0]
+    res = handler()
+    if iscoroutine(res):
+        # Async apps create specs in a worker thread.
+        res = run(res)
+    return converter.loads(res.ret, OpenAPI)
+
+
+def test_eager_spec(builds: list[None]) -> None:
+    """Eager specs are created once, and served as created."""
+    app = App()
+
+    @app.get("/")
+    async def index() -> None:
+        return
+
+    app.serve_openapi()
+    assert builds == [None]
+
+    assert set(get_spec(app).paths) == {"/"}
+    get_spec(app)
+    assert builds == [None]
+
+
+def test_lazy_spec(builds: list[None]) -> None:
+    """Lazy specs are created on first request."""
+    app = App()
+
+    @app.get("/before")
+    async def before() -> None:
+        return
+
+    app.serve_openapi(lazy=True)
+
+    @app.get("/after")
+    async def after() -> None:
+        return
+
+    assert builds == []
+
+    spec = get_spec(app)
+    get_spec(app)
+
+    assert builds == [None]
+    assert set(spec.paths) == {"/before", "/after"}
+
+
+def test_lazy_spec_warm_up(builds: list[None]) -> None:
+    """Lazy specs are created in the background once the app is built."""
+    app = App()
+
+    @app.get("/")
+    async def index() -> None:
+        return
+
+    app.serve_openapi(lazy=True)
+    app.to_framework_app()
+
+    for thread in threads():
+        if thread.name == "uapi-openapi":
+            thread.join()
+
+    assert builds == [None]
+    assert set(get_spec(app).paths) == {"/"}
+    assert builds == [None]
+
+
+async def test_lazy_spec_offloaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Async apps create lazy specs without blocking the event loop."""
+    build = IncrementalSpecBuilder.build
+
+    def slow_build(*args, **kwargs) -> OpenAPI:
+        block(0.2)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(IncrementalSpecBuilder, "build", slow_build)
+    app = App()
+
+    @app.get("/")
+    async def index() -> None:
+        return
+
+    app.serve_openapi(lazy=True)
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await sleep(0.01)
+
+    ticker = create_task(tick())
+    resp = await app._route_map[("GET", "/openapi.json")][0]()
+    ticker.cancel()
+
+    assert set(converter.loads(resp.ret, OpenAPI).paths) == {"/"}
+    assert ticks > 5
+
+
+def test_spec_refresh(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Served specs are refreshed, processing only new and changed routes."""
+    app = App()
+    composed: list[str] = []
+    gather = _openapi.gather_endpoint_components
+
+    def counting_gather(handler: Callable, builder: SchemaBuilder) -> None:
+        composed.append(handler.__name__)
+        gather(handler, builder)
+
+    monkeypatch.setattr(_openapi, "gather_endpoint_components", counting_gather)
+
+    @app.get("/")
+    async def index() -> None:
+        return
+
+    app.serve_openapi()
+    assert composed == ["index"]
+
+    sub_app: BaseApp = BaseApp()
+
+    @sub_app.get("/")
+    def plugin_index() -> None:
+        return
+
+    app.route_app(sub_app, "/plugin")
+
+    @app.get("/", tags=["changed"])
+    async def index2() -> None:
+        return
+
+    spec = get_spec(app)
+    assert composed == ["index", "index2", "plugin_index"]
+    assert set(spec.paths) == {"/", "/plugin/"}
+    assert spec.paths["/"].get is not None
+    assert spec.paths["/"].get.tags == ["changed"]
+
+    get_spec(app)
+    assert composed == ["index", "index2", "plugin_index"]
+
+
+def test_spec_path_params() -> None:
+    """Served specs use the path parameter syntax of the framework."""
+    app: FlaskApp = FlaskApp()
+
+    @app.get("/path/<int:path_id>")
+    def path(path_id: int) -> None:
+        return
+
+    app.serve_openapi()
+
+    op = get_spec(app).paths["/path/{path_id}"].get
+    assert op is not None
+    assert [(p.name, p.kind) for p in op.parameters] == [
+        ("path_id", Parameter.Kind.PATH)
+    ]
+
+
+def test_spec_snapshot(builds: list[None], tmp_path: Path) -> None:
+    """Specs are reused from snapshots while their sources are unchanged."""
+    snapshot = tmp_path / "openapi.snapshot"
+    source = tmp_path / "models.py"
+    source.write_text("a = 1")
+
+    def make_app() -> App:
+        app = App()
+
+        @app.get("/")
+        async def index() -> None:
+            return
+
+        app.serve_openapi(spec_snapshot=snapshot, spec_snapshot_sources=[source])
+        return app
+
+    spec = get_spec(make_app())
+    assert builds == [None]
+    assert snapshot.exists()
+
+    assert get_spec(make_app()) == spec
+    assert builds == [None]
+
+    source.write_text("a = 2")
+    assert get_spec(make_app()) == spec
+    assert builds == [None, None]
+
+    # Routes added later are covered too.
+    app = make_app()
+
+    @app.get("/new")
+    async def new() -> None:
+        return
+
+    assert set(get_spec(app).paths) == {"/", "/new"}
+    assert builds == [None, None, None]
+
+
+def test_spec_snapshot_lambdas(builds: list[None], tmp_path: Path) -> None:
+    """Different lambda transformers don't share snapshots."""
+    snapshot = tmp_path / "openapi.snapshot"
+
+    def make_app(summary_transformer: Callable[[Callable, str], str]) -> App:
+        app = App()
+
+        @app.get("/")
+        async def index() -> None:
+            return
+
+        app.serve_openapi(
+            spec_snapshot=snapshot, summary_transformer=summary_transformer
+        )
+        return app
+
+    spec = get_spec(make_app(lambda _, name: name))
+    assert spec.paths["/"].get is not None
+    assert spec.paths["/"].get.summary == "index"
+
+    spec = get_spec(make_app(lambda _, name: name.upper()))
+    assert spec.paths["/"].get is not None
+    assert spec.paths["/"].get.summary == "INDEX"
+    assert builds == [None, None]
+
+    # Closures over different values and different defaults differ too.
+    def prefixed(prefix: str) -> Callable[[Callable, str], str]:
+        return lambda _, name: prefix + name
+
+    def defaulted(prefix: str) -> Callable[[Callable, str], str]:
+        def transformer(_: Callable, name: str, prefix: str = prefix) -> str:
+            return prefix + name
+
+        return transformer
+
+    for make_transformer in (prefixed, defaulted):
+        for prefix in ("a", "b"):
+            spec = get_spec(make_app(make_transformer(prefix)))
+            assert spec.paths["/"].get is not None
+            assert spec.paths["/"].get.summary == f"{prefix}index"
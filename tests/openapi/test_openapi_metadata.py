@@ -6,7 +6,7 @@ from uapi.aiohttp import App
 from uapi.openapi import OpenAPI, converter
 
 
-def test_transformers() -> None:
+async def test_transformers() -> None:
     """Transformers are correctly applied."""
     app = App()
 
@@ -48,7 +48,7 @@ def test_transformers() -> None:
 
     handler = app._route_map[("GET", "/openapi.json")]
 
-    transformed_spec = converter.loads(handler[0]().ret, OpenAPI)
+    transformed_spec = converter.loads((await handler[0]()).ret, OpenAPI)
 
     assert transformed_spec.paths["/"].get
     assert transformed_spec.paths["/"].get.summary == "MY_HANDLER"
@@ -4,7 +4,9 @@ from collections.abc import Callable
 import pytest
 
 from aiohttp import ClientSession
+from uapi.base import App as BaseApp
 from uapi.flask import App
+from uapi.openapi import OpenAPI, converter
 
 from ..flask import run_on_flask
 
@@ -53,3 +55,29 @@ async def test_redoc(openapi_renderer_app: int) -> None:
 
         assert resp.status == 200
         assert "spec-url='/openapi_test.json'" in (await resp.text())
+
+
+def test_uis_not_in_spec() -> None:
+    """The spec and UI routes, and their caching headers, aren't documented."""
+    app = App()
+    app.serve_swaggerui()
+
+    @app.get("/")
+    def index() -> None:
+        return
+
+    sub_app: BaseApp = BaseApp()
+    sub_app.serve_elements()
+    app.route_app(sub_app, "/sub")
+
+    app.serve_openapi()
+    app.serve_redoc()
+
+    for spec in (
+        converter.loads(app._route_map[("GET", "/openapi.json")][0]().ret, OpenAPI),
+        app.make_openapi_spec(),
+    ):
+        assert set(spec.paths) == {"/"}
+        for path_item in spec.paths.values():
+            assert path_item.get is not None
+            assert path_item.get.parameters == []
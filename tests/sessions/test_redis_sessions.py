@@ -1,26 +1,36 @@
 import contextlib
-from asyncio import CancelledError, create_task, sleep
+from asyncio import CancelledError, TaskGroup, create_task, sleep
 from collections.abc import Callable
 from datetime import timedelta
 
 import pytest
-from aioredis import create_redis_pool
 from httpx import AsyncClient
+from redis.asyncio import Redis
 
 from tests.aiohttp import run_on_aiohttp
 from uapi.aiohttp import App as AiohttpApp
 from uapi.cookies import CookieSettings
 from uapi.openapi import ApiKeySecurityScheme
-from uapi.sessions.redis import AsyncSession, configure_async_sessions
+from uapi.sessions.redis import (
+    AsyncSession,
+    LazyAsyncSession,
+    LocalSessionCache,
+    configure_async_sessions,
+)
 from uapi.status import Created, NoContent
 
 
-async def configure_redis_session_app(app: AiohttpApp) -> None:
+async def configure_redis_session_app(
+    app: AiohttpApp,
+    max_age: timedelta = timedelta(seconds=1),
+    local_cache: LocalSessionCache | None = None,
+) -> None:
     configure_async_sessions(
         app,
-        await create_redis_pool("redis://"),
+        Redis(),
         cookie_settings=CookieSettings(secure=False),
-        max_age=timedelta(seconds=1),
+        max_age=max_age,
+        local_cache=local_cache,
     )
 
     @app.get("/")
@@ -38,6 +48,12 @@ async def configure_redis_session_app(app: AiohttpApp) -> None:
     async def logout(session: AsyncSession) -> NoContent:
         return NoContent(await session.clear_session())
 
+    @app.get("/lazy")
+    async def lazy(session: LazyAsyncSession, load: bool = False) -> str:
+        if not load:
+            return "not loaded"
+        return (await session.load()).get("user_id", "naughty!")
+
 
 @pytest.fixture(scope="session")
 async def redis_session_app(unused_tcp_port_factory: Callable[..., int]):
@@ -69,6 +85,11 @@ async def test_login_logout(redis_session_app: int):
         resp = await client.get(f"http://localhost:{redis_session_app}/")
         assert resp.text == "MyCoolUsername"
 
+        resp = await client.get(
+            f"http://localhost:{redis_session_app}/lazy", params={"load": "true"}
+        )
+        assert resp.text == "MyCoolUsername"
+
         async with AsyncClient() as new_client:
             resp = await new_client.get(f"http://localhost:{redis_session_app}/")
             assert resp.text == "naughty!"
@@ -124,3 +145,100 @@ async def test_openapi_security() -> None:
 
     assert openapi.paths["/logout"].post
     assert openapi.paths["/logout"].post.security == [{"cookie/session_id": []}]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_local_cache_invalidation(
+    unused_tcp_port_factory: Callable[..., int],
+) -> None:
+    """Sessions cached by one process are invalidated by writes in another."""
+    ports = [unused_tcp_port_factory(), unused_tcp_port_factory()]
+    async with TaskGroup() as tg:
+        tasks = []
+        for port in ports:
+            app = AiohttpApp()
+            await configure_redis_session_app(
+                app, timedelta(minutes=1), LocalSessionCache(max_staleness=60)
+            )
+            tasks.append(tg.create_task(run_on_aiohttp(app, port)))
+        writer, reader = (f"http://localhost:{port}" for port in ports)
+
+        async with AsyncClient() as client:
+            resp = await client.post(
+                f"{writer}/login", params={"username": "MyCoolUsername"}
+            )
+            assert resp.status_code == 201
+
+            # Cache the session in the reader.
+            resp = await client.get(f"{reader}/")
+            assert resp.text == "MyCoolUsername"
+            resp = await client.get(f"{reader}/")
+            assert resp.text == "MyCoolUsername"
+
+            cookie = client.cookies["session_id"]
+            resp = await client.post(f"{writer}/logout")
+            assert resp.status_code == 204
+            await sleep(0.1)
+
+        async with AsyncClient(cookies={"session_id": cookie}) as client:
+            resp = await client.get(f"{reader}/")
+            assert resp.text == "naughty!"
+
+        for t in tasks:
+            t.cancel()
+
+
+def test_local_cache() -> None:
+    """The local cache evicts the least recently used and stale sessions."""
+    cache = LocalSessionCache(max_size=2)
+    cache.put("a", {"a": "1"})
+    cache.put("b", {"b": "1"})
+    assert cache.get("a") == {"a": "1"}
+
+    cache.put("c", {"c": "1"})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"a": "1"}
+
+    cache.invalidate_prefix("a")
+    assert cache.get("a") is None
+    assert cache.get("c") == {"c": "1"}
+
+    stale = LocalSessionCache(max_staleness=-1)
+    stale.put("a", {"a": "1"})
+    assert stale.get("a") is None
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_lazy_session_unused(redis_session_app: int) -> None:
+    """Handlers not loading lazy sessions don't need Redis."""
+    async with AsyncClient(cookies={"session_id": "ns:id"}) as client:
+        resp = await client.get(f"http://localhost:{redis_session_app}/lazy")
+        assert resp.status_code == 200
+        assert resp.text == "not loaded"
+
+
+async def test_lazy_session() -> None:
+    """Lazy sessions are loaded once, on first use."""
+    loaded = []
+
+    async def load(cookie: str | None) -> AsyncSession:
+        loaded.append(cookie)
+        return AsyncSession({"user_id": "1"})
+
+    session = LazyAsyncSession("ns:id", load)
+    assert loaded == []
+
+    assert await session.load() == {"user_id": "1"}
+    assert await session.load() is await session.load()
+    assert loaded == ["ns:id"]
+
+
+async def test_aioredis_alias() -> None:
+    """The `aioredis` parameter is a deprecated alias of `redis`."""
+    redis = Redis()
+    with pytest.warns(DeprecationWarning):
+        store = configure_async_sessions(AiohttpApp(), aioredis=redis)
+    assert store._redis is redis
+
+    with pytest.raises(TypeError), pytest.warns(DeprecationWarning):
+        configure_async_sessions(AiohttpApp(), redis, aioredis=redis)
@@ -0,0 +1,219 @@
+"""Tests for body codecs."""
+
+from asyncio import create_task, sleep
+from collections.abc import Callable, Coroutine
+
+import cbor2
+import msgpack
+import pytest
+from attrs import define
+from httpx import AsyncClient, ConnectError
+
+from uapi import ReqBody, codecs
+from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
+from uapi.base import App
+from uapi.codecs import (
+    make_cbor_codec,
+    make_json_codec,
+    make_msgpack_codec,
+    make_negotiating_handler,
+    negotiate,
+)
+from uapi.django import DjangoApp
+from uapi.flask import FlaskApp
+from uapi.quart import QuartApp
+from uapi.starlette import StarletteApp
+from uapi.status import Created, Ok
+
+from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
+from .django import run_on_django
+from .flask import run_on_flask
+from .quart import run_on_quart
+from .starlette import run_on_starlette
+
+
+@define
+class Model:
+    a: int
+    b: str
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [
+        (AiohttpApp, run_on_aiohttp),
+        (AsgiApp, run_on_asgi),
+        (DjangoApp, run_on_django),
+        (FlaskApp, run_on_flask),
+        (QuartApp, run_on_quart),
+        (StarletteApp, run_on_starlette),
+    ],
+    ids=["aiohttp", "asgi", "django", "flask", "quart", "starlette"],
+)
+async def test_codecs(
+    unused_tcp_port: int, app_type: type[App], run: Callable[[App, int], Coroutine]
+) -> None:
+    """Bodies are loaded and emitted using the negotiated codec."""
+    app = app_type(codecs=[make_msgpack_codec(), make_cbor_codec()])
+
+    @app.post("/model")
+    def echo(m: ReqBody[Model]) -> Model:
+        return Model(m.a + 1, m.b)
+
+    @app.post("/model-created")
+    def echo_created(m: ReqBody[Model]) -> Created[Model]:
+        return Created(m, {"test": "1"})
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+    payload = {"a": 1, "b": "b"}
+
+    try:
+        async with AsyncClient() as client:
+            for _ in range(50):
+                try:
+                    resp = await client.post(f"{url}/model", json=payload)
+                    break
+                except ConnectError:
+                    await sleep(0.05)
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/json"
+            assert resp.json() == {"a": 2, "b": "b"}
+
+            resp = await client.post(
+                f"{url}/model",
+                content=msgpack.packb(payload),
+                headers={
+                    "content-type": "application/msgpack",
+                    "accept": "application/msgpack",
+                },
+            )
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/msgpack"
+            assert resp.headers["vary"] == "Accept"
+            assert msgpack.unpackb(resp.content) == {"a": 2, "b": "b"}
+
+            resp = await client.post(
+                f"{url}/model-created",
+                content=cbor2.dumps(payload),
+                headers={
+                    "content-type": "application/cbor",
+                    "accept": "application/json;q=0.5, application/cbor",
+                },
+            )
+            assert resp.status_code == 201
+            assert resp.headers["content-type"] == "application/cbor"
+            assert resp.headers["test"] == "1"
+            assert cbor2.loads(resp.content) == payload
+
+            resp = await client.post(
+                f"{url}/model",
+                content=msgpack.packb(payload),
+                headers={"content-type": "application/x-unknown"},
+            )
+            assert resp.status_code == 415
+    finally:
+        t.cancel()
+
+
+def test_negotiate() -> None:
+    """The best codec is picked from the Accept header."""
+    json = make_json_codec(App().converter)
+    mp = make_msgpack_codec()
+    cbor = make_cbor_codec()
+    codecs = (json, mp, cbor)
+
+    assert negotiate("*/*", codecs) is json
+    assert negotiate("application/msgpack", codecs) is mp
+    assert negotiate("application/cbor, application/msgpack", codecs) is cbor
+    assert negotiate("application/cbor;q=0.1, application/msgpack", codecs) is mp
+    assert negotiate("text/html, application/*;q=0.8", codecs) is json
+    assert negotiate("text/html", codecs) is json
+    assert negotiate("application/msgpack;q=oops, application/cbor", codecs) is cbor
+
+
+def test_negotiate_ties() -> None:
+    """Ties go to the media range listed first, then to the earlier codec."""
+    json = make_json_codec(App().converter)
+    mp = make_msgpack_codec()
+    cbor = make_cbor_codec()
+    codecs = (json, mp, cbor)
+
+    assert negotiate("application/msgpack, application/cbor", codecs) is mp
+    assert negotiate("application/cbor, application/msgpack", codecs) is cbor
+    assert (
+        negotiate("application/cbor;q=0.5, application/msgpack;q=0.5", codecs) is cbor
+    )
+    assert negotiate("application/*", (cbor, mp)) is cbor
+    assert negotiate("application/*", (mp, cbor)) is mp
+
+
+def test_negotiation_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Negotiation is cached per `Accept` value."""
+    json = make_json_codec(App().converter)
+    calls = []
+
+    def counting_negotiate(accept, codecs):
+        calls.append(accept)
+        return negotiate(accept, codecs)
+
+    monkeypatch.setattr(codecs, "negotiate", counting_negotiate)
+    monkeypatch.setattr(codecs, "NEGOTIATION_CACHE_SIZE", 2)
+
+    def handler(a: int, *, b: str) -> Ok[Model]:
+        return Ok(Model(a, b), {"vary": "Cookie"})
+
+    negotiating = make_negotiating_handler(handler, (json, make_msgpack_codec()))
+    assert negotiating is not None
+
+    for _ in range(3):
+        resp = negotiating(1, "application/msgpack", b="b")
+        assert resp.headers == {"content-type": "application/msgpack", "vary": "Cookie"}
+        assert msgpack.unpackb(resp.ret) == {"a": 1, "b": "b"}
+    assert calls == ["application/msgpack"]
+
+    assert negotiating(1, "", b="b").ret == b'{"a":1,"b":"b"}'
+    negotiating(1, "application/json", b="b")
+    negotiating(1, "*/*", b="b")
+    negotiating(1, "application/msgpack", b="b")
+    # The cache holds two values, so the oldest one was evicted.
+    assert calls == [
+        "application/msgpack",
+        "application/json",
+        "*/*",
+        "application/msgpack",
+    ]
+
+
+def test_codecs_openapi() -> None:
+    """Codec content types are documented alongside JSON."""
+    app: App = App(codecs=[make_msgpack_codec()])
+
+    @app.post("/model")
+    def echo(m: ReqBody[Model]) -> Model:
+        return m
+
+    @app.get("/text")
+    def text() -> str:
+        return ""
+
+    spec = app.make_openapi_spec()
+
+    op = spec.paths["/model"].post
+    assert op is not None
+    assert op.requestBody is not None
+    assert list(op.requestBody.content) == ["application/json", "application/msgpack"]
+    assert list(op.responses["200"].content) == [
+        "application/json",
+        "application/msgpack",
+    ]
+    assert (
+        op.responses["200"].content["application/msgpack"]
+        == op.responses["200"].content["application/json"]
+    )
+
+    op = spec.paths["/text"].get
+    assert op is not None
+    assert list(op.responses["200"].content) == ["text/plain"]
@@ -0,0 +1,115 @@
+"""Tests for generated handler adapters."""
+
+from asyncio import create_task, sleep
+from collections.abc import Callable, Coroutine
+
+import pytest
+from httpx import AsyncClient, ConnectError
+
+from uapi.base import App
+from uapi.django import DjangoApp
+
+from .aiohttp import make_app as make_aiohttp_app
+from .aiohttp import run_on_aiohttp
+from .asgi import make_app as make_asgi_app
+from .asgi import run_on_asgi
+from .flask import make_app as make_flask_app
+from .flask import run_on_flask
+from .quart import make_app as make_quart_app
+from .quart import run_on_quart
+from .starlette import make_app as make_starlette_app
+from .starlette import run_on_starlette
+
+
+@pytest.mark.parametrize(
+    ("make_app", "run"),
+    [
+        (make_aiohttp_app, run_on_aiohttp),
+        (make_asgi_app, run_on_asgi),
+        (make_flask_app, run_on_flask),
+        (make_quart_app, run_on_quart),
+        (make_starlette_app, run_on_starlette),
+    ],
+    ids=["aiohttp", "asgi", "flask", "quart", "starlette"],
+)
+async def test_codegen(
+    unused_tcp_port: int,
+    make_app: Callable[[], App],
+    run: Callable[[App, int], Coroutine],
+) -> None:
+    """Generated adapters behave like the generic ones."""
+    app = make_app()
+    app.codegen = True
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+
+    try:
+        async with AsyncClient() as client:
+            for _ in range(50):
+                try:
+                    resp = await client.get(f"{url}/")
+                    break
+                except ConnectError:
+                    await sleep(0.05)
+            assert resp.status_code == 200
+            assert resp.text == "Hello, world"
+
+            resp = await client.get(f"{url}/path/15")
+            assert resp.text == "16"
+
+            resp = await client.post(f"{url}/path1/20")
+            assert resp.text == "22"
+
+            resp = await client.post(
+                f"{url}/post/model", json={"simple_model": {"an_int": 2}}
+            )
+            assert resp.status_code == 201
+            assert resp.json()["simple_model"]["an_int"] == 2
+
+            resp = await client.post(
+                f"{url}/post/model",
+                content=b'{"simple_model": {"an_int": 2}}',
+                headers={"content-type": "text/plain"},
+            )
+            assert resp.status_code == 415
+
+            resp = await client.get(f"{url}/exc/attrs")
+            assert resp.status_code == 200
+            assert resp.json() == {"an_int": 1, "a_string": "1", "a_float": 1.0}
+
+            resp = await client.get(f"{url}/throttled")
+            assert resp.status_code == 429
+    finally:
+        t.cancel()
+
+    assert ("GET", "/") in app.generated_sources
+    assert "_handler(" in app.generated_sources[("GET", "/")]
+
+
+def test_codegen_source() -> None:
+    """Generated source is available, and inlines the route specifics."""
+    app = make_starlette_app()
+    app.codegen = True
+    app.to_framework_app()
+
+    src = app.generated_sources[("GET", "/path/{path_id}")]
+    assert "request.path_params['path_id']" in src
+    assert "_req_ct" not in src
+
+    src = app.generated_sources[("POST", "/post/model")]
+    assert "_req_ct" in src
+
+
+def test_codegen_django() -> None:
+    """Django adapters can be generated."""
+    app: DjangoApp = DjangoApp(codegen=True)
+
+    @app.get("/path/<int:path_id>")
+    def path(path_id: int) -> str:
+        return str(path_id)
+
+    app.to_urlpatterns()
+
+    src = app.generated_sources[("GET", "/path/<int:path_id>")]
+    assert "def adapt_get_path(request, **kwargs):" in src
+    assert "kwargs['path_id']" in src
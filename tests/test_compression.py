@@ -0,0 +1,158 @@
+"""Tests for response compression."""
+
+from asyncio import create_task, sleep
+from collections.abc import Callable, Coroutine
+from gzip import decompress
+
+import pytest
+from attrs import define
+from httpx import AsyncClient, ConnectError
+
+from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
+from uapi.base import App
+from uapi.compression import (
+    Compression,
+    choose_encoding,
+    make_deflate_encoding,
+    make_gzip_encoding,
+)
+from uapi.django import DjangoApp
+from uapi.flask import FlaskApp
+from uapi.quart import QuartApp
+from uapi.starlette import StarletteApp
+from uapi.status import Ok
+
+from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
+from .django import run_on_django
+from .flask import run_on_flask
+from .quart import run_on_quart
+from .starlette import run_on_starlette
+
+TEXT = "uapi " * 1000
+
+
+@define
+class Model:
+    text: str
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [
+        (AiohttpApp, run_on_aiohttp),
+        (AsgiApp, run_on_asgi),
+        (DjangoApp, run_on_django),
+        (FlaskApp, run_on_flask),
+        (QuartApp, run_on_quart),
+        (StarletteApp, run_on_starlette),
+    ],
+    ids=["aiohttp", "asgi", "django", "flask", "quart", "starlette"],
+)
+async def test_compression(
+    unused_tcp_port: int, app_type: type[App], run: Callable[[App, int], Coroutine]
+) -> None:
+    """Large responses are compressed if the client accepts it."""
+    app = app_type(
+        compression=Compression(
+            (make_gzip_encoding(), make_deflate_encoding()),
+            offload_size=2048,
+            exclude=frozenset({"excluded"}),
+        )
+    )
+
+    @app.get("/text")
+    def text() -> str:
+        return TEXT
+
+    @app.get("/large")
+    def large() -> str:
+        return TEXT * 5
+
+    @app.get("/small")
+    def small() -> str:
+        return "small"
+
+    @app.get("/model")
+    def model() -> Ok[Model]:
+        return Ok(Model(TEXT), {"vary": "Cookie"})
+
+    @app.get("/excluded")
+    def excluded() -> str:
+        return TEXT
+
+    @app.get("/encoded")
+    def encoded() -> Ok[bytes]:
+        return Ok(TEXT.encode(), {"content-encoding": "identity"})
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+    gzip = {"accept-encoding": "gzip"}
+
+    try:
+        async with AsyncClient() as client:
+            for _ in range(50):
+                try:
+                    resp = await client.get(f"{url}/text", headers=gzip)
+                    break
+                except ConnectError:
+                    await sleep(0.05)
+            assert resp.status_code == 200
+            assert resp.headers["content-encoding"] == "gzip"
+            assert resp.headers["vary"] == "Accept-Encoding"
+            assert resp.headers["content-type"] == "text/plain"
+            assert resp.text == TEXT
+
+            # Offloaded to a thread in async apps.
+            resp = await client.get(f"{url}/large", headers=gzip)
+            assert resp.headers["content-encoding"] == "gzip"
+            assert resp.text == TEXT * 5
+
+            resp = await client.get(
+                f"{url}/text", headers={"accept-encoding": "gzip;q=0.5, deflate"}
+            )
+            assert resp.headers["content-encoding"] == "deflate"
+            assert resp.text == TEXT
+
+            resp = await client.get(f"{url}/text", headers={"accept-encoding": ""})
+            assert "content-encoding" not in resp.headers
+            assert resp.headers["vary"] == "Accept-Encoding"
+            assert resp.text == TEXT
+
+            resp = await client.get(f"{url}/small", headers=gzip)
+            assert "content-encoding" not in resp.headers
+            assert resp.text == "small"
+
+            resp = await client.get(f"{url}/model", headers=gzip)
+            assert resp.headers["content-encoding"] == "gzip"
+            assert resp.headers["vary"] == "Cookie, Accept-Encoding"
+            assert resp.json() == {"text": TEXT}
+
+            resp = await client.get(f"{url}/excluded", headers=gzip)
+            assert "content-encoding" not in resp.headers
+            assert resp.text == TEXT
+
+            resp = await client.get(f"{url}/encoded", headers=gzip)
+            assert resp.headers["content-encoding"] == "identity"
+            assert resp.text == TEXT
+    finally:
+        t.cancel()
+
+
+def test_choose_encoding() -> None:
+    """The best encoding is picked from the Accept-Encoding header."""
+    gzip = make_gzip_encoding()
+    deflate = make_deflate_encoding()
+    encodings = (gzip, deflate)
+
+    assert choose_encoding("gzip, deflate, br", encodings) is gzip
+    assert choose_encoding("deflate", encodings) is deflate
+    assert choose_encoding("gzip;q=0.2, deflate;q=0.8", encodings) is deflate
+    assert choose_encoding("*", encodings) is gzip
+    assert choose_encoding("*, gzip;q=0", encodings) is deflate
+    assert choose_encoding("identity", encodings) is None
+    assert choose_encoding("br", encodings) is None
+
+    assert decompress(gzip.compress(b"uapi")) == b"uapi"
+    assert gzip.compress(b"uapi") == gzip.compress(b"uapi")
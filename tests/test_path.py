@@ -1,8 +1,13 @@
 """Tests for path parameters."""
 
+from inspect import Signature
+
 import pytest
+from cattrs.preconf.orjson import make_converter
 from httpx import AsyncClient
 
+from uapi.path import make_path_params_loader
+
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_path_parameter(server):
@@ -20,3 +25,18 @@ async def test_path_string(server):
         resp = await client.post(f"http://localhost:{server}/path1/20")
         assert resp.status_code == 200
         assert resp.text == "22"
+
+
+def test_path_params_loader() -> None:
+    """Path params loaders are prepared per route."""
+    converter = make_converter()
+
+    assert make_path_params_loader({}, converter) is None
+
+    loader = make_path_params_loader({"a": str, "b": Signature.empty}, converter)
+    assert loader is not None
+    assert loader({"a": "1", "b": "2", "c": "3"}) == {"a": "1", "b": "2"}
+
+    loader = make_path_params_loader({"a": int, "b": str}, converter)
+    assert loader is not None
+    assert loader({"a": "1", "b": "2"}) == {"a": 1, "b": "2"}
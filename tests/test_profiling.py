@@ -0,0 +1,53 @@
+"""Tests for startup profiling."""
+
+from uapi.profiling import StartupProfile
+from uapi.starlette import App
+
+
+def test_startup_profile() -> None:
+    """Building the app and the spec records timings per route and phase."""
+    profile = StartupProfile()
+    app = App(startup_profile=profile)
+
+    @app.get("/")
+    async def index() -> str:
+        return "index"
+
+    @app.post("/items/{item_id}")
+    async def item(item_id: int) -> None:
+        return
+
+    app.to_framework_app()
+
+    assert set(profile.timings) == {("GET", "/"), ("POST", "/items/{item_id}")}
+    for phases in profile.timings.values():
+        assert list(phases) == [
+            "wrap",
+            "response_adapter",
+            "compose",
+            "framework_compose",
+            "adapter",
+        ]
+        assert all(t >= 0 for t in phases.values())
+
+    app.make_openapi_spec()
+
+    assert all("openapi" in phases for phases in profile.timings.values())
+
+
+def test_report() -> None:
+    """Reports list the most expensive routes first, in milliseconds."""
+    profile = StartupProfile(
+        {
+            ("GET", "/"): {"compose": 0.001, "adapter": 0.0005},
+            ("POST", "/items"): {"compose": 0.002, "openapi": 0.01},
+        }
+    )
+
+    assert profile.totals() == [(("POST", "/items"), 0.012), (("GET", "/"), 0.0015)]
+    assert profile.report().splitlines() == [
+        "route        total  compose  adapter  openapi",
+        "POST /items  12.00     2.00     0.00    10.00",
+        "GET /         1.50     1.00     0.50     0.00",
+    ]
+    assert len(profile.report(limit=1).splitlines()) == 2
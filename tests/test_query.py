@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from uapi.query import LazyQuery
+
 
 @pytest.mark.asyncio(loop_scope="session")
 async def test_query_post(server: int):
@@ -56,3 +58,41 @@ async def test_query_seq(server: int):
         )
         assert resp.status_code == 200
         assert resp.read() == b"6"
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_query_unrelated_params(server: int):
+    """Unrelated and encoded query params don't interfere."""
+    async with AsyncClient() as client:
+        resp = await client.get(
+            f"http://localhost:{server}/query-list",
+            params={
+                "utm_source": "a b&c",
+                "param": ["1", "2"],
+                "fbclid": "%%%",
+                "": "empty",
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.read() == b"3"
+
+
+def test_lazy_query() -> None:
+    """Lazy queries split and decode on demand."""
+    query = LazyQuery("a=1&b=x+y&a=2&c=%C3%A9&d=&&e&f%5B%5D=3")
+
+    assert query.get("a") == "2"
+    assert query.get_first("a") == "1"
+    assert query.getall("a") == ["1", "2"]
+    assert query.get("b") == "x y"
+    assert query.get("c") == "é"
+    assert query.get("d") == ""
+    assert query.get("e") == ""
+    assert query.get("f[]") == "3"
+    assert "missing" not in query
+    assert query.getall("missing") == []
+    assert query.get("missing", None) is None
+    with pytest.raises(KeyError):
+        query.get("missing")
+    with pytest.raises(KeyError):
+        query.get_first("missing")
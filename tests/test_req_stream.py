@@ -0,0 +1,174 @@
+"""Tests for streamed request bodies and body size limits."""
+
+from asyncio import create_task, sleep
+from collections.abc import AsyncIterator, Callable, Coroutine
+
+import pytest
+from attrs import define
+from httpx import AsyncClient, ConnectError
+
+from uapi import ReqBody, ReqBytes, ReqFile, ReqStream
+from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
+from uapi.base import App, AsyncApp
+from uapi.django import DjangoApp
+from uapi.flask import FlaskApp
+from uapi.quart import QuartApp
+from uapi.starlette import StarletteApp
+from uapi.status import Created
+
+from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
+from .django import run_on_django
+from .flask import run_on_flask
+from .quart import run_on_quart
+from .starlette import run_on_starlette
+
+
+@define
+class Model:
+    a: str
+
+
+async def chunks(count: int, size: int = 65536) -> AsyncIterator[bytes]:
+    for _ in range(count):
+        yield b"0" * size
+
+
+async def wait_for_server(client: AsyncClient, url: str) -> None:
+    for _ in range(50):
+        try:
+            await client.get(url)
+            return
+        except ConnectError:
+            await sleep(0.05)
+
+
+async def check_limits(client: AsyncClient, url: str, chunked: bool = True) -> None:
+    resp = await client.post(f"{url}/bytes", content=b"0" * 100)
+    assert resp.status_code == 201
+    assert resp.text == "100"
+
+    resp = await client.post(f"{url}/bytes", content=b"0" * 101)
+    assert resp.status_code == 413
+
+    if chunked:
+        # No content-length, the limit is enforced while reading.
+        resp = await client.post(f"{url}/bytes", content=chunks(16))
+        assert resp.status_code == 413
+
+    resp = await client.post(f"{url}/model", json={"a": "a"})
+    assert resp.status_code == 201
+    assert resp.text == "a"
+
+    resp = await client.post(f"{url}/model", json={"a": "a" * 100})
+    assert resp.status_code == 413
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [
+        (AiohttpApp, run_on_aiohttp),
+        (AsgiApp, run_on_asgi),
+        (QuartApp, run_on_quart),
+        (StarletteApp, run_on_starlette),
+    ],
+    ids=["aiohttp", "asgi", "quart", "starlette"],
+)
+async def test_req_stream_async(
+    unused_tcp_port: int,
+    app_type: type[AsyncApp],
+    run: Callable[[AsyncApp, int], Coroutine],
+) -> None:
+    """Async apps stream bodies, and enforce body size limits."""
+    app = app_type(max_body_size=100)
+
+    @app.post("/stream")
+    async def stream(body: ReqStream) -> Created[str]:
+        return Created(str(sum([len(chunk) async for chunk in body])))
+
+    @app.post("/bytes")
+    async def read_bytes(body: ReqBytes) -> Created[str]:
+        return Created(str(len(body)))
+
+    @app.post("/model")
+    async def model(body: ReqBody[Model]) -> Created[str]:
+        return Created(body.a)
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+
+    try:
+        async with AsyncClient() as client:
+            await wait_for_server(client, url)
+
+            # Streams are not subject to the limit.
+            resp = await client.post(f"{url}/stream", content=chunks(16))
+            assert resp.status_code == 201
+            assert resp.text == str(16 * 65536)
+
+            resp = await client.post(f"{url}/stream", content=b"0" * 1000)
+            assert resp.text == "1000"
+
+            await check_limits(client, url)
+    finally:
+        t.cancel()
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [(DjangoApp, run_on_django), (FlaskApp, run_on_flask)],
+    ids=["django", "flask"],
+)
+async def test_req_file_sync(
+    unused_tcp_port: int, app_type: type[App], run: Callable[[App, int], Coroutine]
+) -> None:
+    """Sync apps provide bodies as files, and enforce body size limits."""
+    app = app_type(max_body_size=100)
+
+    @app.post("/stream")
+    def stream(body: ReqFile) -> Created[str]:
+        size = 0
+        while chunk := body.read(65536):
+            size += len(chunk)
+        return Created(str(size))
+
+    @app.post("/bytes")
+    def read_bytes(body: ReqBytes) -> Created[str]:
+        return Created(str(len(body)))
+
+    @app.post("/model")
+    def model(body: ReqBody[Model]) -> Created[str]:
+        return Created(body.a)
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+
+    try:
+        async with AsyncClient() as client:
+            await wait_for_server(client, url)
+
+            resp = await client.post(f"{url}/stream", content=b"0" * 1_000_000)
+            assert resp.status_code == 201
+            assert resp.text == "1000000"
+
+            # WSGI servers don't pass through bodies without a content length.
+            await check_limits(client, url, chunked=False)
+    finally:
+        t.cancel()
+
+
+def test_req_stream_openapi() -> None:
+    """Raw bodies are documented as binary request bodies."""
+    app: StarletteApp = StarletteApp()
+
+    @app.post("/stream")
+    async def stream(body: ReqStream) -> None:
+        return None
+
+    op = app.make_openapi_spec().paths["/stream"].post
+    assert op is not None
+    assert op.parameters == []
+    assert op.requestBody is not None
+    assert list(op.requestBody.content) == ["application/octet-stream"]
+    assert op.requestBody.required
@@ -0,0 +1,142 @@
+"""Tests for the compiled router."""
+
+from collections.abc import Callable
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.types import ASGIApp
+
+from uapi.router import Router
+
+from .asgi import make_app as make_asgi_app
+from .starlette import make_app as make_starlette_app
+
+
+def test_static_and_params() -> None:
+    """Static segments win over parameters."""
+    router: Router[str] = Router()
+    router.add("GET", "/", "index")
+    router.add("GET", "/users/{id}", "user")
+    router.add("POST", "/users/{id}", "user-post")
+    router.add("GET", "/users/me", "me")
+    router.add("GET", "/users/{id}/posts/{post_id}", "post")
+
+    assert router.match("/") == ({"GET": "index"}, {})
+    assert router.match("/users/me") == ({"GET": "me"}, {})
+    assert router.match("/users/1") == (
+        {"GET": "user", "POST": "user-post"},
+        {"id": "1"},
+    )
+    assert router.match("/users/1/posts/2") == (
+        {"GET": "post"},
+        {"id": "1", "post_id": "2"},
+    )
+    assert router.match("/users") is None
+    assert router.match("/users/") is None
+    assert router.match("/users/1/posts") is None
+
+
+def test_typed_params() -> None:
+    """Typed parameters only match appropriate segments."""
+    router: Router[str] = Router()
+    router.add("GET", "/items/<int:item_id>", "int")
+    router.add("GET", "/items/{name}", "str")
+    router.add("GET", "/prices/{price:float}", "float")
+
+    assert router.match("/items/12") == ({"GET": "int"}, {"item_id": "12"})
+    assert router.match("/items/abc") == ({"GET": "str"}, {"name": "abc"})
+    assert router.match("/items/²") == ({"GET": "str"}, {"name": "²"})
+    assert router.match("/items/٣") == ({"GET": "str"}, {"name": "٣"})
+    assert router.match("/prices/1.5") == ({"GET": "float"}, {"price": "1.5"})
+    assert router.match("/prices/2") == ({"GET": "float"}, {"price": "2"})
+    for price in ("abc", "nan", "inf", "1e5", "1_000", "-1", "1."):
+        assert router.match(f"/prices/{price}") is None
+
+    with pytest.raises(ValueError):
+        router.add("GET", "/{a:unknown}", "unknown")
+
+
+def test_uuid_params() -> None:
+    """UUID parameters match the segments Starlette matches."""
+    router: Router[str] = Router()
+    router.add("GET", "/orders/{id:uuid}", "uuid")
+
+    for id in (
+        "0f3c7b1e-8a4d-4c2b-9e6f-1a2b3c4d5e6f",
+        "0F3C7B1E8A4D4C2B9E6F1A2B3C4D5E6F",
+    ):
+        assert router.match(f"/orders/{id}") == ({"GET": "uuid"}, {"id": id})
+    assert router.match("/orders/0f3c7b1e") is None
+    assert router.match("/orders/0f3c7b1e-8a4d-4c2b-9e6f-1a2b3c4d5e6g") is None
+
+
+def test_backtracking() -> None:
+    """Failed static branches fall back to parameters."""
+    router: Router[str] = Router()
+    router.add("GET", "/a/b/c", "static")
+    router.add("GET", "/a/{x}/d", "param")
+
+    assert router.match("/a/b/c") == ({"GET": "static"}, {})
+    assert router.match("/a/b/d") == ({"GET": "param"}, {"x": "b"})
+
+
+def test_mixed_segments_and_paths() -> None:
+    """Segments mixing text and parameters, and path parameters."""
+    router: Router[str] = Router()
+    router.add("GET", "/files/{name}.txt", "txt")
+    router.add("GET", "/static/{rest:path}", "static")
+
+    assert router.match("/files/a.txt") == ({"GET": "txt"}, {"name": "a"})
+    assert router.match("/files/a.bin") is None
+    assert router.match("/static/a/b/c.css") == (
+        {"GET": "static"},
+        {"rest": "a/b/c.css"},
+    )
+
+
+async def test_starlette_compiled_router() -> None:
+    """Starlette apps can dispatch using the compiled router."""
+    app = make_starlette_app().to_framework_app(compiled_router=True)
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        resp = await client.get("/")
+        assert resp.status_code == 200
+        assert resp.text == "Hello, world"
+
+        resp = await client.get("/path/15")
+        assert resp.status_code == 200
+        assert resp.text == "16"
+
+        resp = await client.head("/head/exc")
+        assert resp.status_code == 403
+
+        resp = await client.delete("/")
+        assert resp.status_code == 405
+
+        resp = await client.get("/non-existent")
+        assert resp.status_code == 404
+
+
+@pytest.mark.parametrize(
+    "make_app",
+    [
+        lambda: make_starlette_app().to_framework_app(compiled_router=True),
+        lambda: make_asgi_app().to_framework_app(),
+    ],
+    ids=["starlette", "asgi"],
+)
+async def test_mounted_compiled_router(make_app: Callable[[], ASGIApp]) -> None:
+    """Compiled routers match paths relative to the mount point."""
+    app = Starlette(routes=[Mount("/api", app=make_app())])
+    async with AsyncClient(
+        transport=ASGITransport(app), base_url="http://test"
+    ) as client:
+        resp = await client.get("/api/path/15")
+        assert resp.status_code == 200
+        assert resp.text == "16"
+
+        resp = await client.get("/path/15")
+        assert resp.status_code == 404
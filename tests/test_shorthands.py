@@ -9,6 +9,7 @@ from attrs import define
 from httpx import AsyncClient
 
 from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
 from uapi.django import DjangoApp
 from uapi.flask import FlaskApp
 from uapi.quart import App, QuartApp
@@ -17,6 +18,7 @@ from uapi.starlette import StarletteApp
 from uapi.status import Created, Ok
 
 from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
 from .django import run_on_django
 from .flask import run_on_flask
 from .quart import run_on_quart
@@ -34,7 +36,7 @@ class DatetimeShorthand(ResponseShorthand[datetime]):
 
 
 @pytest.mark.parametrize(
-    "app_type", [QuartApp, AiohttpApp, StarletteApp, FlaskApp, DjangoApp]
+    "app_type", [QuartApp, AiohttpApp, StarletteApp, FlaskApp, DjangoApp, AsgiApp]
 )
 async def test_custom_shorthand(
     unused_tcp_port: int,
@@ -44,6 +46,7 @@ async def test_custom_shorthand(
         | type[StarletteApp]
         | type[FlaskApp]
         | type[DjangoApp]
+        | type[AsgiApp]
     ),
 ) -> None:
     """Custom shorthands work."""
@@ -65,6 +68,8 @@ async def test_custom_shorthand(
         t = create_task(run_on_flask(app, unused_tcp_port))
     elif app_type is DjangoApp:
         t = create_task(run_on_django(app, unused_tcp_port))
+    elif app_type is AsgiApp:
+        t = create_task(run_on_asgi(app, unused_tcp_port))
 
     try:
         async with AsyncClient() as client:
@@ -0,0 +1,63 @@
+"""Tests for shared introspection caches."""
+
+from inspect import Parameter
+from typing import Annotated
+
+from attrs import define
+
+from uapi import Cookie
+from uapi._signatures import get_signature
+from uapi.requests import (
+    FormBody,
+    Header,
+    HeaderSpec,
+    ReqBody,
+    get_cookie_name,
+    maybe_form_type,
+    maybe_header_type,
+    maybe_req_body_type,
+)
+
+
+@define
+class Model:
+    a: int
+
+
+def test_signature_cache() -> None:
+    """Signatures are resolved once per callable."""
+
+    def handler(a: "int") -> "str":
+        return str(a)
+
+    sig = get_signature(handler)
+    assert get_signature(handler) is sig
+    assert sig.parameters["a"].annotation is int
+    assert sig.return_annotation is str
+
+
+def test_parameter_classification() -> None:
+    """Parameters are classified by their annotations, as before caching."""
+
+    def param(name: str, annotation: object) -> Parameter:
+        return Parameter(name, Parameter.POSITIONAL_OR_KEYWORD, annotation=annotation)
+
+    header = param("x_header", Header[str])
+    assert maybe_header_type(header) == (str, HeaderSpec())
+    assert maybe_header_type(param("x", Annotated[int, HeaderSpec("a")])) == (
+        int,
+        HeaderSpec("a"),
+    )
+    assert maybe_form_type(param("f", FormBody[Model])) is Model
+    assert maybe_req_body_type(param("b", ReqBody[Model])) is not None
+    # Only attrs classes and dicts are request bodies.
+    assert maybe_req_body_type(param("b", ReqBody[int])) is None
+
+    assert get_cookie_name(Cookie, "session") == "session"
+    assert get_cookie_name(Annotated[str, Cookie("sid")], "session") == "sid"
+    assert get_cookie_name(Annotated[str, Cookie()], "session") == "session"
+    assert get_cookie_name(str, "session") is None
+
+    for p in (header, param("q", int), param("u", Annotated[int, {"unhashable"}])):
+        assert maybe_form_type(p) is None
+        assert maybe_req_body_type(p) is None
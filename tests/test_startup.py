@@ -0,0 +1,126 @@
+"""Tests for doing startup work ahead of time."""
+
+from gc import get_freeze_count, unfreeze
+from typing import Any
+
+import pytest
+from attrs import define
+
+from uapi._openapi import IncrementalSpecBuilder
+from uapi.openapi import OpenAPI
+from uapi.requests import FormBody, ReqBody
+from uapi.starlette import App
+from uapi.startup import prepare_for_fork, warm_up_hooks
+from uapi.status import Created, Ok
+
+
+@define
+class Body:
+    a: int
+
+
+@define
+class Form:
+    b: int
+
+
+@define
+class Resp:
+    c: int
+
+
+def test_warm_up_hooks() -> None:
+    """Hooks are generated for request and response types."""
+    app = App()
+    structured: list[Any] = []
+    unstructured: list[Any] = []
+
+    def structure_factory(t: Any) -> Any:
+        structured.append(t)
+        return lambda v, _: v
+
+    def unstructure_factory(t: Any) -> Any:
+        unstructured.append(t)
+        return lambda v: v
+
+    app.converter.register_structure_hook_factory(
+        lambda t: t in (Body, Form, list[int]), structure_factory
+    )
+    app.converter.register_unstructure_hook_factory(
+        lambda t: t is Resp, unstructure_factory
+    )
+
+    @app.post("/")
+    async def index(body: ReqBody[Body], q: list[int]) -> Ok[Resp] | Created[None]:
+        return Ok(Resp(1))
+
+    @app.post("/form")
+    async def form(form: FormBody[Form]) -> str:
+        return ""
+
+    warm_up_hooks(app)
+
+    assert structured == [Body, list[int], Form]
+    assert unstructured == [Resp]
+
+
+def test_prepare_for_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Lazy specs are created, and objects frozen."""
+    app = App()
+    builds: list[None] = []
+    build = IncrementalSpecBuilder.build
+
+    def counting_build(*args, **kwargs) -> OpenAPI:
+        builds.append(None)
+        return build(*args, **kwargs)
+
+    monkeypatch.setattr(IncrementalSpecBuilder, "build", counting_build)
+
+    @app.get("/")
+    async def index() -> None:
+        return
+
+    app.serve_openapi(lazy=True)
+
+    try:
+        prepare_for_fork(app)
+        assert builds == [None]
+        assert get_freeze_count() > 0
+    finally:
+        unfreeze()
+
+
+class Unsupported:
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+
+def test_build_warm_up() -> None:
+    """Apps can warm up hooks when built, reporting failures."""
+    app = App(warm_up_converters=True)
+    structured: list[Any] = []
+
+    def structure_factory(t: Any) -> Any:
+        structured.append(t)
+        return lambda v, _: v
+
+    app.converter.register_structure_hook_factory(
+        lambda t: t is Body, structure_factory
+    )
+
+    @app.post("/")
+    async def index(body: ReqBody[Body], q: Unsupported) -> None:
+        return
+
+    with pytest.warns(RuntimeWarning, match="POST /: cannot structure"):
+        app.to_framework_app()
+
+    assert structured == [Body]
+    assert len(app.hook_failures) == 1
+    failure = app.hook_failures[0]
+    assert (failure.method, failure.path, failure.type, failure.kind) == (
+        "POST",
+        "/",
+        Unsupported,
+        "structure",
+    )
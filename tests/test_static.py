@@ -0,0 +1,127 @@
+"""Tests for constant responses."""
+
+from asyncio import create_task, sleep
+from collections.abc import Callable, Coroutine
+from gzip import decompress
+
+import pytest
+from httpx import AsyncClient, ConnectError
+
+from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
+from uapi.base import App
+from uapi.compression import make_gzip_encoding
+from uapi.django import DjangoApp
+from uapi.flask import FlaskApp
+from uapi.quart import QuartApp
+from uapi.starlette import StarletteApp
+from uapi.static import make_static_handler
+from uapi.status import ResponseException
+
+from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
+from .django import run_on_django
+from .flask import run_on_flask
+from .quart import run_on_quart
+from .starlette import run_on_starlette
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [
+        (AiohttpApp, run_on_aiohttp),
+        (AsgiApp, run_on_asgi),
+        (DjangoApp, run_on_django),
+        (FlaskApp, run_on_flask),
+        (QuartApp, run_on_quart),
+        (StarletteApp, run_on_starlette),
+    ],
+    ids=["aiohttp", "asgi", "django", "flask", "quart", "starlette"],
+)
+async def test_static_openapi(
+    unused_tcp_port: int, app_type: type[App], run: Callable[[App, int], Coroutine]
+) -> None:
+    """The OpenAPI spec is served precompressed, with an ETag."""
+    app = app_type()
+
+    @app.get("/")
+    def index() -> str:
+        return "index"
+
+    app.serve_openapi()
+    app.serve_redoc()
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+
+    try:
+        async with AsyncClient() as client:
+            for _ in range(50):
+                try:
+                    resp = await client.get(
+                        f"{url}/openapi.json", headers={"accept-encoding": "gzip"}
+                    )
+                    break
+                except ConnectError:
+                    await sleep(0.05)
+            assert resp.status_code == 200
+            assert resp.headers["content-encoding"] == "gzip"
+            assert resp.headers["content-type"] == "application/json"
+            assert resp.json()["openapi"] == "3.0.3"
+            etag = resp.headers["etag"]
+
+            resp = await client.get(
+                f"{url}/openapi.json",
+                headers={"accept-encoding": "gzip", "if-none-match": etag},
+            )
+            assert resp.status_code == 304
+            assert resp.headers["etag"] == etag
+            assert resp.content == b""
+
+            resp = await client.get(
+                f"{url}/openapi.json", headers={"accept-encoding": "identity"}
+            )
+            assert resp.status_code == 200
+            assert "content-encoding" not in resp.headers
+            assert resp.headers["etag"] != etag
+
+            resp = await client.get(f"{url}/redoc", headers={"accept-encoding": "gzip"})
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "text/html"
+            assert "redoc" in resp.text
+    finally:
+        t.cancel()
+
+
+def test_static_handler() -> None:
+    """Variants are picked by Accept-Encoding, and validated by ETag."""
+    body = b"uapi " * 1000
+    handler = make_static_handler(body, "text/plain", [make_gzip_encoding()])
+
+    resp = handler()
+    assert resp.ret == body
+    assert resp.headers["content-type"] == "text/plain"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    identity_etag = resp.headers["etag"]
+
+    resp = handler(accept_encoding="br, gzip")
+    assert decompress(resp.ret) == body
+    assert resp.headers["content-encoding"] == "gzip"
+    gzip_etag = resp.headers["etag"]
+    assert gzip_etag != identity_etag
+
+    for if_none_match in (gzip_etag, f'"other", W/{gzip_etag}', "*"):
+        with pytest.raises(ResponseException) as exc_info:
+            handler(if_none_match, "gzip")
+        assert exc_info.value.response.status_code() == 304
+        assert exc_info.value.response.headers == {
+            "etag": gzip_etag,
+            "vary": "Accept-Encoding",
+        }
+
+    assert handler(identity_etag, "gzip").ret != body
+
+    # Incompressible bodies are only served as-is.
+    resp = make_static_handler(b"a", "text/plain")(accept_encoding="gzip")
+    assert resp.ret == b"a"
+    assert "vary" not in resp.headers
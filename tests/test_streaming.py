@@ -0,0 +1,256 @@
+"""Tests for streamed responses."""
+
+from asyncio import Event, create_task, sleep, wait_for
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+
+import pytest
+from attrs import define
+from cattrs.preconf.orjson import make_converter
+from httpx import AsyncClient, ConnectError
+from orjson import loads
+
+from uapi.aiohttp import AiohttpApp
+from uapi.asgi import AsgiApp
+from uapi.base import App, AsyncApp
+from uapi.django import DjangoApp
+from uapi.flask import FlaskApp
+from uapi.openapi import MediaType, Reference, Schema
+from uapi.quart import QuartApp
+from uapi.shorthands import make_attrs_stream_shorthand
+from uapi.starlette import StarletteApp
+from uapi.status import Created, Ok
+
+from .aiohttp import run_on_aiohttp
+from .asgi import run_on_asgi
+from .django import run_on_django
+from .flask import run_on_flask
+from .quart import run_on_quart
+from .starlette import run_on_starlette
+
+ASYNC_APPS = [
+    (AiohttpApp, run_on_aiohttp),
+    (AsgiApp, run_on_asgi),
+    (QuartApp, run_on_quart),
+    (StarletteApp, run_on_starlette),
+]
+ASYNC_IDS = ["aiohttp", "asgi", "quart", "starlette"]
+
+
+def rows() -> Iterator[bytes]:
+    yield b"a,b\n"
+    for i in range(1000):
+        yield f"{i},{i * 2}\n".encode()
+
+
+async def get_first(client: AsyncClient, url: str):
+    for _ in range(50):
+        try:
+            return await client.get(url)
+        except ConnectError:
+            await sleep(0.05)
+    return await client.get(url)
+
+
+@pytest.mark.parametrize(("app_type", "run"), ASYNC_APPS, ids=ASYNC_IDS)
+async def test_streaming_async(
+    unused_tcp_port: int,
+    app_type: type[AsyncApp],
+    run: Callable[[AsyncApp, int], Coroutine],
+) -> None:
+    """Iterators and async iterators are streamed by async apps."""
+    app = app_type()
+    proceed = Event()
+
+    @app.get("/async")
+    async def async_stream() -> AsyncIterator[bytes]:
+        async def gen() -> AsyncIterator[bytes]:
+            for row in rows():
+                yield row
+
+        return gen()
+
+    @app.get("/sync")
+    async def sync_stream() -> Iterator[bytes]:
+        return rows()
+
+    @app.get("/csv")
+    async def csv() -> Ok[AsyncIterator[bytes]] | Created[None]:
+        async def gen() -> AsyncIterator[bytes]:
+            yield b"first\n"
+            await proceed.wait()
+            yield b"second\n"
+
+        return Ok(gen(), {"content-type": "text/csv", "__cookie_a": "a=1"})
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+    expected = b"".join(rows())
+
+    try:
+        async with AsyncClient() as client:
+            resp = await get_first(client, f"{url}/async")
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/octet-stream"
+            assert resp.content == expected
+
+            resp = await client.get(f"{url}/sync")
+            assert resp.status_code == 200
+            assert resp.content == expected
+
+            # The first chunk arrives before the handler produces the second.
+            async with client.stream("GET", f"{url}/csv") as resp:
+                assert resp.status_code == 200
+                assert resp.headers["content-type"].startswith("text/csv")
+                assert resp.cookies["a"] == "1"
+                chunks = resp.aiter_bytes()
+                assert await wait_for(anext(chunks), 5) == b"first\n"
+                proceed.set()
+                assert b"".join([c async for c in chunks]) == b"second\n"
+    finally:
+        t.cancel()
+
+
+@pytest.mark.parametrize(
+    ("app_type", "run"),
+    [(DjangoApp, run_on_django), (FlaskApp, run_on_flask)],
+    ids=["django", "flask"],
+)
+async def test_streaming_sync(
+    unused_tcp_port: int, app_type: type[App], run: Callable[[App, int], Coroutine]
+) -> None:
+    """Iterators are streamed by sync apps."""
+    app = app_type()
+
+    @app.get("/sync")
+    def sync_stream() -> Iterator[bytes]:
+        return rows()
+
+    @app.get("/csv")
+    def csv() -> Ok[Iterator[bytes]]:
+        return Ok(rows(), {"content-type": "text/csv"})
+
+    t = create_task(run(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+    expected = b"".join(rows())
+
+    try:
+        async with AsyncClient() as client:
+            resp = await get_first(client, f"{url}/sync")
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "application/octet-stream"
+            assert resp.content == expected
+
+            resp = await client.get(f"{url}/csv")
+            assert resp.status_code == 200
+            assert resp.headers["content-type"].startswith("text/csv")
+            assert resp.content == expected
+    finally:
+        t.cancel()
+
+
+def test_streaming_openapi() -> None:
+    """Streamed responses are documented as binary."""
+    app: StarletteApp = StarletteApp()
+
+    @app.get("/stream")
+    async def stream() -> AsyncIterator[bytes]:
+        return iter([])  # type: ignore[return-value]
+
+    @app.get("/csv")
+    async def csv() -> Ok[AsyncIterator[bytes]]:
+        return Ok(iter([]))  # type: ignore[arg-type]
+
+    spec = app.make_openapi_spec()
+
+    for path in ("/stream", "/csv"):
+        op = spec.paths[path].get
+        assert op is not None
+        assert op.responses["200"].content == {
+            "application/octet-stream": MediaType(
+                Schema(Schema.Type.STRING, format="binary")
+            )
+        }
+
+
+@define
+class Row:
+    a: int
+    b: str
+
+
+@pytest.mark.parametrize("json_array", [False, True])
+async def test_attrs_stream_shorthand(unused_tcp_port: int, json_array: bool) -> None:
+    """Iterators of attrs instances are streamed as NDJSON or JSON arrays."""
+    app: StarletteApp = StarletteApp()
+    app.add_response_shorthand(
+        make_attrs_stream_shorthand(app.converter, json_array=json_array)
+    )
+
+    @app.get("/async")
+    async def async_rows(count: int = 1000) -> AsyncIterator[Row]:
+        async def gen() -> AsyncIterator[Row]:
+            for i in range(count):
+                yield Row(i, str(i))
+
+        return gen()
+
+    @app.get("/sync")
+    async def sync_rows(count: int = 1000) -> Iterator[Row]:
+        return (Row(i, str(i)) for i in range(count))
+
+    t = create_task(run_on_starlette(app, unused_tcp_port))
+    url = f"http://localhost:{unused_tcp_port}"
+
+    try:
+        async with AsyncClient() as client:
+            resp = await get_first(client, f"{url}/async")
+            for path in ("/async", "/sync"):
+                resp = await client.get(f"{url}{path}")
+                assert resp.status_code == 200
+                if json_array:
+                    assert resp.headers["content-type"] == "application/json"
+                    payload = resp.json()
+                else:
+                    assert resp.headers["content-type"] == "application/x-ndjson"
+                    payload = [loads(line) for line in resp.text.splitlines()]
+                assert payload == [{"a": i, "b": str(i)} for i in range(1000)]
+
+                resp = await client.get(f"{url}{path}", params={"count": 0})
+                assert resp.text == ("[]" if json_array else "")
+    finally:
+        t.cancel()
+
+
+def test_attrs_stream_chunking() -> None:
+    """Serialized instances are batched into chunks."""
+    converter = make_converter()
+    shorthand = make_attrs_stream_shorthand(converter, json_array=True, chunk_size=20)
+    adapter = shorthand.response_adapter_factory(Iterator[Row])
+
+    resp = adapter(Row(i, "a") for i in range(4))
+
+    assert resp.headers == {"content-type": "application/json"}
+    chunks = list(resp.ret)
+    assert chunks == [
+        b'[{"a":0,"b":"a"},{"a":1,"b":"a"}',
+        b',{"a":2,"b":"a"},{"a":3,"b":"a"}',
+        b"]",
+    ]
+
+
+def test_attrs_stream_openapi() -> None:
+    """Streamed attrs instances are documented as their element schema."""
+    app: StarletteApp = StarletteApp()
+    app.add_response_shorthand(make_attrs_stream_shorthand(app.converter))
+
+    @app.get("/rows")
+    async def rows() -> AsyncIterator[Row]:
+        return iter([])  # type: ignore[return-value]
+
+    spec = app.make_openapi_spec()
+
+    op = spec.paths["/rows"].get
+    assert op is not None
+    assert op.responses["200"].content == {
+        "application/x-ndjson": MediaType(Reference("#/components/schemas/Row"))
+    }